@@ -0,0 +1,121 @@
+"""Compact integer adjacency index (CSR layout) over the nodes and edges tables."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+
+class AdjacencyIndex:
+    """Undirected CSR adjacency over integer node codes.
+
+    Node codes follow the row order of the nodes table. Every edge contributes two
+    entries (one per direction); ``entry_edges`` maps entries back to edge row
+    positions and ``entry_forward`` records whether the entry follows source -> target.
+    Edges whose endpoints are not known node ids are left out.
+    """
+
+    def __init__(
+        self,
+        node_ids: list[str],
+        edge_sources: np.ndarray,
+        edge_targets: np.ndarray,
+        edge_relationship_codes: np.ndarray,
+        relationship_types: list[str],
+    ) -> None:
+        self.node_ids = node_ids
+        self.code_of = {node_id: code for code, node_id in enumerate(node_ids)}
+        self.edge_sources = edge_sources
+        self.edge_targets = edge_targets
+        self.edge_relationship_codes = edge_relationship_codes
+        self.relationship_types = relationship_types
+
+        valid = np.flatnonzero((edge_sources >= 0) & (edge_targets >= 0))
+        heads = np.concatenate([edge_sources[valid], edge_targets[valid]])
+        tails = np.concatenate([edge_targets[valid], edge_sources[valid]])
+        order = np.argsort(heads, kind='stable')
+        self.indices = tails[order]
+        self.entry_edges = np.concatenate([valid, valid])[order]
+        self.entry_forward = np.concatenate([np.ones(len(valid), bool), np.zeros(len(valid), bool)])[order]
+        counts = np.bincount(heads, minlength=len(node_ids))
+        self.indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._entry_heads: np.ndarray | None = None
+
+    @classmethod
+    def from_frames(cls, nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> AdjacencyIndex:
+        """Build the index from the nodes and edges tables."""
+        node_ids = nodes_df['id'].astype(str).tolist()
+        node_index = pd.Index(node_ids)
+        sources = node_index.get_indexer(edges_df['source'].astype(str)).astype(np.int64)
+        targets = node_index.get_indexer(edges_df['target'].astype(str)).astype(np.int64)
+        codes, uniques = pd.factorize(edges_df['relationship_type'].astype(str), sort=True)
+        return cls(node_ids, sources, targets, codes.astype(np.int64), [str(value) for value in uniques])
+
+    @property
+    def entry_heads(self) -> np.ndarray:
+        """Return the node code each adjacency entry starts from."""
+        if self._entry_heads is None:
+            self._entry_heads = np.repeat(np.arange(self.node_count, dtype=np.int64), np.diff(self.indptr))
+        return self._entry_heads
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_sources)
+
+    def codes_for(self, node_ids: Iterable[object]) -> np.ndarray:
+        """Return integer codes for known node ids, silently skipping unknown ones."""
+        codes = [self.code_of[str(node_id)] for node_id in node_ids if str(node_id) in self.code_of]
+        return np.unique(np.asarray(codes, dtype=np.int64))
+
+    def relationship_mask(self, relationship_types: Iterable[str] | None) -> np.ndarray | None:
+        """Return a per-edge mask of allowed relationship types, or None when unrestricted."""
+        if relationship_types is None:
+            return None
+        wanted = {str(value) for value in relationship_types}
+        allowed = [code for code, value in enumerate(self.relationship_types) if value in wanted]
+        return np.isin(self.edge_relationship_codes, allowed)
+
+    def entry_slices(self, codes: np.ndarray) -> np.ndarray:
+        """Return the adjacency entry positions of all nodes in codes."""
+        starts = self.indptr[codes]
+        lengths = self.indptr[codes + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return np.arange(total, dtype=np.int64) + offsets
+
+    def neighbors(self, code: int) -> np.ndarray:
+        """Return neighbor codes of one node (with repeats for parallel edges)."""
+        return self.indices[self.indptr[code]:self.indptr[code + 1]]
+
+    def k_hop(self, seeds: np.ndarray, radius: int, edge_mask: np.ndarray | None = None) -> np.ndarray:
+        """Return a node mask of everything within radius hops of seeds via frontier BFS."""
+        visited = np.zeros(self.node_count, dtype=bool)
+        visited[seeds] = True
+        frontier = seeds
+        for _ in range(max(int(radius), 0)):
+            if len(frontier) == 0:
+                break
+            entries = self.entry_slices(frontier)
+            if edge_mask is not None:
+                entries = entries[edge_mask[self.entry_edges[entries]]]
+            reached = self.indices[entries]
+            frontier = np.unique(reached[~visited[reached]])
+            visited[frontier] = True
+        return visited
+
+    def induced_edge_mask(self, node_mask: np.ndarray, edge_mask: np.ndarray | None = None) -> np.ndarray:
+        """Return a per-edge mask of edges whose endpoints are both inside node_mask."""
+        known = (self.edge_sources >= 0) & (self.edge_targets >= 0)
+        inside = np.zeros(self.edge_count, dtype=bool)
+        inside[known] = node_mask[self.edge_sources[known]] & node_mask[self.edge_targets[known]]
+        if edge_mask is not None:
+            inside &= edge_mask
+        return inside
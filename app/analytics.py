@@ -0,0 +1,264 @@
+"""Node centrality analytics over the nodes and edges tables, cached by graph fingerprint."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.adjacency import AdjacencyIndex
+from app.range_index import confidence_key
+
+CENTRALITY_METRICS = ('degree', 'weighted_degree', 'pagerank', 'eigenvector', 'betweenness')
+CENTRALITY_LABELS = {
+    'degree': 'Degree',
+    'weighted_degree': 'Weighted degree',
+    'pagerank': 'PageRank',
+    'eigenvector': 'Eigenvector',
+    'betweenness': 'Betweenness (sampled)',
+}
+DEFAULT_EDGE_WEIGHT = 1.0
+PAGERANK_DAMPING = 0.85
+POWER_ITERATION_TOLERANCE = 1e-8
+POWER_ITERATION_MAX_STEPS = 200
+BETWEENNESS_SAMPLES = 256
+PARALLEL_MIN_NODES = 5000
+DEFAULT_CACHE_ENTRIES = 4
+MIN_NODE_SIZE = 24.0
+MAX_NODE_SIZE = 80.0
+
+
+def graph_fingerprint(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> str:
+    """Return a content hash of the node ids and the edge columns that affect centrality."""
+    digest = hashlib.sha1()
+    digest.update(pd.util.hash_pandas_object(nodes_df['id'].astype(str), index=False).to_numpy().tobytes())
+    edge_columns = [column for column in ('source', 'target', 'confidence') if column in edges_df.columns]
+    edge_values = edges_df[edge_columns].astype(str)
+    digest.update(pd.util.hash_pandas_object(edge_values, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def edge_weights(edges_df: pd.DataFrame) -> np.ndarray:
+    """Return one weight per edge row: its confidence, or DEFAULT_EDGE_WEIGHT when missing."""
+    if 'confidence' not in edges_df.columns:
+        return np.full(len(edges_df), DEFAULT_EDGE_WEIGHT)
+    keys = [confidence_key(value) for value in edges_df['confidence'].tolist()]
+    return np.asarray([DEFAULT_EDGE_WEIGHT if key is None else key for key in keys], dtype=float)
+
+
+@dataclass
+class CentralityScores:
+    """Per-node centrality arrays aligned with ``node_ids``."""
+
+    fingerprint: str
+    node_ids: list[str]
+    metrics: dict[str, np.ndarray]
+
+    def __post_init__(self) -> None:
+        self._positions = {node_id: position for position, node_id in enumerate(self.node_ids)}
+
+    def for_node(self, node_id: Any) -> dict[str, float]:
+        """Return every metric for one node, or an empty dict for unknown ids."""
+        position = self._positions.get(str(node_id))
+        if position is None:
+            return {}
+        return {metric: float(values[position]) for metric, values in self.metrics.items()}
+
+    def frame(self) -> pd.DataFrame:
+        """Return the scores as a table with an ``id`` column."""
+        return pd.DataFrame({'id': self.node_ids, **self.metrics})
+
+
+def _entry_arrays(adjacency: AdjacencyIndex, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return adjacency.entry_heads, adjacency.indices, weights[adjacency.entry_edges]
+
+
+def pagerank_scores(adjacency: AdjacencyIndex, weights: np.ndarray, damping: float = PAGERANK_DAMPING) -> np.ndarray:
+    """Return weighted PageRank by power iteration over the CSR entries (undirected edges)."""
+    count = adjacency.node_count
+    if count == 0:
+        return np.empty(0)
+    heads, tails, entry_weights = _entry_arrays(adjacency, weights)
+    out_weight = np.bincount(heads, weights=entry_weights, minlength=count)
+    dangling = out_weight == 0
+    share = np.divide(entry_weights, out_weight[heads], out=np.zeros_like(entry_weights), where=out_weight[heads] > 0)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(POWER_ITERATION_MAX_STEPS):
+        spread = np.bincount(tails, weights=scores[heads] * share, minlength=count)
+        updated = damping * (spread + scores[dangling].sum() / count) + (1 - damping) / count
+        converged = np.abs(updated - scores).sum() < count * POWER_ITERATION_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores / scores.sum()
+
+
+def eigenvector_scores(adjacency: AdjacencyIndex, weights: np.ndarray) -> np.ndarray:
+    """Return weighted eigenvector centrality by power iteration on (A + I), L2-normalized."""
+    count = adjacency.node_count
+    if count == 0:
+        return np.empty(0)
+    heads, tails, entry_weights = _entry_arrays(adjacency, weights)
+    scores = np.full(count, 1.0 / count)
+    for _ in range(POWER_ITERATION_MAX_STEPS):
+        updated = scores + np.bincount(tails, weights=scores[heads] * entry_weights, minlength=count)
+        norm = np.linalg.norm(updated)
+        if norm == 0:
+            return np.zeros(count)
+        updated /= norm
+        converged = np.abs(updated - scores).sum() < count * POWER_ITERATION_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+_WORKER_GRAPH = None
+
+
+def _simple_graph(node_count: int, pairs: np.ndarray):
+    import networkx as nx
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(node_count))
+    graph.add_edges_from(map(tuple, pairs.tolist()))
+    return graph
+
+
+def _init_betweenness_worker(node_count: int, pairs: np.ndarray) -> None:
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = _simple_graph(node_count, pairs)
+
+
+def _betweenness_chunk(sources: list[int], graph=None) -> np.ndarray:
+    """Return unnormalized betweenness contributions of shortest paths starting at sources."""
+    import networkx as nx
+
+    graph = graph if graph is not None else _WORKER_GRAPH
+    partial = nx.betweenness_centrality_subset(graph, sources, list(graph), normalized=False)
+    values = np.zeros(graph.number_of_nodes())
+    for node, value in partial.items():
+        values[node] = value
+    return values
+
+
+def sampled_betweenness(
+    adjacency: AdjacencyIndex,
+    samples: int = BETWEENNESS_SAMPLES,
+    *,
+    seed: int = 42,
+    workers: int | None = None,
+) -> np.ndarray:
+    """Return normalized betweenness estimated from ``samples`` random pivot sources.
+
+    Pivots are split into chunks scored by ``betweenness_centrality_subset``; large
+    graphs spread the chunks over a process pool. With samples >= node count the
+    result is exact.
+    """
+    count = adjacency.node_count
+    if count < 3:
+        return np.zeros(count)
+    known = (adjacency.edge_sources >= 0) & (adjacency.edge_targets >= 0)
+    pairs = np.column_stack([adjacency.edge_sources[known], adjacency.edge_targets[known]])
+    pivot_count = min(samples, count)
+    rng = np.random.default_rng(seed)
+    pivots = np.sort(rng.choice(count, size=pivot_count, replace=False)).tolist()
+
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and count >= PARALLEL_MIN_NODES:
+        chunk_size = -(-pivot_count // workers)
+        chunks = [pivots[start:start + chunk_size] for start in range(0, pivot_count, chunk_size)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_betweenness_worker,
+            initargs=(count, pairs),
+        ) as pool:
+            totals = sum(pool.map(_betweenness_chunk, chunks))
+    else:
+        totals = _betweenness_chunk(pivots, _simple_graph(count, pairs))
+
+    # Subset scores count each undirected path once per endpoint pair starting at a pivot;
+    # scale the sample up to all sources and normalize like ``betweenness_centrality``.
+    return totals * (count / pivot_count) * 2 / ((count - 1) * (count - 2))
+
+
+def compute_centrality(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    *,
+    samples: int = BETWEENNESS_SAMPLES,
+    workers: int | None = None,
+    fingerprint: str | None = None,
+) -> CentralityScores:
+    """Compute every metric in CENTRALITY_METRICS for the current tables."""
+    adjacency = AdjacencyIndex.from_frames(nodes_df, edges_df)
+    weights = edge_weights(edges_df)
+    heads, _, entry_weights = _entry_arrays(adjacency, weights)
+    metrics = {
+        'degree': np.bincount(heads, minlength=adjacency.node_count).astype(float),
+        'weighted_degree': np.bincount(heads, weights=entry_weights, minlength=adjacency.node_count),
+        'pagerank': pagerank_scores(adjacency, weights),
+        'eigenvector': eigenvector_scores(adjacency, weights),
+        'betweenness': sampled_betweenness(adjacency, samples, workers=workers),
+    }
+    return CentralityScores(
+        fingerprint=fingerprint or graph_fingerprint(nodes_df, edges_df),
+        node_ids=adjacency.node_ids,
+        metrics=metrics,
+    )
+
+
+def node_sizes(
+    scores: CentralityScores,
+    metric: str,
+    min_size: float = MIN_NODE_SIZE,
+    max_size: float = MAX_NODE_SIZE,
+) -> dict[str, float]:
+    """Map one metric onto node diameters in [min_size, max_size] (square-root scaled)."""
+    values = np.sqrt(np.clip(scores.metrics[metric], 0, None))
+    low, high = (float(values.min()), float(values.max())) if len(values) else (0.0, 0.0)
+    span = high - low
+    scaled = (values - low) / span if span > 0 else np.zeros_like(values)
+    sizes = min_size + scaled * (max_size - min_size)
+    return {node_id: round(float(size), 1) for node_id, size in zip(scores.node_ids, sizes)}
+
+
+class CentralityCache:
+    """Least-recently-used CentralityScores keyed by graph fingerprint."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CentralityScores] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fingerprint: str) -> CentralityScores | None:
+        """Return cached scores for fingerprint and mark them most recently used."""
+        scores = self._entries.get(fingerprint)
+        if scores is not None:
+            self._entries.move_to_end(fingerprint)
+        return scores
+
+    def put(self, scores: CentralityScores) -> None:
+        """Store scores under their fingerprint, evicting the least recently used entries."""
+        self._entries[scores.fingerprint] = scores
+        self._entries.move_to_end(scores.fingerprint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def scores(self, nodes_df: pd.DataFrame, edges_df: pd.DataFrame, **options: Any) -> CentralityScores:
+        """Return cached scores for the tables, computing them on a fingerprint miss."""
+        fingerprint = graph_fingerprint(nodes_df, edges_df)
+        cached = self.get(fingerprint)
+        if cached is not None:
+            return cached
+        computed = compute_centrality(nodes_df, edges_df, fingerprint=fingerprint, **options)
+        self.put(computed)
+        return computed
@@ -0,0 +1,219 @@
+"""Louvain community detection over the integer adjacency index, with warm restarts after edits."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.adjacency import AdjacencyIndex
+from app.analytics import edge_weights
+
+MAX_LEVELS = 32
+GAIN_EPSILON = 1e-12
+
+
+@dataclass
+class CommunityPartition:
+    """Community label per node (largest community first) plus neighbourhood signatures."""
+
+    node_ids: list[str]
+    labels: np.ndarray
+    modularity: float
+    signatures: np.ndarray
+    moved_nodes: int = 0
+
+    def __post_init__(self) -> None:
+        self._positions = {node_id: position for position, node_id in enumerate(self.node_ids)}
+
+    @property
+    def community_count(self) -> int:
+        return int(self.labels.max()) + 1 if len(self.labels) else 0
+
+    def sizes(self) -> dict[int, int]:
+        """Return node counts per community label."""
+        return {label: int(count) for label, count in enumerate(np.bincount(self.labels))}
+
+    @cached_property
+    def membership(self) -> dict[str, int]:
+        """Node id -> community label mapping."""
+        return {node_id: int(label) for node_id, label in zip(self.node_ids, self.labels)}
+
+    def community_of(self, node_id: Any) -> int | None:
+        position = self._positions.get(str(node_id))
+        return None if position is None else int(self.labels[position])
+
+
+def _entry_weights(adjacency: AdjacencyIndex, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return adjacency.entry_heads, adjacency.indices.astype(np.int64), weights[adjacency.entry_edges]
+
+
+def neighbourhood_signatures(adjacency: AdjacencyIndex, weights: np.ndarray) -> np.ndarray:
+    """Return a per-node float that changes whenever a node's weighted neighbour set changes."""
+    hashed = pd.util.hash_array(np.asarray(adjacency.node_ids, dtype=object))
+    unit = (hashed >> np.uint64(11)).astype(np.float64) / float(2**53)
+    heads, tails, entry_weights = _entry_weights(adjacency, weights)
+    return np.bincount(heads, weights=unit[tails] * (1.0 + entry_weights), minlength=adjacency.node_count)
+
+
+def _local_moving(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    labels: np.ndarray,
+    queue_order: np.ndarray,
+) -> int:
+    """Move nodes between communities while modularity improves; returns the number of moves.
+
+    Only queued nodes are visited; when a node moves, its neighbours outside the new
+    community are queued again.
+    """
+    count = len(indptr) - 1
+    strength = np.bincount(np.repeat(np.arange(count), np.diff(indptr)), weights=weights, minlength=count)
+    total = float(weights.sum())
+    if total == 0:
+        return 0
+    community_total = np.bincount(labels, weights=strength, minlength=count).tolist()
+    indptr_list = indptr.tolist()
+    indices_list = indices.tolist()
+    weights_list = weights.tolist()
+    strength_list = strength.tolist()
+    label_list = labels.tolist()
+
+    queue = deque(int(node) for node in queue_order)
+    queued = [False] * count
+    for node in queue:
+        queued[node] = True
+    moves = 0
+    while queue:
+        node = queue.popleft()
+        queued[node] = False
+        current = label_list[node]
+        node_strength = strength_list[node]
+        links: dict[int, float] = {}
+        for entry in range(indptr_list[node], indptr_list[node + 1]):
+            neighbour = indices_list[entry]
+            if neighbour != node:
+                community = label_list[neighbour]
+                links[community] = links.get(community, 0.0) + weights_list[entry]
+
+        community_total[current] -= node_strength
+        best = current
+        best_gain = links.get(current, 0.0) - community_total[current] * node_strength / total
+        for community, link_weight in links.items():
+            gain = link_weight - community_total[community] * node_strength / total
+            if gain > best_gain + GAIN_EPSILON:
+                best, best_gain = community, gain
+        community_total[best] += node_strength
+
+        if best != current:
+            label_list[node] = best
+            moves += 1
+            for entry in range(indptr_list[node], indptr_list[node + 1]):
+                neighbour = indices_list[entry]
+                if not queued[neighbour] and label_list[neighbour] != best:
+                    queued[neighbour] = True
+                    queue.append(neighbour)
+    labels[:] = label_list
+    return moves
+
+
+def _aggregate(
+    indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray, labels: np.ndarray, count: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Collapse each community into one node, summing the weights between communities."""
+    heads = labels[np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))]
+    tails = labels[indices]
+    keys = heads * count + tails
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    summed = np.bincount(inverse, weights=weights)
+    new_heads = unique_keys // count
+    new_indptr = np.concatenate([[0], np.cumsum(np.bincount(new_heads, minlength=count))]).astype(np.int64)
+    return new_indptr, (unique_keys % count).astype(np.int64), summed
+
+
+def _modularity(heads: np.ndarray, tails: np.ndarray, weights: np.ndarray, labels: np.ndarray) -> float:
+    total = float(weights.sum())
+    if total == 0:
+        return 0.0
+    inside = float(weights[labels[heads] == labels[tails]].sum())
+    community_total = np.bincount(labels[heads], weights=weights)
+    return inside / total - float(((community_total / total) ** 2).sum())
+
+
+def _canonical_labels(labels: np.ndarray) -> np.ndarray:
+    """Renumber communities so the largest is 0, breaking ties by first member position."""
+    _, first, inverse, counts = np.unique(labels, return_index=True, return_inverse=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank[inverse]
+
+
+def detect_communities(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    *,
+    previous: CommunityPartition | None = None,
+    seed: int = 42,
+) -> CommunityPartition:
+    """Return a Louvain partition of the undirected graph, weighted by edge confidence.
+
+    With a ``previous`` partition the first level starts from its labels and only
+    visits nodes that are new or whose neighbourhood signature changed, so small
+    edits settle with local work instead of a cold run.
+    """
+    adjacency = AdjacencyIndex.from_frames(nodes_df, edges_df)
+    weights = edge_weights(edges_df)
+    heads, tails, entry_weights = _entry_weights(adjacency, weights)
+    signatures = neighbourhood_signatures(adjacency, weights)
+    count = adjacency.node_count
+    if count == 0:
+        return CommunityPartition([], np.empty(0, dtype=np.int64), 0.0, signatures)
+
+    rng = np.random.default_rng(seed)
+    labels = np.arange(count, dtype=np.int64)
+    queue_order = rng.permutation(count)
+    if previous is not None:
+        old_positions = pd.Index(previous.node_ids).get_indexer(adjacency.node_ids)
+        known = old_positions >= 0
+        labels[known] = previous.labels[old_positions[known]]
+        labels[~known] = previous.community_count + np.arange(int((~known).sum()))
+        unchanged = np.zeros(count, dtype=bool)
+        unchanged[known] = np.isclose(signatures[known], previous.signatures[old_positions[known]], rtol=0, atol=1e-12)
+        queue_order = queue_order[~unchanged[queue_order]]
+        _, labels = np.unique(labels, return_inverse=True)
+        labels = labels.astype(np.int64)
+
+    membership = labels.copy()
+    level_indptr, level_indices, level_weights = adjacency.indptr, tails, entry_weights
+    moved_nodes = 0
+    for level in range(MAX_LEVELS):
+        moves = _local_moving(level_indptr, level_indices, level_weights, labels, queue_order)
+        if level == 0:
+            moved_nodes = moves
+        _, labels = np.unique(labels, return_inverse=True)
+        community_count = int(labels.max()) + 1
+        membership = labels[membership] if level > 0 else labels.copy()
+        if level > 0 and moves == 0:
+            break
+        if community_count == len(level_indptr) - 1 and level > 0:
+            break
+        level_indptr, level_indices, level_weights = _aggregate(
+            level_indptr, level_indices, level_weights, labels, community_count
+        )
+        labels = np.arange(community_count, dtype=np.int64)
+        queue_order = rng.permutation(community_count)
+
+    final = _canonical_labels(membership)
+    return CommunityPartition(
+        node_ids=adjacency.node_ids,
+        labels=final,
+        modularity=_modularity(heads, tails, entry_weights, final),
+        signatures=signatures,
+        moved_nodes=moved_nodes,
+    )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 import pandas as pd
 
 
@@ -28,3 +30,49 @@ def can_add_or_edit_edge(
         return False, 'source and target must be different (self-loops are not allowed yet)'
 
     return True, ''
+
+
+@dataclass(frozen=True)
+class EdgeChanges:
+    """Row-level difference between two versions of the edges table."""
+
+    removed_positions: list[int]
+    changed_positions: list[int]
+    added_positions: list[int]
+    appended: bool
+
+
+def diff_edge_frames(old_edges_df: pd.DataFrame, new_edges_df: pd.DataFrame) -> EdgeChanges:
+    """Describe how new_edges_df differs from old_edges_df by row label.
+
+    Removed positions refer to the old frame; changed and added positions refer to the
+    new frame. ``appended`` is True when surviving rows keep their order and new rows
+    were added at the end, which lets positional indexes update in place; otherwise
+    callers should rebuild them.
+    """
+    old_labels = old_edges_df.index
+    new_labels = new_edges_df.index
+    if not (old_labels.is_unique and new_labels.is_unique):
+        return EdgeChanges([], [], list(range(len(new_labels))), False)
+    kept_mask = old_labels.isin(new_labels)
+    removed_positions = [int(position) for position in (~kept_mask).nonzero()[0]]
+    added_mask = ~new_labels.isin(old_labels)
+    added_positions = [int(position) for position in added_mask.nonzero()[0]]
+
+    kept_labels = old_labels[kept_mask]
+    survivor_count = len(kept_labels)
+    appended = (
+        survivor_count + len(added_positions) == len(new_labels)
+        and new_labels[:survivor_count].equals(kept_labels)
+        and all(position >= survivor_count for position in added_positions)
+    )
+
+    common_columns = [column for column in old_edges_df.columns if column in new_edges_df.columns]
+    old_common = old_edges_df.loc[kept_labels, common_columns].astype(str)
+    new_common = new_edges_df.loc[kept_labels, common_columns].astype(str)
+    differs = (old_common.to_numpy() != new_common.to_numpy()).any(axis=1)
+    if len(common_columns) != len(new_edges_df.columns):
+        differs[:] = True
+    changed_positions = [int(new_labels.get_loc(label)) for label in kept_labels[differs]]
+
+    return EdgeChanges(removed_positions, changed_positions, added_positions, bool(appended))
@@ -0,0 +1,261 @@
+"""Duplicate-entity suggestions for the nodes table using blocking keys, plus a merge helper."""
+
+from __future__ import annotations
+
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.adjacency import AdjacencyIndex
+from app.text_index import jaro_winkler
+
+DEFAULT_MATCH_THRESHOLD = 0.85
+DEFAULT_SUGGESTION_LIMIT = 100
+MAX_BLOCK_SIZE = 50
+PREFIX_KEY_LENGTH = 4
+MAX_KEY_TOKENS = 6
+NAME_WEIGHT = 0.75
+NEIGHBOUR_WEIGHT = 0.25
+PARALLEL_MIN_PAIRS = 20000
+MERGE_FILL_COLUMNS = ('description', 'source_ref', 'date', 'confidence')
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def name_tokens(value: Any) -> list[str]:
+    """Return lowercase, accent-free alphanumeric tokens of a label or id."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return []
+    text = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode('ascii').lower()
+    return _TOKEN_PATTERN.findall(text)
+
+
+def blocking_keys(tokens: list[str]) -> set[str]:
+    """Return the name blocking keys for one token list.
+
+    Each token (and its prefix, for longer tokens) is paired with the initial of every
+    other token, so "John Kelly", "Jon Kelly" and "Kelly, John" share ``kelly|j`` while
+    two different people who only share a first name rarely share a key.
+    """
+    tokens = tokens[:MAX_KEY_TOKENS]
+    keys: set[str] = set()
+    for position, token in enumerate(tokens):
+        if len(token) < 2:
+            continue
+        # Prefixes of numeric tokens (p1230, p12301, ...) say nothing about the name.
+        stems = [token]
+        if len(token) > PREFIX_KEY_LENGTH and token.isalpha():
+            stems.append(token[:PREFIX_KEY_LENGTH] + '*')
+        initials = {other[0] for offset, other in enumerate(tokens) if offset != position} or {''}
+        keys.update(f'{stem}|{initial}' for stem in stems for initial in initials)
+    return keys
+
+
+@dataclass(frozen=True)
+class MergeSuggestion:
+    """One candidate duplicate: merge ``merge_id`` into ``keep_id``."""
+
+    keep_id: str
+    merge_id: str
+    score: float
+    name_score: float
+    neighbour_score: float
+
+
+def node_keys(label: Any, node_id: Any) -> set[str]:
+    """Return the name blocking keys of a node from its label and its id."""
+    return blocking_keys(name_tokens(label)) | blocking_keys(name_tokens(node_id))
+
+
+def _block_pairs(blocks: np.ndarray, members: np.ndarray, node_count: int) -> np.ndarray:
+    """Encode the pairs inside every block of 2..MAX_BLOCK_SIZE members as ``first * node_count + second``.
+
+    ``blocks[i]`` is the block code of membership i and ``members[i]`` its node position.
+    """
+    order = np.lexsort((members, blocks))
+    blocks, members = blocks[order], members[order]
+    starts = np.flatnonzero(np.r_[True, blocks[1:] != blocks[:-1]])
+    sizes = np.diff(np.r_[starts, len(blocks)])
+    kept = (sizes >= 2) & (sizes <= MAX_BLOCK_SIZE)
+    size_of = np.repeat(np.where(kept, sizes, 0), sizes)
+    rank = np.arange(len(blocks)) - np.repeat(starts, sizes)
+    # Membership i pairs with every later member of its block.
+    later = np.where(size_of > 0, size_of - rank - 1, 0)
+    first = np.repeat(np.arange(len(blocks)), later)
+    offsets = np.arange(len(first)) - np.repeat(np.cumsum(later) - later, later)
+    second = first + 1 + offsets
+    low, high = members[first], members[second]
+    return np.minimum(low, high) * node_count + np.maximum(low, high)
+
+
+def candidate_pairs(
+    types: list[str],
+    keys: list[set[str]],
+    adjacency: AdjacencyIndex,
+) -> list[tuple[int, int]]:
+    """Return node position pairs that share a type and a blocking key.
+
+    Name keys come from ``node_keys``. Name blocks larger than MAX_BLOCK_SIZE (very
+    common names) are skipped, but nodes that also share a neighbour are still paired
+    through (neighbour, type, key) blocks, so the number of pairs grows with the block
+    sizes rather than with n squared.
+    """
+    node_count = len(types)
+    members = np.repeat(np.arange(node_count, dtype=np.int64), [len(key_set) for key_set in keys])
+    # Keys only hold [a-z0-9*|], so the first space separates key and type.
+    labels = [f'{key} {node_type}' for node_type, key_set in zip(types, keys) for key in key_set]
+    blocks, _ = pd.factorize(pd.Series(labels, dtype=object))
+    blocks = blocks.astype(np.int64)
+    encoded = [_block_pairs(blocks, members, node_count)]
+
+    block_sizes = np.bincount(blocks, minlength=1)
+    oversized = block_sizes[blocks] > MAX_BLOCK_SIZE
+    if oversized.any():
+        degrees = np.diff(adjacency.indptr)
+        hubs = np.repeat(np.arange(node_count, dtype=np.int64), degrees)
+        links = pd.DataFrame({'hub': hubs, 'member': adjacency.indices.astype(np.int64)}).drop_duplicates()
+        common = pd.DataFrame({'member': members[oversized], 'block': blocks[oversized]})
+        shared = links.merge(common, on='member')
+        if len(shared):
+            shared_blocks = shared['hub'].to_numpy() * (len(block_sizes)) + shared['block'].to_numpy()
+            encoded.append(_block_pairs(shared_blocks, shared['member'].to_numpy(), node_count))
+
+    codes = np.unique(np.concatenate(encoded))
+    return list(zip((codes // node_count).tolist(), (codes % node_count).tolist()))
+
+
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def _init_scoring_worker(texts: list[tuple[str, str, str]], indptr: np.ndarray, indices: np.ndarray) -> None:
+    _WORKER_STATE.update(texts=texts, indptr=indptr, indices=indices)
+
+
+def _neighbours(position: int, indptr: np.ndarray, indices: np.ndarray) -> set[int]:
+    return set(indices[indptr[position]:indptr[position + 1]].tolist())
+
+
+def _score_chunk(pairs: list[tuple[int, int]], threshold: float, state: dict[str, Any] | None = None) -> list[tuple]:
+    """Return ``(first, second, score, name_score, neighbour_score)`` for pairs at or above threshold."""
+    state = state if state is not None else _WORKER_STATE
+    texts, indptr, indices = state['texts'], state['indptr'], state['indices']
+    scored = []
+    for first, second in pairs:
+        label_a, sorted_a, id_a = texts[first]
+        label_b, sorted_b, id_b = texts[second]
+        name_score = max(jaro_winkler(label_a, label_b), jaro_winkler(id_a, id_b))
+        if sorted_a != label_a or sorted_b != label_b:
+            name_score = max(name_score, jaro_winkler(sorted_a, sorted_b))
+        # A pair that cannot reach the threshold even with identical neighbourhoods is skipped early.
+        if NAME_WEIGHT * name_score + NEIGHBOUR_WEIGHT < threshold and name_score < threshold:
+            continue
+        near = _neighbours(first, indptr, indices) - {second}
+        far = _neighbours(second, indptr, indices) - {first}
+        # A node without edges (often the freshly entered duplicate) gives no neighbourhood evidence.
+        if near and far:
+            neighbour_score = len(near & far) / len(near | far)
+            score = NAME_WEIGHT * name_score + NEIGHBOUR_WEIGHT * neighbour_score
+        else:
+            neighbour_score = 0.0
+            score = name_score
+        if score >= threshold:
+            scored.append((first, second, score, name_score, neighbour_score))
+    return scored
+
+
+def find_duplicates(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    *,
+    threshold: float = DEFAULT_MATCH_THRESHOLD,
+    limit: int = DEFAULT_SUGGESTION_LIMIT,
+    workers: int | None = None,
+    adjacency: AdjacencyIndex | None = None,
+) -> list[MergeSuggestion]:
+    """Return merge suggestions ranked by score, best first.
+
+    Candidates come from blocking (see ``candidate_pairs``). Each pair is scored by
+    Jaro-Winkler name similarity blended with the Jaccard overlap of their
+    neighbours; large candidate sets are scored in a process pool. Pairs where
+    either node has no other neighbours are scored on names alone.
+    """
+    adjacency = adjacency if adjacency is not None else AdjacencyIndex.from_frames(nodes_df, edges_df)
+    node_ids = adjacency.node_ids
+    labels = nodes_df['label'].tolist()
+    types = nodes_df['type'].astype(str).tolist()
+    keys: list[set[str]] = []
+    texts: list[tuple[str, str, str]] = []
+    for label, node_id in zip(labels, node_ids):
+        label_tokens, id_tokens = name_tokens(label), name_tokens(node_id)
+        keys.append(blocking_keys(label_tokens) | blocking_keys(id_tokens))
+        texts.append((' '.join(label_tokens), ' '.join(sorted(label_tokens)), ' '.join(id_tokens)))
+    pairs = candidate_pairs(types, keys, adjacency)
+
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(pairs) >= PARALLEL_MIN_PAIRS:
+        chunk_size = -(-len(pairs) // (workers * 4))
+        chunks = [pairs[start:start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_scoring_worker,
+            initargs=(texts, adjacency.indptr, adjacency.indices),
+        ) as pool:
+            scored = [row for rows in pool.map(_score_chunk, chunks, [threshold] * len(chunks)) for row in rows]
+    else:
+        scored = _score_chunk(pairs, threshold, {'texts': texts, 'indptr': adjacency.indptr, 'indices': adjacency.indices})
+
+    degrees = np.diff(adjacency.indptr)
+    scored.sort(key=lambda row: (-row[2], row[0], row[1]))
+    suggestions = []
+    for first, second, score, name_score, neighbour_score in scored[:limit]:
+        # Keep the better connected node (the earlier row on ties) so fewer edges move.
+        keep, merge = (second, first) if degrees[second] > degrees[first] else (first, second)
+        suggestions.append(
+            MergeSuggestion(node_ids[keep], node_ids[merge], round(score, 4), round(name_score, 4), round(neighbour_score, 4))
+        )
+    return suggestions
+
+
+def _is_blank(value: Any) -> bool:
+    return value is None or (not isinstance(value, str) and pd.isna(value)) or str(value).strip() == ''
+
+
+def merge_nodes(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    keep_id: str,
+    merge_id: str,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Fold merge_id into keep_id and return new tables.
+
+    Edges are rewired to keep_id (edges between the two become self-loops and are
+    dropped), blank optional fields of the kept row are filled from the merged row,
+    and the merged node row is removed.
+    """
+    keep_id, merge_id = str(keep_id), str(merge_id)
+    if keep_id == merge_id:
+        raise ValueError('Cannot merge a node into itself')
+    ids = nodes_df['id'].astype(str)
+    if not ids.eq(keep_id).any() or not ids.eq(merge_id).any():
+        raise ValueError(f"Unknown node id '{keep_id if not ids.eq(keep_id).any() else merge_id}'")
+
+    merged_nodes = nodes_df.copy()
+    keep_label = merged_nodes.index[ids.eq(keep_id)][0]
+    merge_row = merged_nodes.loc[merged_nodes.index[ids.eq(merge_id)][0]]
+    for column in MERGE_FILL_COLUMNS:
+        if column in merged_nodes.columns and _is_blank(merged_nodes.at[keep_label, column]):
+            merged_nodes.at[keep_label, column] = merge_row[column]
+    merged_nodes = merged_nodes[~ids.eq(merge_id)].reset_index(drop=True)
+
+    merged_edges = edges_df.copy()
+    for column in ('source', 'target'):
+        merged_edges.loc[merged_edges[column].astype(str).eq(merge_id), column] = keep_id
+    self_loops = merged_edges['source'].astype(str).eq(merged_edges['target'].astype(str))
+    rewired = edges_df['source'].astype(str).eq(merge_id) | edges_df['target'].astype(str).eq(merge_id)
+    return merged_nodes, merged_edges[~(self_loops & rewired)].reset_index(drop=True)
@@ -1,17 +1,57 @@
-"""Export helpers for CSV and GEXF graph artifacts."""
+"""Export helpers for CSV, Parquet/Arrow and GEXF graph artifacts."""
 
 from __future__ import annotations
 
+import hashlib
+import importlib.util
+import io
+import json
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import IO, Any, Callable, Iterator
 
-from typing import Any
-
+import numpy as np
 import pandas as pd
 
 from app.config import get_default_export_dir
+from app.gexf_writer import write_gexf
+from app.network_stats import (
+    DEGREE_PERCENTILES,
+    PROVENANCE_COLUMNS,
+    NetworkStatistics,
+    TypeCoverage,
+    network_statistics,
+)
 from app.provenance import WELL_KNOWN_METADATA_COLS
 from app.schema import REQUIRED_EDGE_COLS, REQUIRED_NODE_COLS
 
+GEXF_BUFFER_BYTES = 1 << 20
+HASH_BLOCK_BYTES = 1 << 20
+PARALLEL_EXPORT_MIN_ROWS = 50_000
+EXPORT_MANIFEST_NAME = "EXPORT_MANIFEST.json"
+EXPORT_MANIFEST_VERSION = 2
+COLUMNAR_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+DEFAULT_COLUMNAR_COMPRESSION = "zstd"
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+DATE_FORMAT = "%Y-%m-%d"
+DATE_PATTERN = r"\d{4}-\d{2}-\d{2}"
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "xz": ".xz"}
+# Default and allowed compression levels; the defaults favour speed over the last few percent of size.
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 6, "zstd": 3, "xz": 1}
+COMPRESSION_LEVEL_RANGES = {"gzip": (0, 9), "zstd": (1, 22), "xz": (0, 9)}
+# Which fingerprinted inputs each export_all artifact is written from.
+ARTIFACT_INPUTS = {
+    "nodes_csv": ("nodes",),
+    "edges_csv": ("edges",),
+    "graph_gexf": ("nodes", "edges", "communities"),
+    "summary_md": ("nodes", "edges"),
+    "nodes_parquet": ("nodes",),
+    "edges_parquet": ("edges",),
+}
+
 
 def _ordered_columns(df: pd.DataFrame, required_columns: list[str]) -> list[str]:
     """Return required columns first, then well-known metadata extras, then other extras."""
@@ -36,77 +76,431 @@ def _sort_edges(df: pd.DataFrame) -> pd.DataFrame:
     return sorted_df.drop(columns=["_row_index"]).reset_index(drop=True)
 
 
+def prepare_export_tables(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Order columns and sort rows once, in the deterministic layout every exporter writes."""
+    ordered_nodes = nodes_df.loc[:, _ordered_columns(nodes_df, REQUIRED_NODE_COLS)]
+    ordered_edges = edges_df.loc[:, _ordered_columns(edges_df, REQUIRED_EDGE_COLS)]
+    return _sort_nodes(ordered_nodes), _sort_edges(ordered_edges)
+
+
+def _compression_level(compression: str | None, level: int | None) -> int | None:
+    """Validate a compression method and level, returning the level to use."""
+    if compression is None:
+        if level is not None:
+            raise ValueError("A compression level needs a compression method.")
+        return None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"Unknown compression '{compression}'. Choose one of: {', '.join(COMPRESSION_SUFFIXES)}."
+        )
+    if compression == "zstd":
+        _require_zstandard()
+    if level is None:
+        return DEFAULT_COMPRESSION_LEVELS[compression]
+    low, high = COMPRESSION_LEVEL_RANGES[compression]
+    if not low <= level <= high:
+        raise ValueError(f"{compression} compression level must be between {low} and {high}.")
+    return level
+
+
+def _require_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as error:
+        raise RuntimeError(
+            "zstd compression needs the optional 'zstandard' package. Install it with 'pip install zstandard'."
+        ) from error
+    return zstandard
+
+
+def _compressed_name(name: str, compression: str | None) -> str:
+    return name + COMPRESSION_SUFFIXES[compression] if compression else name
+
+
+@contextmanager
+def _atomic_output(
+    path: Path,
+    compression: str | None = None,
+    level: int | None = None,
+    buffering: int = -1,
+) -> Iterator[IO[bytes]]:
+    """Yield a binary handle that streams, optionally compressed, into a temporary file.
+
+    The temporary file replaces ``path`` only after the block finishes; on error it is removed.
+    """
+    temp_path = path.parent / f".tmp_{path.name}"
+    try:
+        with ExitStack() as stack:
+            handle: IO[bytes] = stack.enter_context(temp_path.open("wb", buffering=buffering))
+            if compression == "gzip":
+                import gzip
+
+                # A fixed name and mtime keep the bytes reproducible for the export manifest.
+                handle = stack.enter_context(
+                    gzip.GzipFile(filename=path.stem, mode="wb", compresslevel=level, fileobj=handle, mtime=0)
+                )
+            elif compression == "xz":
+                import lzma
+
+                handle = stack.enter_context(lzma.LZMAFile(handle, "wb", preset=level))
+            elif compression == "zstd":
+                import zstandard
+
+                compressor = zstandard.ZstdCompressor(level=level)
+                handle = stack.enter_context(compressor.stream_writer(handle, closefd=False))
+            yield handle
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def _text_output(handle: IO[bytes], newline: str | None = None) -> Iterator[IO[str]]:
+    """Wrap a binary handle for UTF-8 text, leaving the handle open for its owner to close."""
+    text = io.TextIOWrapper(handle, encoding="utf-8", newline=newline)
+    try:
+        yield text
+        text.flush()
+    finally:
+        text.detach()
+
+
+def _write_csv(
+    df: pd.DataFrame,
+    path: Path,
+    compression: str | None = None,
+    compression_level: int | None = None,
+) -> str:
+    try:
+        with _atomic_output(path, compression, compression_level) as handle, _text_output(handle, "") as text:
+            df.to_csv(text, index=False)
+    except PermissionError as error:
+        raise RuntimeError(
+            f"Failed to export CSV files to '{path.parent}'. "
+            "Check file permissions and close any open export files."
+        ) from error
+    except Exception as error:
+        raise RuntimeError(
+            f"Failed to export CSV files to '{path.parent}'. "
+            "Verify the output directory is writable."
+        ) from error
+    return str(path)
+
+
 def export_csv(
     nodes_df: pd.DataFrame,
     edges_df: pd.DataFrame,
     out_dir: str | None = None,
+    compression: str | None = None,
+    compression_level: int | None = None,
 ) -> tuple[str, str]:
-    """Export nodes/edges dataframes to UTF-8 CSV files in the given output directory."""
+    """Export nodes/edges dataframes to UTF-8 CSV files in the given output directory.
+
+    ``compression`` may be ``"gzip"``, ``"zstd"`` (optional ``zstandard`` package) or ``"xz"``;
+    the files then get a ``.gz``/``.zst``/``.xz`` suffix and are compressed while they are written.
+    """
+    level = _compression_level(compression, compression_level)
     if out_dir is None:
         out_dir = get_default_export_dir()
     output_dir = Path(out_dir)
-    nodes_path = output_dir / "nodes.csv"
-    edges_path = output_dir / "edges.csv"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    ordered_nodes = nodes_df.loc[:, _ordered_columns(nodes_df, REQUIRED_NODE_COLS)]
-    ordered_edges = edges_df.loc[:, _ordered_columns(edges_df, REQUIRED_EDGE_COLS)]
-    sorted_nodes = _sort_nodes(ordered_nodes)
-    sorted_edges = _sort_edges(ordered_edges)
+    sorted_nodes, sorted_edges = prepare_export_tables(nodes_df, edges_df)
+    nodes_path = output_dir / _compressed_name("nodes.csv", compression)
+    edges_path = output_dir / _compressed_name("edges.csv", compression)
+    return (
+        _write_csv(sorted_nodes, nodes_path, compression, level),
+        _write_csv(sorted_edges, edges_path, compression, level),
+    )
+
 
+def _require_pyarrow() -> Any:
     try:
-        sorted_nodes.to_csv(nodes_path, index=False, encoding="utf-8")
-        sorted_edges.to_csv(edges_path, index=False, encoding="utf-8")
+        import pyarrow
+    except ImportError as error:
+        raise RuntimeError(
+            "Parquet and Arrow exports need the optional 'pyarrow' package. Install it with 'pip install pyarrow'."
+        ) from error
+    return pyarrow
+
+
+def _text_column(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        return series
+    present = series.notna()
+    text = series.astype(object).where(present, None)
+    text[present] = text[present].map(str)
+    return text
+
+
+def _date_column(series: pd.Series, blank: pd.Series) -> pd.Series | None:
+    """Return ``series`` as datetimes when every filled cell is a calendar date without a time."""
+    filled = series[~blank]
+    if pd.api.types.infer_dtype(filled, skipna=False) in ("string", "empty"):
+        text = filled.astype(str).str.strip()
+        if not text.str.fullmatch(DATE_PATTERN).all():
+            return None
+        dates = pd.to_datetime(text, format=DATE_FORMAT, errors="coerce")
+    else:
+        dates = pd.to_datetime(filled, errors="coerce")
+    if dates.isna().any() or (dates != dates.dt.normalize()).any():
+        return None
+    return dates.reindex(series.index)
+
+
+def _numeric_column(name: str, series: pd.Series, blank: pd.Series) -> pd.Series | None:
+    """Return floats for ``confidence`` and for object columns that only hold numbers and blanks."""
+    filled = series[~blank]
+    numbers_only = pd.api.types.infer_dtype(filled, skipna=False) in ("integer", "floating", "mixed-integer-float")
+    if name != "confidence" and not numbers_only:
+        return None
+    numbers = pd.to_numeric(filled, errors="coerce")
+    if numbers.isna().any():
+        return None
+    return numbers.astype("float64").reindex(series.index)
+
+
+def typed_export_frame(df: pd.DataFrame, required_columns: list[str]) -> pd.DataFrame:
+    """Give every column one Arrow-friendly type: text for schema columns, floats and dates where they fit.
+
+    Excel blanks arrive as ``''`` mixed into numeric columns; they become nulls instead of forcing
+    the whole column to text.
+    """
+    typed: dict[str, pd.Series] = {}
+    for column in df.columns:
+        series = df[column]
+        if column in required_columns:
+            typed[column] = _text_column(series)
+            continue
+        if series.dtype != object and not pd.api.types.is_string_dtype(series.dtype):
+            typed[column] = series
+            continue
+        blank = series.isna() | series.astype(str).str.strip().eq("")
+        if column == "date":
+            converted = _date_column(series, blank)
+        else:
+            converted = _numeric_column(str(column), series, blank)
+        typed[column] = _text_column(series) if converted is None else converted
+    return pd.DataFrame(typed, index=df.index)
+
+
+def _write_columnar(
+    df: pd.DataFrame,
+    path: Path,
+    file_format: str,
+    compression: str | None,
+    compression_level: int | None,
+    row_group_size: int,
+) -> str:
+    """Write one table as Parquet or Arrow IPC through a temporary file and ``os.replace``."""
+    pa = _require_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for position, field in enumerate(table.schema):
+        if field.name == "date" and pa.types.is_timestamp(field.type):
+            try:
+                table = table.set_column(position, field.name, table.column(position).cast(pa.date32()))
+            except pa.ArrowInvalid:
+                pass  # Times of day would be lost; keep the timestamp.
+    temp_path = path.parent / f".tmp_{path.name}"
+    try:
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            pq.write_table(
+                table,
+                temp_path,
+                compression=compression or "none",
+                compression_level=compression_level,
+                row_group_size=row_group_size,
+            )
+        else:
+            codec = pa.Codec(compression, compression_level) if compression else None
+            options = pa.ipc.IpcWriteOptions(compression=codec)
+            with pa.OSFile(str(temp_path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                    writer.write_table(table, max_chunksize=row_group_size)
+        os.replace(temp_path, path)
     except PermissionError as error:
+        temp_path.unlink(missing_ok=True)
         raise RuntimeError(
-            f"Failed to export CSV files to '{output_dir}'. "
+            f"Failed to export {file_format} files to '{path.parent}'. "
             "Check file permissions and close any open export files."
         ) from error
     except Exception as error:
+        temp_path.unlink(missing_ok=True)
         raise RuntimeError(
-            f"Failed to export CSV files to '{output_dir}'. "
-            "Verify the output directory is writable."
+            f"Failed to export {file_format} files to '{path.parent}'. "
+            "Verify the output directory is writable and the compression settings are valid."
         ) from error
+    return str(path)
 
-    return str(nodes_path), str(edges_path)
 
+def _write_parquet_table(df: pd.DataFrame, required_columns: list[str], path: Path) -> str:
+    typed = typed_export_frame(df, required_columns)
+    return _write_columnar(typed, path, "parquet", DEFAULT_COLUMNAR_COMPRESSION, None, DEFAULT_ROW_GROUP_SIZE)
+
+
+def export_columnar(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    out_dir: str | None = None,
+    file_format: str = "parquet",
+    compression: str | None = DEFAULT_COLUMNAR_COMPRESSION,
+    compression_level: int | None = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> tuple[str, str]:
+    """Export typed nodes/edges tables as ``nodes.<ext>``/``edges.<ext>`` in Parquet or Arrow IPC format.
+
+    Rows and columns follow the CSV export order. ``row_group_size`` caps the rows per Parquet
+    row group or Arrow record batch; Arrow IPC only supports ``lz4`` and ``zstd`` compression.
+    """
+    if file_format not in COLUMNAR_SUFFIXES:
+        raise ValueError(f"Unknown columnar format '{file_format}'. Use one of: {', '.join(COLUMNAR_SUFFIXES)}.")
+    if file_format == "arrow" and compression not in (None, "lz4", "zstd"):
+        raise ValueError("Arrow IPC files support only 'lz4' or 'zstd' compression.")
+    if row_group_size < 1:
+        raise ValueError("row_group_size must be a positive number of rows.")
+    _require_pyarrow()
+    if out_dir is None:
+        out_dir = get_default_export_dir()
+    output_dir = Path(out_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    sorted_nodes, sorted_edges = prepare_export_tables(nodes_df, edges_df)
+    suffix = COLUMNAR_SUFFIXES[file_format]
+    settings = (file_format, compression, compression_level, row_group_size)
+    typed_nodes = typed_export_frame(sorted_nodes, REQUIRED_NODE_COLS)
+    typed_edges = typed_export_frame(sorted_edges, REQUIRED_EDGE_COLS)
+    return (
+        _write_columnar(typed_nodes, output_dir / f"nodes{suffix}", *settings),
+        _write_columnar(typed_edges, output_dir / f"edges{suffix}", *settings),
+    )
+
+
+def export_parquet(
+    nodes_df: pd.DataFrame, edges_df: pd.DataFrame, out_dir: str | None = None, **options: Any
+) -> tuple[str, str]:
+    """Export nodes/edges as Parquet; ``options`` are passed to ``export_columnar``."""
+    return export_columnar(nodes_df, edges_df, out_dir, "parquet", **options)
+
+
+def export_arrow(
+    nodes_df: pd.DataFrame, edges_df: pd.DataFrame, out_dir: str | None = None, **options: Any
+) -> tuple[str, str]:
+    """Export nodes/edges as Arrow IPC files; ``options`` are passed to ``export_columnar``."""
+    return export_columnar(nodes_df, edges_df, out_dir, "arrow", **options)
 
-def export_gexf(nx_graph: Any, out_path: str | None = None) -> str:
-    """Export a NetworkX graph as GEXF at the requested output path."""
-    import networkx as nx
 
+def _gexf_output_path(out_path: str | None, compression: str | None) -> Path:
     if out_path is None:
-        out_path = str(Path(get_default_export_dir()) / "graph.gexf")
+        out_path = str(Path(get_default_export_dir()) / _compressed_name("graph.gexf", compression))
     output_path = Path(out_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    try:
-        nx.write_gexf(nx_graph, output_path)
-    except PermissionError as error:
-        raise RuntimeError(
+    return output_path
+
+
+def _gexf_error(output_path: Path, error: Exception) -> RuntimeError:
+    if isinstance(error, PermissionError):
+        return RuntimeError(
             f"Failed to export GEXF to '{output_path}'. "
             "Check file permissions and close any open export files."
-        ) from error
+        )
+    return RuntimeError(
+        f"Failed to export GEXF to '{output_path}'. "
+        "Verify the output path is writable and valid."
+    )
+
+
+def export_gexf(
+    nx_graph: Any,
+    out_path: str | None = None,
+    compression: str | None = None,
+    compression_level: int | None = None,
+) -> str:
+    """Export a NetworkX graph as GEXF at the requested output path.
+
+    With ``compression`` the default file name gets the matching suffix; see ``export_csv``.
+    """
+    import networkx as nx
+
+    level = _compression_level(compression, compression_level)
+    output_path = _gexf_output_path(out_path, compression)
+    try:
+        with _atomic_output(output_path, compression, level) as handle:
+            nx.write_gexf(nx_graph, handle)
     except Exception as error:
-        raise RuntimeError(
-            f"Failed to export GEXF to '{output_path}'. "
-            "Verify the output path is writable and valid."
-        ) from error
+        raise _gexf_error(output_path, error) from error
     return str(output_path)
 
 
+def export_gexf_frames(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    out_path: str | None = None,
+    communities: dict[str, int] | None = None,
+    compression: str | None = None,
+    compression_level: int | None = None,
+) -> str:
+    """Stream nodes/edges tables to GEXF without building a NetworkX graph or XML tree.
 
-def _filled_count(series: pd.Series) -> int:
-    values = series.fillna('').astype(str).str.strip()
-    return int(values.ne('').sum())
+    With ``compression`` the XML is compressed as it is streamed; see ``export_csv``.
+    """
+    level = _compression_level(compression, compression_level)
+    output_path = _gexf_output_path(out_path, compression)
+    try:
+        with _atomic_output(output_path, compression, level, buffering=GEXF_BUFFER_BYTES) as handle:
+            with _text_output(handle, "\n") as text:
+                write_gexf(nodes_df, edges_df, text, communities=communities)
+    except Exception as error:
+        raise _gexf_error(output_path, error) from error
+    return str(output_path)
 
 
-def _confidence_stats(df: pd.DataFrame) -> tuple[float, float, float] | None:
-    if 'confidence' not in df.columns:
-        return None
-    confidence_values = pd.to_numeric(df['confidence'], errors='coerce').dropna()
-    if confidence_values.empty:
-        return None
-    return float(confidence_values.min()), float(confidence_values.mean()), float(confidence_values.max())
+def _percent(part: int, whole: int) -> str:
+    return f'{(part / whole * 100) if whole else 0:.1f}%'
+
+
+def _filled_totals(coverage: list[TypeCoverage]) -> dict[str, int]:
+    totals = dict.fromkeys(PROVENANCE_COLUMNS, 0)
+    for entry in coverage:
+        for column, count in entry.filled.items():
+            totals[column] += count
+    return totals
+
+
+def _structure_lines(stats: NetworkStatistics) -> list[str]:
+    degrees = '/'.join(str(stats.degree_percentiles[rank]) for rank in DEGREE_PERCENTILES)
+    ranks = '/'.join(f'p{rank}' for rank in DEGREE_PERCENTILES)
+    largest = ', '.join(str(size) for size in stats.largest_components) or '(none)'
+    in_largest = stats.largest_components[0] if stats.largest_components else 0
+    lines = [
+        f'- Density: {stats.density:.6f} ({stats.connected_pairs} connected node pairs)',
+        f'- Degree ({ranks}): {degrees}',
+        f'- Mean degree: {stats.degree_mean:.2f}',
+        f'- Isolated nodes: {stats.isolates}/{stats.node_count} ({_percent(stats.isolates, stats.node_count)})',
+        f'- Connected components: {stats.component_count}',
+        f'- Largest component sizes: {largest} ({_percent(in_largest, stats.node_count)} of nodes in the largest)',
+        f'- Self-loops: {stats.self_loops}',
+    ]
+    if stats.dangling_edges:
+        lines.append(f'- Edges with unknown endpoints (left out above): {stats.dangling_edges}')
+    return lines
+
+
+def _coverage_table(title: str, coverage: list[TypeCoverage]) -> list[str]:
+    columns = [column for column in PROVENANCE_COLUMNS if coverage and column in coverage[0].filled]
+    if not coverage or not columns:
+        return [f'- {title} coverage: (no provenance columns found)']
+    lines = [
+        '| ' + ' | '.join([title, 'Rows', *columns]) + ' |',
+        '|' + '---|' * (len(columns) + 2),
+    ]
+    for entry in coverage:
+        cells = [f'{entry.filled[column]} ({_percent(entry.filled[column], entry.rows)})' for column in columns]
+        lines.append('| ' + ' | '.join([entry.name, str(entry.rows), *cells]) + ' |')
+    return lines
+
 
 def export_summary(
     nodes_df: pd.DataFrame,
@@ -119,55 +513,67 @@ def export_summary(
     output_path = Path(out_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    node_counts = nodes_df['type'].astype(str).value_counts().sort_index()
-    edge_counts = edges_df['relationship_type'].astype(str).value_counts().sort_index()
-
+    stats = network_statistics(nodes_df, edges_df)
     node_extras = [column for column in nodes_df.columns if column not in REQUIRED_NODE_COLS]
     edge_extras = [column for column in edges_df.columns if column not in REQUIRED_EDGE_COLS]
 
     lines = [
         '# Export Summary',
         '',
-        '- Format version: 1',
+        '- Format version: 2',
         f'- Node count: {len(nodes_df)}',
         f'- Edge count: {len(edges_df)}',
         '',
         '## Nodes by type',
     ]
 
-    if node_counts.empty:
+    if not stats.node_coverage:
         lines.append('- (none)')
     else:
-        lines.extend(f'- {node_type}: {count}' for node_type, count in node_counts.items())
+        lines.extend(f'- {coverage.name}: {coverage.rows}' for coverage in stats.node_coverage)
 
     lines.extend(['', '## Edges by relationship_type'])
-    if edge_counts.empty:
+    if not stats.edge_coverage:
         lines.append('- (none)')
     else:
-        lines.extend(f'- {rel_type}: {count}' for rel_type, count in edge_counts.items())
+        lines.extend(f'- {coverage.name}: {coverage.rows}' for coverage in stats.edge_coverage)
 
     lines.extend(['', '## Provenance coverage'])
+    node_filled = _filled_totals(stats.node_coverage)
+    edge_filled = _filled_totals(stats.edge_coverage)
     if 'source_ref' in nodes_df.columns:
-        node_source_count = _filled_count(nodes_df['source_ref'])
-        lines.append(f'- Nodes with source_ref: {node_source_count}/{len(nodes_df)} ({(node_source_count / len(nodes_df) * 100) if len(nodes_df) else 0:.1f}%)')
+        lines.append(f"- Nodes with source_ref: {node_filled['source_ref']}/{len(nodes_df)} ({_percent(node_filled['source_ref'], len(nodes_df))})")
     if 'source_ref' in edges_df.columns:
-        edge_source_count = _filled_count(edges_df['source_ref'])
-        lines.append(f'- Edges with source_ref: {edge_source_count}/{len(edges_df)} ({(edge_source_count / len(edges_df) * 100) if len(edges_df) else 0:.1f}%)')
+        lines.append(f"- Edges with source_ref: {edge_filled['source_ref']}/{len(edges_df)} ({_percent(edge_filled['source_ref'], len(edges_df))})")
 
-    node_confidence = _confidence_stats(nodes_df)
+    node_confidence = stats.node_confidence
     if node_confidence is not None:
         lines.append('- Node confidence (min/mean/max): ' + f'{node_confidence[0]:.3f}/{node_confidence[1]:.3f}/{node_confidence[2]:.3f}')
-    edge_confidence = _confidence_stats(edges_df)
+    edge_confidence = stats.edge_confidence
     if edge_confidence is not None:
         lines.append('- Edge confidence (min/mean/max): ' + f'{edge_confidence[0]:.3f}/{edge_confidence[1]:.3f}/{edge_confidence[2]:.3f}')
 
     if 'date' in nodes_df.columns:
-        lines.append(f"- Nodes with date: {_filled_count(nodes_df['date'])}/{len(nodes_df)}")
+        lines.append(f"- Nodes with date: {node_filled['date']}/{len(nodes_df)}")
     if 'date' in edges_df.columns:
-        lines.append(f"- Edges with date: {_filled_count(edges_df['date'])}/{len(edges_df)}")
+        lines.append(f"- Edges with date: {edge_filled['date']}/{len(edges_df)}")
     if lines[-1] == '## Provenance coverage':
         lines.append('- (no provenance columns found)')
 
+    lines.extend(['', '## Network structure'])
+    lines.extend(_structure_lines(stats))
+
+    lines.extend(['', '## Reciprocity by relationship_type'])
+    if not stats.reciprocity:
+        lines.append('- (no directed pairs)')
+    for name, (reciprocated, pairs) in stats.reciprocity.items():
+        lines.append(f'- {name}: {reciprocated}/{pairs} directed pairs reciprocated ({_percent(reciprocated, pairs)})')
+
+    lines.extend(['', '## Provenance coverage by type'])
+    lines.extend(_coverage_table('Node type', stats.node_coverage))
+    lines.append('')
+    lines.extend(_coverage_table('Relationship type', stats.edge_coverage))
+
     lines.extend(['', '## Extra columns'])
     lines.append('- Nodes extras: ' + (', '.join(sorted(node_extras)) if node_extras else '(none)'))
     lines.append('- Edges extras: ' + (', '.join(sorted(edge_extras)) if edge_extras else '(none)'))
@@ -186,3 +592,186 @@ def export_summary(
             "Verify the output path is writable."
         ) from error
     return str(output_path)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _column_hashes(series: pd.Series) -> np.ndarray:
+    """Hash one column per row; mixed object columns hash floats by bit pattern instead of via ``str``."""
+    if series.dtype != object:
+        return pd.util.hash_pandas_object(series, index=False).to_numpy()
+    values = series.to_numpy(dtype=object)
+    kinds = np.fromiter(map(type, values), dtype=object, count=len(values))
+    kind_codes, kind_uniques = pd.factorize(kinds)
+    kind_names = np.array([kind.__qualname__ for kind in kind_uniques], dtype=object)
+    is_float = kinds == float
+    numbers = np.where(is_float, values, 0.0).astype(np.float64)
+    text = np.where(is_float, "", values)
+    hashes = pd.util.hash_array(text) ^ (numbers.view(np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+    if len(kind_names):
+        hashes ^= pd.util.hash_array(kind_names)[kind_codes]
+    return hashes
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Return a SHA-256 over column names, dtypes and row values, in row order."""
+    digest = hashlib.sha256()
+    for name in df.columns:
+        series = df[name]
+        digest.update(json.dumps([str(name), str(series.dtype), len(series)]).encode("utf-8"))
+        digest.update(_column_hashes(series).tobytes())
+    return digest.hexdigest()
+
+
+def _communities_fingerprint(communities: dict[str, int] | None) -> str:
+    items = sorted((str(node_id), int(community)) for node_id, community in (communities or {}).items())
+    return hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()
+
+
+def _artifact_inputs(name: str, fingerprints: dict[str, str]) -> str:
+    keys = [str(EXPORT_MANIFEST_VERSION), name, *(fingerprints[key] for key in ARTIFACT_INPUTS[name])]
+    return hashlib.sha256("|".join(keys).encode("utf-8")).hexdigest()
+
+
+def read_export_manifest(out_dir: str | Path) -> dict[str, Any] | None:
+    """Load ``EXPORT_MANIFEST.json`` from an export directory, or None when absent or unreadable."""
+    try:
+        manifest = json.loads((Path(out_dir) / EXPORT_MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def _is_current(artifact: Any, inputs: str, output_dir: Path) -> bool:
+    """True when a previous artifact was written from the same inputs and is still untouched on disk."""
+    if not isinstance(artifact, dict) or artifact.get("inputs") != inputs:
+        return False
+    try:
+        stat = (output_dir / str(artifact.get("path"))).stat()
+    except OSError:
+        return False
+    return stat.st_size == artifact.get("bytes") and stat.st_mtime_ns == artifact.get("mtime_ns")
+
+
+_WORKER_TABLES: tuple[pd.DataFrame, pd.DataFrame, dict[str, int] | None] | None = None
+
+
+def _init_export_worker(nodes_df: pd.DataFrame, edges_df: pd.DataFrame, communities: dict[str, int] | None) -> None:
+    global _WORKER_TABLES
+    _WORKER_TABLES = (nodes_df, edges_df, communities)
+
+
+def _write_artifact(name: str, output_dir: Path, tables: tuple | None = None) -> str:
+    """Write one Export All artifact from the sorted tables (the worker's copy by default)."""
+    nodes_df, edges_df, communities = tables if tables is not None else _WORKER_TABLES
+    writers: dict[str, Callable[[], str]] = {
+        "nodes_csv": lambda: _write_csv(nodes_df, output_dir / "nodes.csv"),
+        "edges_csv": lambda: _write_csv(edges_df, output_dir / "edges.csv"),
+        "graph_gexf": lambda: export_gexf_frames(nodes_df, edges_df, str(output_dir / "graph.gexf"), communities),
+        "summary_md": lambda: export_summary(nodes_df, edges_df, str(output_dir / "EXPORT_SUMMARY.md")),
+        "nodes_parquet": lambda: _write_parquet_table(nodes_df, REQUIRED_NODE_COLS, output_dir / "nodes.parquet"),
+        "edges_parquet": lambda: _write_parquet_table(edges_df, REQUIRED_EDGE_COLS, output_dir / "edges.parquet"),
+    }
+    return writers[name]()
+
+
+def _describe_artifact(written: str | Future) -> dict[str, Any]:
+    """Describe a written artifact, waiting for its writer first when given a future."""
+    path = Path(written.result() if isinstance(written, Future) else written)
+    stat = path.stat()
+    return {
+        "path": path.name,
+        "bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _file_sha256(path),
+    }
+
+
+def export_all(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    out_dir: str | None = None,
+    communities: dict[str, int] | None = None,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> dict[str, str]:
+    """Write every export artifact from one sorted copy, plus a checksum manifest.
+
+    The writers are GIL-bound pandas and Python code, so with more than one core and at least
+    ``PARALLEL_EXPORT_MIN_ROWS`` rows they run in a process pool of up to ``max_workers``
+    processes (default: one per core); otherwise they run one after another in this thread.
+    Either way a thread pool hashes each artifact as soon as it is written.
+
+    Parquet tables are included when the optional ``pyarrow`` package is installed. The manifest
+    records a fingerprint of the input frames; an artifact whose inputs match the previous
+    manifest and whose file is unchanged on disk is kept instead of rewritten (``force`` rewrites
+    everything). The names written by this run are listed under ``rewritten``.
+
+    Returns artifact paths keyed like the smoke check (``nodes_csv``, ``graph_gexf``...) and ``manifest``.
+    """
+    if out_dir is None:
+        out_dir = get_default_export_dir()
+    output_dir = Path(out_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    fingerprints = {
+        "nodes": frame_fingerprint(nodes_df),
+        "edges": frame_fingerprint(edges_df),
+        "communities": _communities_fingerprint(communities),
+    }
+    names = ["nodes_csv", "edges_csv", "graph_gexf", "summary_md"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        names += ["nodes_parquet", "edges_parquet"]
+    inputs = {name: _artifact_inputs(name, fingerprints) for name in names}
+    previous = {} if force else (read_export_manifest(output_dir) or {}).get("artifacts") or {}
+    artifacts = {name: previous[name] for name in names if _is_current(previous.get(name), inputs[name], output_dir)}
+    stale = [name for name in names if name not in artifacts]
+
+    if stale:
+        sorted_nodes, sorted_edges = prepare_export_tables(nodes_df, edges_df)
+        tables = (sorted_nodes, sorted_edges, communities)
+        workers = min(len(stale), max_workers or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=len(stale)) as hashers:
+            if workers > 1 and len(sorted_nodes) + len(sorted_edges) >= PARALLEL_EXPORT_MIN_ROWS:
+                # Each worker receives the sorted frames once, through the pool initializer.
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_export_worker, initargs=tables
+                ) as writers:
+                    written = {name: writers.submit(_write_artifact, name, output_dir) for name in stale}
+                    hashed = {name: hashers.submit(_describe_artifact, written[name]) for name in stale}
+            else:
+                hashed = {}
+                for name in stale:
+                    hashed[name] = hashers.submit(_describe_artifact, _write_artifact(name, output_dir, tables))
+        # Leaving the pools waits for every writer, so a failure never leaves another one running.
+        for name, future in hashed.items():
+            artifacts[name] = {**future.result(), "inputs": inputs[name]}
+    artifacts = {name: artifacts[name] for name in names}
+
+    manifest = {
+        "format_version": EXPORT_MANIFEST_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "node_count": len(nodes_df),
+        "edge_count": len(edges_df),
+        "inputs": fingerprints,
+        "rewritten": stale,
+        "artifacts": artifacts,
+    }
+    manifest_path = output_dir / EXPORT_MANIFEST_NAME
+    try:
+        manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    except OSError as error:
+        raise RuntimeError(
+            f"Failed to write export manifest to '{manifest_path}'. "
+            "Verify the output directory is writable."
+        ) from error
+
+    paths = {name: str(output_dir / artifact["path"]) for name, artifact in artifacts.items()}
+    paths["manifest"] = str(manifest_path)
+    return paths
@@ -0,0 +1,105 @@
+"""Bitmap facet index for categorical node and edge filters."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def _facet_value(value: Any) -> str:
+    """Return the facet key for a cell, matching ``astype(str)`` comparisons used by filters."""
+    return str(value)
+
+
+class FacetIndex:
+    """One boolean bitmap per distinct column value, aligned with frame row positions."""
+
+    def __init__(self, values: Iterable[Any] = ()) -> None:
+        keys = [_facet_value(value) for value in values]
+        self._size = len(keys)
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object), sort=True)
+        self._bitmaps: dict[str, np.ndarray] = {str(value): codes == code for code, value in enumerate(uniques)}
+        self._counts: dict[str, int] = {value: int(bitmap.sum()) for value, bitmap in self._bitmaps.items()}
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> FacetIndex:
+        """Build a facet index over a frame column."""
+        return cls(series.tolist())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def counts(self) -> dict[str, int]:
+        """Return live row counts per facet value, sorted by value."""
+        return {value: self._counts[value] for value in sorted(self._counts)}
+
+    def mask(self, value: Any) -> np.ndarray:
+        """Return the bitmap of rows equal to value (all False when the value is absent)."""
+        bitmap = self._bitmaps.get(_facet_value(value))
+        return bitmap.copy() if bitmap is not None else np.zeros(self._size, dtype=bool)
+
+    def mask_any(self, values: Iterable[Any]) -> np.ndarray:
+        """Return the OR of the bitmaps for values."""
+        combined = np.zeros(self._size, dtype=bool)
+        for value in values:
+            bitmap = self._bitmaps.get(_facet_value(value))
+            if bitmap is not None:
+                combined |= bitmap
+        return combined
+
+    def _decrement(self, key: str) -> None:
+        self._counts[key] -= 1
+        if self._counts[key] == 0:
+            del self._counts[key]
+            del self._bitmaps[key]
+
+    def _bitmap_for(self, key: str) -> np.ndarray:
+        if key not in self._bitmaps:
+            self._bitmaps[key] = np.zeros(self._size, dtype=bool)
+            self._counts[key] = 0
+        return self._bitmaps[key]
+
+    def set(self, position: int, value: Any) -> None:
+        """Change the facet value of an existing row."""
+        key = _facet_value(value)
+        for current_key, bitmap in list(self._bitmaps.items()):
+            if bitmap[position]:
+                if current_key == key:
+                    return
+                bitmap[position] = False
+                self._decrement(current_key)
+                break
+        self._bitmap_for(key)[position] = True
+        self._counts[key] += 1
+
+    def append(self, values: Iterable[Any]) -> None:
+        """Add rows at the end of the frame."""
+        keys = [_facet_value(value) for value in values]
+        if not keys:
+            return
+        for key in set(keys):
+            self._bitmap_for(key)
+        added = np.asarray(keys, dtype=object)
+        for key, bitmap in self._bitmaps.items():
+            extension = added == key
+            self._bitmaps[key] = np.concatenate([bitmap, extension])
+            self._counts[key] += int(extension.sum())
+        self._size += len(keys)
+
+    def delete(self, positions: Iterable[int]) -> None:
+        """Remove rows at positions, shifting later rows up like ``drop``/``reset_index``."""
+        doomed = sorted(set(int(position) for position in positions))
+        if not doomed:
+            return
+        for key in list(self._bitmaps):
+            bitmap = self._bitmaps[key]
+            removed = int(bitmap[doomed].sum())
+            self._bitmaps[key] = np.delete(bitmap, doomed)
+            self._counts[key] -= removed
+            if self._counts[key] == 0:
+                del self._counts[key]
+                del self._bitmaps[key]
+        self._size -= len(doomed)
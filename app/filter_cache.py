@@ -0,0 +1,107 @@
+"""Bounded LRU cache of filtered Graph view results keyed by data version and filters."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from app.filtering import (
+    DEFAULT_EGO_RADIUS,
+    DEFAULT_HUB_METRIC,
+    DEFAULT_NODE_TYPE_FILTER,
+    DEFAULT_RANGE_SCOPE,
+    DEFAULT_RELATIONSHIP_FILTER,
+)
+
+DEFAULT_MAX_ENTRIES = 16
+
+FilterKey = tuple[Any, ...]
+
+
+def filter_key(
+    type_filter: str,
+    rel_filter: str,
+    search: str,
+    *,
+    ego_seeds: tuple[str, ...] = (),
+    ego_radius: int = DEFAULT_EGO_RADIUS,
+    date_range: tuple[str | None, str | None] = (None, None),
+    confidence_range: tuple[float | None, float | None] = (None, None),
+    range_scope: str = DEFAULT_RANGE_SCOPE,
+    fuzzy: bool = False,
+    query: str = '',
+    community: int | None = None,
+    time_window: tuple[int | None, int | None] = (None, None),
+    min_core: int = 0,
+    top_hubs: int = 0,
+    hub_metric: str = DEFAULT_HUB_METRIC,
+) -> FilterKey:
+    """Return the normalized filter tuple used as a cache key."""
+    return (
+        (type_filter or DEFAULT_NODE_TYPE_FILTER).strip(),
+        (rel_filter or DEFAULT_RELATIONSHIP_FILTER).strip(),
+        (search or '').strip().lower(),
+        tuple(sorted(set(ego_seeds))),
+        int(ego_radius) if ego_seeds else 0,
+        tuple(date_range),
+        tuple(confidence_range),
+        range_scope if any(bound is not None for bound in (*date_range, *confidence_range)) else DEFAULT_RANGE_SCOPE,
+        bool(fuzzy and (search or '').strip()),
+        ' '.join((query or '').split()),
+        community,
+        tuple(time_window),
+        (max(int(min_core), 0), max(int(top_hubs), 0), hub_metric if top_hubs > 0 else DEFAULT_HUB_METRIC),
+    )
+
+
+@dataclass
+class FilteredView:
+    """Row selections and serialized Cytoscape elements for one filter combination."""
+
+    node_positions: np.ndarray
+    edge_positions: np.ndarray
+    elements: list[dict[str, dict[str, Any]]]
+    serialized_elements: str
+    extras: dict[str, Any] = field(default_factory=dict)
+
+
+class FilterResultCache:
+    """Least-recently-used store of FilteredView objects for the current data version."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[int, FilterKey], FilteredView] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, data_version: int, key: FilterKey) -> FilteredView | None:
+        """Return the cached view and mark it most recently used."""
+        entry = self._entries.get((data_version, key))
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end((data_version, key))
+        self.hits += 1
+        return entry
+
+    def put(self, data_version: int, key: FilterKey, view: FilteredView) -> None:
+        """Store a view, evicting the least recently used entries beyond the bound."""
+        self._entries[(data_version, key)] = view
+        self._entries.move_to_end((data_version, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, data_version: int) -> None:
+        """Drop every entry computed for a data version other than data_version."""
+        for cache_key in [cache_key for cache_key in self._entries if cache_key[0] != data_version]:
+            del self._entries[cache_key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
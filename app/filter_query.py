@@ -0,0 +1,385 @@
+"""Small filter query language compiled into mask plans over the nodes and edges tables.
+
+Example: ``type:Person AND rel:funds AND confidence>=0.6 AND label~"kel"``.
+
+Predicates are ``field OP value`` with ``:``/``=`` (equals, case-insensitive), ``!=``,
+``~`` (contains), and ``<``, ``<=``, ``>``, ``>=`` for ``date`` and ``confidence``.
+Terms combine with ``AND`` (or plain juxtaposition), ``OR``, ``NOT``, and parentheses.
+Node fields are ``id``, ``label``, ``type``, ``description``; edge fields are ``rel``,
+``source``, ``target``. Provenance fields (``date``, ``confidence``, ``source_ref``)
+apply to edges unless prefixed with ``node.``; any field may be prefixed with
+``node.`` or ``edge.`` explicitly.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Union
+
+import numpy as np
+import pandas as pd
+
+from app.facet_index import FacetIndex
+from app.filtering import parse_date_bound
+from app.range_index import SortedColumnIndex, confidence_key
+from app.text_index import TrigramIndex
+
+NODE = 'node'
+EDGE = 'edge'
+
+NODE_FIELDS = {'id': 'id', 'label': 'label', 'type': 'type', 'description': 'description'}
+EDGE_FIELDS = {
+    'rel': 'relationship_type',
+    'relationship_type': 'relationship_type',
+    'source': 'source',
+    'target': 'target',
+    'description': 'description',
+}
+PROVENANCE_FIELDS = {'date': 'date', 'confidence': 'confidence', 'source_ref': 'source_ref'}
+COMPARISON_OPERATORS = ('<', '<=', '>', '>=')
+QUERY_PLAN_CACHE_SIZE = 128
+
+_TOKEN_PATTERN = re.compile(
+    r'\s*(?:(?P<paren>[()])|(?P<op><=|>=|!=|[:~=<>])|"(?P<quoted>(?:[^"\\]|\\.)*)"|(?P<word>[^\s()"<>=!:~]+))'
+)
+_KEYWORDS = {'AND', 'OR', 'NOT'}
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """One ``field OP value`` test against a single frame column."""
+
+    target: str
+    column: str
+    op: str
+    value: str
+
+
+@dataclass(frozen=True)
+class AllOf:
+    """Terms that must all match."""
+
+    children: tuple[QueryNode, ...]
+
+
+@dataclass(frozen=True)
+class AnyOf:
+    """Terms of which at least one must match."""
+
+    children: tuple[QueryNode, ...]
+
+
+@dataclass(frozen=True)
+class Negation:
+    """Rows that do not match the wrapped term."""
+
+    child: QueryNode
+
+
+QueryNode = Union[Predicate, AllOf, AnyOf, Negation]
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """Parsed query split into one AND-group per frame."""
+
+    text: str
+    node_terms: tuple[QueryNode, ...]
+    edge_terms: tuple[QueryNode, ...]
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    position = 0
+    while position < len(text):
+        if text[position:].strip() == '':
+            break
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f'Unexpected character at position {position}: {text[position:position + 10]!r}')
+        position = match.end()
+        if match.group('paren'):
+            tokens.append(('paren', match.group('paren')))
+        elif match.group('op'):
+            tokens.append(('op', match.group('op')))
+        elif match.group('quoted') is not None:
+            tokens.append(('value', re.sub(r'\\(.)', r'\1', match.group('quoted'))))
+        else:
+            word = match.group('word')
+            tokens.append(('keyword', word.upper()) if word.upper() in _KEYWORDS else ('value', word))
+    return tokens
+
+
+def _resolve_field(name: str) -> tuple[str, str]:
+    scope, _, field_name = name.lower().rpartition('.')
+    if scope not in ('', NODE, EDGE):
+        raise ValueError(f"Unknown field prefix '{scope}' (use node. or edge.)")
+    if field_name in PROVENANCE_FIELDS:
+        return (NODE if scope == NODE else EDGE), PROVENANCE_FIELDS[field_name]
+    if scope != EDGE and field_name in NODE_FIELDS:
+        return NODE, NODE_FIELDS[field_name]
+    if scope != NODE and field_name in EDGE_FIELDS:
+        return EDGE, EDGE_FIELDS[field_name]
+    raise ValueError(f"Unknown field '{name}'")
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, str]]) -> None:
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise ValueError('Unexpected end of query')
+        self.position += 1
+        return token
+
+    def parse(self) -> QueryNode:
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected '{self.peek()[1]}'")
+        return node
+
+    def parse_or(self) -> QueryNode:
+        children = [self.parse_and()]
+        while self.peek() == ('keyword', 'OR'):
+            self.take()
+            children.append(self.parse_and())
+        return children[0] if len(children) == 1 else AnyOf(tuple(children))
+
+    def parse_and(self) -> QueryNode:
+        children = [self.parse_not()]
+        while True:
+            token = self.peek()
+            if token == ('keyword', 'AND'):
+                self.take()
+            elif token is None or token == ('keyword', 'OR') or token == ('paren', ')'):
+                break
+            children.append(self.parse_not())
+        return children[0] if len(children) == 1 else AllOf(tuple(children))
+
+    def parse_not(self) -> QueryNode:
+        token = self.peek()
+        if token == ('keyword', 'NOT'):
+            self.take()
+            return Negation(self.parse_not())
+        if token == ('paren', '('):
+            self.take()
+            node = self.parse_or()
+            if self.take() != ('paren', ')'):
+                raise ValueError("Expected ')'")
+            return node
+        return self.parse_predicate()
+
+    def parse_predicate(self) -> Predicate:
+        kind, name = self.take()
+        if kind != 'value':
+            raise ValueError(f"Expected a field name, got '{name}'")
+        kind, op = self.take()
+        if kind != 'op':
+            raise ValueError(f"Expected an operator after '{name}'")
+        kind, value = self.take()
+        if kind not in ('value', 'keyword'):
+            raise ValueError(f"Expected a value after '{name}{op}'")
+        target, column = _resolve_field(name)
+        op = ':' if op == '=' else op
+        if op in COMPARISON_OPERATORS and column not in ('date', 'confidence'):
+            raise ValueError(f"'{op}' only applies to date and confidence, not '{name}'")
+        if column == 'confidence' and op != '~' and confidence_key(value) is None:
+            raise ValueError(f"confidence must be a number between 0 and 1, got '{value}'")
+        if column == 'date' and op != '~':
+            parse_date_bound(value)
+        return Predicate(target, column, op, value)
+
+
+def _targets(node: QueryNode) -> set[str]:
+    if isinstance(node, Predicate):
+        return {node.target}
+    if isinstance(node, Negation):
+        return _targets(node.child)
+    return set().union(*(_targets(child) for child in node.children))
+
+
+@lru_cache(maxsize=QUERY_PLAN_CACHE_SIZE)
+def compile_query(text: str) -> QueryPlan:
+    """Parse query text into a plan, caching plans by text; raises ValueError on bad syntax."""
+    tokens = _tokenize(text)
+    if not tokens:
+        return QueryPlan(text, (), ())
+    root = _Parser(tokens).parse()
+    terms = root.children if isinstance(root, AllOf) else (root,)
+    node_terms: list[QueryNode] = []
+    edge_terms: list[QueryNode] = []
+    for term in terms:
+        targets = _targets(term)
+        if len(targets) > 1:
+            raise ValueError('OR and NOT groups cannot mix node and edge fields')
+        (node_terms if targets == {NODE} else edge_terms).append(term)
+    return QueryPlan(text, tuple(node_terms), tuple(edge_terms))
+
+
+@dataclass
+class _Frame:
+    """One table plus the indexes that can answer predicates without scanning it."""
+
+    frame: pd.DataFrame
+    facets: dict[str, FacetIndex]
+    ranges: dict[str, SortedColumnIndex]
+    search_index: TrigramIndex | None = None
+
+    def column_text(self, column: str, positions: np.ndarray) -> pd.Series:
+        if column not in self.frame.columns:
+            return pd.Series([''] * len(positions), dtype=object)
+        values = self.frame[column].iloc[positions]
+        return values.where(values.notna(), '').astype(str).str.lower().reset_index(drop=True)
+
+    def range_index(self, column: str) -> SortedColumnIndex:
+        if column not in self.ranges:
+            self.ranges[column] = SortedColumnIndex.for_column(self.frame, column)
+        return self.ranges[column]
+
+
+def _range_bounds(predicate: Predicate) -> tuple[Any, Any, bool, bool]:
+    """Translate a date/confidence predicate into (low, high, include_low, include_high)."""
+    if predicate.column == 'confidence':
+        value = confidence_key(predicate.value)
+        lower = upper = value
+    else:
+        lower = parse_date_bound(predicate.value)
+        upper = parse_date_bound(predicate.value, upper=True)
+    return {
+        ':': (lower, upper, True, True),
+        '!=': (lower, upper, True, True),
+        '>=': (lower, None, True, True),
+        '>': (upper, None, False, True),
+        '<=': (None, upper, True, True),
+        '<': (None, lower, True, False),
+    }[predicate.op]
+
+
+def _facet_values(facets: FacetIndex, value: str) -> list[str]:
+    wanted = value.lower()
+    return [key for key in facets.counts() if key.lower() == wanted]
+
+
+def _estimate(node: QueryNode, table: _Frame) -> int:
+    """Estimate how many rows node matches, used to order AND/OR evaluation."""
+    size = len(table.frame)
+    if isinstance(node, AllOf):
+        return min(_estimate(child, table) for child in node.children)
+    if isinstance(node, AnyOf):
+        return min(size, sum(_estimate(child, table) for child in node.children))
+    if isinstance(node, Negation):
+        return size - _estimate(node.child, table)
+    if node.column in ('date', 'confidence') and node.op != '~':
+        low, high, include_low, include_high = _range_bounds(node)
+        matched = table.range_index(node.column).count(low, high, include_low=include_low, include_high=include_high)
+        return size - matched if node.op == '!=' else matched
+    facets = table.facets.get(node.column)
+    if facets is not None and node.op in (':', '!='):
+        counts = facets.counts()
+        matched = sum(counts[key] for key in _facet_values(facets, node.value))
+        return size - matched if node.op == '!=' else matched
+    if node.column == 'label' and node.op == '~' and table.search_index is not None:
+        return table.search_index.estimate(node.value)
+    if node.column == 'id' and node.op == ':':
+        return 1
+    return size // 2 if node.op != '!=' else size
+
+
+def _evaluate_predicate(predicate: Predicate, table: _Frame, positions: np.ndarray) -> np.ndarray:
+    """Return a boolean array aligned with positions for one predicate."""
+    if predicate.column in ('date', 'confidence') and predicate.op != '~':
+        low, high, include_low, include_high = _range_bounds(predicate)
+        mask = table.range_index(predicate.column).range_mask(
+            low, high, include_low=include_low, include_high=include_high
+        )[positions]
+        return ~mask if predicate.op == '!=' else mask
+
+    facets = table.facets.get(predicate.column)
+    if facets is not None and predicate.op in (':', '!='):
+        mask = facets.mask_any(_facet_values(facets, predicate.value))[positions]
+        return ~mask if predicate.op == '!=' else mask
+
+    value = predicate.value.lower()
+    if predicate.column == 'label' and predicate.op == '~' and table.search_index is not None:
+        matched_ids = table.search_index.search(value)
+        return table.frame['id'].astype(str).iloc[positions].isin(matched_ids).to_numpy()
+
+    texts = table.column_text(predicate.column, positions)
+    if predicate.op == '~':
+        return texts.str.contains(value, regex=False).to_numpy()
+    mask = (texts == value).to_numpy()
+    return ~mask if predicate.op == '!=' else mask
+
+
+def _evaluate(node: QueryNode, table: _Frame, positions: np.ndarray) -> np.ndarray:
+    """Return the subset of positions (sorted row numbers) that match node."""
+    if isinstance(node, Predicate):
+        return positions[_evaluate_predicate(node, table, positions)]
+    if isinstance(node, Negation):
+        return np.setdiff1d(positions, _evaluate(node.child, table, positions), assume_unique=True)
+    if isinstance(node, AllOf):
+        return _evaluate_all(node.children, table, positions)
+    remaining = positions
+    matched: list[np.ndarray] = []
+    for child in sorted(node.children, key=lambda child: -_estimate(child, table)):
+        if remaining.size == 0:
+            break
+        hits = _evaluate(child, table, remaining)
+        matched.append(hits)
+        remaining = np.setdiff1d(remaining, hits, assume_unique=True)
+    return np.sort(np.concatenate(matched)) if matched else positions[:0]
+
+
+def _evaluate_all(terms: tuple[QueryNode, ...], table: _Frame, positions: np.ndarray) -> np.ndarray:
+    """AND terms together, most selective first, narrowing the candidate rows after each term."""
+    for term in sorted(terms, key=lambda term: _estimate(term, table)):
+        if positions.size == 0:
+            break
+        positions = _evaluate(term, table, positions)
+    return positions
+
+
+def query_masks(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    text: str,
+    *,
+    search_index: TrigramIndex | None = None,
+    node_facets: FacetIndex | None = None,
+    edge_facets: FacetIndex | None = None,
+    node_ranges: dict[str, SortedColumnIndex] | None = None,
+    edge_ranges: dict[str, SortedColumnIndex] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return node and edge masks for a filter query; raises ValueError for invalid queries.
+
+    Edges are kept only when both endpoints survive the node terms, and edge terms
+    run only on those candidate rows.
+    """
+    plan = compile_query((text or '').strip())
+    nodes = _Frame(nodes_df, {'type': node_facets} if node_facets else {}, dict(node_ranges or {}), search_index)
+    edges = _Frame(edges_df, {'relationship_type': edge_facets} if edge_facets else {}, dict(edge_ranges or {}))
+
+    node_positions = _evaluate_all(plan.node_terms, nodes, np.arange(len(nodes_df), dtype=np.int64))
+    node_mask = np.zeros(len(nodes_df), dtype=bool)
+    node_mask[node_positions] = True
+
+    if plan.node_terms:
+        remaining_ids = set(nodes_df['id'].astype(str).iloc[node_positions])
+        edge_positions = np.flatnonzero(
+            (edges_df['source'].astype(str).isin(remaining_ids) & edges_df['target'].astype(str).isin(remaining_ids))
+            .to_numpy()
+        )
+    else:
+        edge_positions = np.arange(len(edges_df), dtype=np.int64)
+    edge_positions = _evaluate_all(plan.edge_terms, edges, edge_positions)
+    edge_mask = np.zeros(len(edges_df), dtype=bool)
+    edge_mask[edge_positions] = True
+    return node_mask, edge_mask
@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from app.adjacency import AdjacencyIndex
+from app.facet_index import FacetIndex
+from app.provenance import is_valid_optional_date
+from app.range_index import SortedColumnIndex
+from app.text_index import TrigramIndex
 
 DEFAULT_NODE_TYPE_FILTER = 'All'
 DEFAULT_RELATIONSHIP_FILTER = 'All'
 DEFAULT_SEARCH_FILTER = ''
+DEFAULT_EGO_RADIUS = 1
+RANGE_SCOPE_OPTIONS = ('Edges', 'Nodes', 'Nodes and edges')
+DEFAULT_RANGE_SCOPE = 'Edges'
+DEFAULT_HUB_METRIC = 'degree'
+CORE_VIEW_MAX_NODES = 500
 
 
 def default_filters() -> tuple[str, str, str]:
@@ -15,34 +26,273 @@ def default_filters() -> tuple[str, str, str]:
     return DEFAULT_NODE_TYPE_FILTER, DEFAULT_RELATIONSHIP_FILTER, DEFAULT_SEARCH_FILTER
 
 
-def apply_filters(
+def filter_masks(
     nodes_df: pd.DataFrame,
     edges_df: pd.DataFrame,
     type_filter: str,
     rel_filter: str,
     search: str,
-) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Return filtered nodes and edges based on type, relationship type, and node-label search."""
-    filtered_nodes = nodes_df.copy()
+    *,
+    search_index: TrigramIndex | None = None,
+    node_facets: FacetIndex | None = None,
+    edge_facets: FacetIndex | None = None,
+    fuzzy: bool = False,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return boolean row masks for nodes and edges matching the Graph view filters.
+
+    Facet indexes, when given, replace per-call string comparisons on ``type`` and
+    ``relationship_type`` with precomputed bitmaps aligned to the frame rows. With
+    ``fuzzy`` the label search keeps the top typo-tolerant matches instead of substrings.
+    """
+    node_mask = np.ones(len(nodes_df), dtype=bool)
 
     normalized_type = (type_filter or DEFAULT_NODE_TYPE_FILTER).strip()
     if normalized_type and normalized_type != DEFAULT_NODE_TYPE_FILTER:
-        filtered_nodes = filtered_nodes[filtered_nodes['type'].astype(str) == normalized_type]
+        if node_facets is not None:
+            node_mask &= node_facets.mask(normalized_type)
+        else:
+            node_mask &= (nodes_df['type'].astype(str) == normalized_type).to_numpy()
 
     normalized_search = (search or '').strip().lower()
-    if normalized_search:
-        filtered_nodes = filtered_nodes[
-            filtered_nodes['label'].astype(str).str.lower().str.contains(normalized_search, na=False)
-        ]
+    if normalized_search and fuzzy:
+        index = search_index if search_index is not None else TrigramIndex.from_nodes(nodes_df)
+        matched_ids = index.fuzzy_search(normalized_search)
+        node_mask &= nodes_df['id'].astype(str).isin(matched_ids).to_numpy()
+    elif normalized_search and search_index is not None:
+        matched_ids = search_index.search(normalized_search)
+        node_mask &= nodes_df['id'].astype(str).isin(matched_ids).to_numpy()
+    elif normalized_search:
+        node_mask &= (
+            nodes_df['label'].astype(str).str.lower().str.contains(normalized_search, na=False, regex=False).to_numpy()
+        )
 
-    remaining_ids = set(filtered_nodes['id'].astype(str))
-    filtered_edges = edges_df.copy()
-    filtered_edges = filtered_edges[
-        filtered_edges['source'].astype(str).isin(remaining_ids) & filtered_edges['target'].astype(str).isin(remaining_ids)
-    ]
+    remaining_ids = set(nodes_df['id'].astype(str)[node_mask])
+    edge_mask = (
+        edges_df['source'].astype(str).isin(remaining_ids) & edges_df['target'].astype(str).isin(remaining_ids)
+    ).to_numpy(copy=True)
 
     normalized_rel = (rel_filter or DEFAULT_RELATIONSHIP_FILTER).strip()
     if normalized_rel and normalized_rel != DEFAULT_RELATIONSHIP_FILTER:
-        filtered_edges = filtered_edges[filtered_edges['relationship_type'].astype(str) == normalized_rel]
+        if edge_facets is not None:
+            edge_mask &= edge_facets.mask(normalized_rel)
+        else:
+            edge_mask &= (edges_df['relationship_type'].astype(str) == normalized_rel).to_numpy()
+
+    return node_mask, edge_mask
+
+
+def apply_filters(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    type_filter: str,
+    rel_filter: str,
+    search: str,
+    *,
+    search_index: TrigramIndex | None = None,
+    node_facets: FacetIndex | None = None,
+    edge_facets: FacetIndex | None = None,
+    fuzzy: bool = False,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Return filtered nodes and edges based on type, relationship type, and node-label search.
+
+    When ``search_index`` is given, the search is answered from its trigram postings
+    instead of scanning every label.
+    """
+    node_mask, edge_mask = filter_masks(
+        nodes_df,
+        edges_df,
+        type_filter,
+        rel_filter,
+        search,
+        search_index=search_index,
+        node_facets=node_facets,
+        edge_facets=edge_facets,
+        fuzzy=fuzzy,
+    )
+    return nodes_df[node_mask].reset_index(drop=True), edges_df[edge_mask].reset_index(drop=True)
+
+
+def parse_seed_ids(text: str) -> tuple[str, ...]:
+    """Split a comma-separated list of node ids into a sorted, de-duplicated tuple."""
+    return tuple(sorted({part.strip() for part in (text or '').split(',') if part.strip()}))
+
+
+def ego_network_masks(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    seeds: list[str] | tuple[str, ...],
+    radius: int = DEFAULT_EGO_RADIUS,
+    relationship_types: list[str] | tuple[str, ...] | None = None,
+    *,
+    adjacency: AdjacencyIndex | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return node and edge masks of the subgraph induced by nodes within radius hops of seeds.
+
+    Traversal and the induced edges are limited to ``relationship_types`` when given.
+    Pass a prebuilt ``adjacency`` to avoid rebuilding the integer index per call.
+    """
+    if adjacency is None:
+        adjacency = AdjacencyIndex.from_frames(nodes_df, edges_df)
+    allowed_edges = adjacency.relationship_mask(relationship_types)
+    node_mask = adjacency.k_hop(adjacency.codes_for(seeds), radius, allowed_edges)
+    return node_mask, adjacency.induced_edge_mask(node_mask, allowed_edges)
+
+
+def ego_network_filter(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    seeds: list[str] | tuple[str, ...],
+    radius: int = DEFAULT_EGO_RADIUS,
+    relationship_types: list[str] | tuple[str, ...] | None = None,
+    *,
+    adjacency: AdjacencyIndex | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Return the ego-network subgraph around seeds as filtered nodes and edges tables."""
+    node_mask, edge_mask = ego_network_masks(
+        nodes_df,
+        edges_df,
+        seeds,
+        radius,
+        relationship_types,
+        adjacency=adjacency,
+    )
+    return nodes_df[node_mask].reset_index(drop=True), edges_df[edge_mask].reset_index(drop=True)
+
+
+def core_numbers(adjacency: AdjacencyIndex) -> np.ndarray:
+    """Return the core number of every node with the linear-time bucket algorithm (Batagelj-Zaversnik).
+
+    Parallel edges count once and self-loops are ignored, like ``nx.core_number`` on
+    the simple graph.
+    """
+    node_count = adjacency.node_count
+    heads, tails = adjacency.entry_heads, adjacency.indices
+    distinct = np.unique(heads[heads != tails] * node_count + tails[heads != tails])
+    heads, tails = distinct // node_count, distinct % node_count
+    degrees = np.bincount(heads, minlength=node_count)
+    indptr = np.concatenate([[0], np.cumsum(degrees)]).tolist()
+    neighbours = tails.tolist()
+
+    # Nodes sorted by current degree; bins[d] is where degree d starts in that order.
+    order = np.argsort(degrees, kind='stable')
+    vertices = order.tolist()
+    positions = np.empty(node_count, dtype=np.int64)
+    positions[order] = np.arange(node_count)
+    positions = positions.tolist()
+    bins = np.concatenate([[0], np.cumsum(np.bincount(degrees))]).tolist()
+    degree = degrees.tolist()
+    for vertex in vertices:
+        current = degree[vertex]
+        for neighbour in neighbours[indptr[vertex]:indptr[vertex + 1]]:
+            neighbour_degree = degree[neighbour]
+            if neighbour_degree > current:
+                # Move the neighbour to the front of its bin, then shrink the bin by one.
+                moved_to = bins[neighbour_degree]
+                displaced = vertices[moved_to]
+                if displaced != neighbour:
+                    old = positions[neighbour]
+                    vertices[old], vertices[moved_to] = displaced, neighbour
+                    positions[displaced], positions[neighbour] = old, moved_to
+                bins[neighbour_degree] += 1
+                degree[neighbour] = neighbour_degree - 1
+    return np.asarray(degree, dtype=np.int64)
+
+
+def core_threshold(cores: np.ndarray, max_nodes: int = CORE_VIEW_MAX_NODES) -> int:
+    """Return the smallest k whose k-core has at most max_nodes nodes (the innermost core if none does)."""
+    if len(cores) == 0:
+        return 0
+    at_least = np.bincount(cores)[::-1].cumsum()[::-1]
+    fitting = np.flatnonzero(at_least <= max_nodes)
+    return int(fitting[0]) if len(fitting) else len(at_least) - 1
+
+
+def top_n_mask(scores: np.ndarray, count: int, within: np.ndarray | None = None) -> np.ndarray:
+    """Return a mask of the count highest-scoring rows (inside within, when given).
+
+    Uses partial selection (``np.partition``) instead of a full sort; ties at the cut
+    are broken by row order. Missing (NaN) scores rank below every other score.
+    """
+    candidates = np.flatnonzero(within) if within is not None else np.arange(len(scores))
+    mask = np.zeros(len(scores), dtype=bool)
+    count = min(max(int(count), 0), len(candidates))
+    if count == 0:
+        return mask
+    values = np.asarray(scores, dtype=float)[candidates]
+    values = np.where(np.isnan(values), -np.inf, values)
+    cut = np.partition(values, len(values) - count)[len(values) - count]
+    above = candidates[values > cut]
+    mask[above] = True
+    mask[candidates[values == cut][:count - len(above)]] = True
+    return mask
+
+
+def core_network_masks(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    min_core: int = 0,
+    top_hubs: int = 0,
+    *,
+    hub_scores: np.ndarray | None = None,
+    within: np.ndarray | None = None,
+    adjacency: AdjacencyIndex | None = None,
+    cores: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return node and edge masks of the k-core (``min_core``) and/or the ``top_hubs`` highest-scoring nodes.
+
+    Hubs are ranked by ``hub_scores`` (per node row; degree when omitted) among the
+    nodes that are inside ``within`` and the core. Pass prebuilt ``adjacency`` and
+    ``cores`` to skip recomputing them.
+    """
+    if adjacency is None:
+        adjacency = AdjacencyIndex.from_frames(nodes_df, edges_df)
+    node_mask = np.ones(adjacency.node_count, dtype=bool) if within is None else within.copy()
+    if min_core > 0:
+        node_mask &= (cores if cores is not None else core_numbers(adjacency)) >= min_core
+    if top_hubs > 0:
+        scores = hub_scores if hub_scores is not None else np.diff(adjacency.indptr)
+        node_mask = top_n_mask(scores, top_hubs, node_mask)
+    return node_mask, adjacency.induced_edge_mask(node_mask)
+
+
+def parse_date_bound(text: str | None, *, upper: bool = False) -> str | None:
+    """Normalize a YYYY, YYYY-MM, or YYYY-MM-DD bound to a comparable YYYY-MM-DD key.
+
+    Partial dates expand to the first day (lower bound) or the last possible day
+    (upper bound) of the period. Raises ValueError for anything else.
+    """
+    value = (text or '').strip()
+    if not value:
+        return None
+    parts = value.split('-')
+    if len(parts) == 1 and len(parts[0]) == 4 and parts[0].isdigit():
+        value = f'{value}-12-31' if upper else f'{value}-01-01'
+    elif len(parts) == 2 and len(parts[0]) == 4 and len(parts[1]) == 2 and value.replace('-', '').isdigit():
+        value = f'{value}-31' if upper else f'{value}-01'
+    if not is_valid_optional_date(value):
+        raise ValueError(f"Invalid date bound '{text}': use YYYY, YYYY-MM, or YYYY-MM-DD")
+    return value
+
+
+def provenance_range_mask(
+    frame: pd.DataFrame,
+    date_range: tuple[str | None, str | None] = (None, None),
+    confidence_range: tuple[float | None, float | None] = (None, None),
+    *,
+    indexes: dict[str, SortedColumnIndex] | None = None,
+) -> np.ndarray:
+    """Return a row mask for rows whose ``date`` and ``confidence`` fall in the inclusive ranges.
 
-    return filtered_nodes.reset_index(drop=True), filtered_edges.reset_index(drop=True)
+    Bounds set to None are open. Rows with a missing value never satisfy an active
+    bound on that column. Pass the frame's prebuilt ``indexes`` to answer each range
+    by binary search instead of sorting the column per call.
+    """
+    mask = np.ones(len(frame), dtype=bool)
+    for column, (low, high) in (('date', date_range), ('confidence', confidence_range)):
+        if low is None and high is None:
+            continue
+        index = indexes.get(column) if indexes else None
+        if index is None:
+            index = SortedColumnIndex.for_column(frame, column)
+        mask &= index.range_mask(low, high)
+    return mask
@@ -0,0 +1,342 @@
+"""Stream GEXF 1.2 documents straight from node and edge tables."""
+
+from __future__ import annotations
+
+import math
+import re
+from datetime import date
+from typing import Any, Callable, Iterator, TextIO
+
+import numpy as np
+import pandas as pd
+
+from app.graph_build import _normalize_optional_text, _serialize_extra_value
+from app.schema import REQUIRED_EDGE_COLS, REQUIRED_NODE_COLS
+
+GEXF_NAMESPACE = "http://www.gexf.net/1.2draft"
+GEXF_SCHEMA_LOCATION = f"{GEXF_NAMESPACE} {GEXF_NAMESPACE}/gexf.xsd"
+GEXF_CHUNK_ROWS = 20_000
+EDGE_KEY_ATTRIBUTE = "networkx_key"
+# Attributes NetworkX writes on the element itself instead of as <attvalue>s.
+NODE_ELEMENT_KEYS = ("pid",)
+EDGE_ELEMENT_KEYS = ("id", "label", "weight", "type")
+
+_XML_ESCAPES: dict[int, str | None] = {
+    ord("&"): "&amp;",
+    ord("<"): "&lt;",
+    ord(">"): "&gt;",
+    ord('"'): "&quot;",
+    ord("\t"): "&#09;",
+    ord("\n"): "&#10;",
+    ord("\r"): "&#13;",
+    **{code: None for code in range(32) if chr(code) not in "\t\n\r"},
+}
+_XML_SPECIAL = re.compile(r'[&<>"\x00-\x1f]')
+
+
+def _xml(value: Any) -> str:
+    """Return ``value`` as escaped attribute text, dropping characters XML 1.0 forbids."""
+    return str(value).translate(_XML_ESCAPES)
+
+
+def _gexf_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "long"
+    if isinstance(value, float):
+        return "double"
+    return "string"
+
+
+def _column_type(types: set[str]) -> str:
+    """Pick one GEXF type for a column; mixed numbers widen to double, other mixes to string."""
+    if types == {"long", "double"}:
+        return "double"
+    if len(types) == 1:
+        return types.pop()
+    return "string"
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and math.isinf(value):
+        return "INF" if value > 0 else "-INF"
+    return _xml(value)
+
+
+def _text(values: pd.Series) -> np.ndarray:
+    """Return ``str(value)`` for every cell, the way NetworkX renders ids and labels."""
+    text = values.to_numpy(dtype=object)
+    if pd.api.types.is_string_dtype(values.dtype) and not values.hasnans:
+        return text
+    return text.astype(str).astype(object)
+
+
+def _escaped(text: np.ndarray) -> np.ndarray:
+    """Escape string cells for attribute text; one scan of the joined chunk skips clean chunks."""
+    if _XML_SPECIAL.search("".join(text)) is None:
+        return text
+    return np.array([_xml(value) for value in text], dtype=object)
+
+
+class _Cells:
+    """Format one attribute column chunk by chunk, vectorized when the dtype allows it.
+
+    ``convert`` is the per-value rule from ``graph_build`` and is only applied to columns of mixed
+    Python objects; numeric, boolean and string columns get the same result in bulk.
+    """
+
+    def __init__(self, series: pd.Series, convert: Callable[[Any], Any], kind: str | None = None) -> None:
+        self.series = series
+        self.convert = convert
+        self.kind = kind or _vector_kind(series)
+
+    def types(self) -> tuple[set[str], bool]:
+        """Return the GEXF types of the non-blank cells and whether any cell has a value."""
+        if self.kind in ("long", "double", "boolean"):
+            present = bool(self.series.notna().any())
+            return ({self.kind} if present else set()), present
+        if self.kind == "string":
+            present = len(self.series) > 0
+            return ({"string"} if bool(self.series.fillna("").ne("").any()) else set()), present
+        types: set[str] = set()
+        present = False
+        for start, stop in _chunks(len(self.series)):
+            values = [self.convert(value) for value in self.series.iloc[start:stop].tolist()]
+            present = present or any(value is not None for value in values)
+            types.update(_gexf_type(value) for value in values if value is not None and value != "")
+        return types, present
+
+    def text(self, start: int, stop: int, skip_blank: bool) -> np.ndarray:
+        """Return escaped value text for rows ``start:stop``, ``None`` where no attvalue is written."""
+        chunk = self.series.iloc[start:stop]
+        if self.kind == "string":
+            text = _escaped(chunk.fillna("").to_numpy(dtype=object))
+            return np.where(text == "", None, text) if skip_blank else text
+        out = np.full(len(chunk), None, dtype=object)
+        if self.kind in ("long", "double", "boolean"):
+            present = chunk.notna().to_numpy(dtype=bool)
+            values = chunk.to_numpy()[present]
+            if self.kind == "long":
+                out[present] = values.astype(np.int64).astype(str)
+            elif self.kind == "boolean":
+                out[present] = np.where(values.astype(bool), "true", "false")
+            else:
+                text = values.astype(str).astype(object)
+                text[text == "inf"] = "INF"
+                text[text == "-inf"] = "-INF"
+                out[present] = text
+            return out
+        for position, value in enumerate(chunk.tolist()):
+            value = self.convert(value)
+            if value is not None and not (skip_blank and value == ""):
+                out[position] = _format_value(value)
+        return out
+
+
+def _vector_kind(series: pd.Series) -> str | None:
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind == "b":
+            return "boolean"
+        if dtype.kind in "iu":
+            return "long"
+        if dtype.kind == "f":
+            return "double"
+    if pd.api.types.infer_dtype(series, skipna=dtype != object) == "string":
+        return "string"
+    return None
+
+
+class _Column:
+    """One declared attribute: its id, title, GEXF type and the cells it is written from."""
+
+    def __init__(self, attribute_id: int, title: str, attribute_type: str, cells: _Cells) -> None:
+        self.prefix = f'<attvalue for="{attribute_id}" value="'
+        self.declaration = f'<attribute id="{attribute_id}" title="{_xml(title)}" type="{attribute_type}" />'
+        self.cells = cells
+        self.skip_blank = attribute_type != "string"
+
+    def fragments(self, start: int, stop: int) -> np.ndarray:
+        text = self.cells.text(start, stop, self.skip_blank)
+        present = text != None  # noqa: E711 - elementwise comparison
+        out = np.full(len(text), "", dtype=object)
+        out[present] = self.prefix + text[present] + '" />'
+        return out
+
+
+def _chunks(row_count: int) -> Iterator[tuple[int, int]]:
+    for start in range(0, row_count, GEXF_CHUNK_ROWS):
+        yield start, min(start + GEXF_CHUNK_ROWS, row_count)
+
+
+def _declare(named_cells: list[tuple[str, _Cells]], first_id: int) -> list[_Column]:
+    """Declare attributes in NetworkX's order, skipping columns without any value."""
+    columns: list[_Column] = []
+    for title, cells in named_cells:
+        types, present = cells.types()
+        if present:
+            columns.append(_Column(first_id + len(columns), title, _column_type(types), cells))
+    return columns
+
+
+def _node_attributes(nodes_df: pd.DataFrame, communities: dict[str, int] | None) -> list[tuple[str, _Cells]]:
+    id_column, _, type_column, description_column = REQUIRED_NODE_COLS
+    named = {
+        type_column: _Cells(nodes_df[type_column], _serialize_extra_value),
+        description_column: _Cells(nodes_df[description_column], _normalize_optional_text),
+    }
+    for column in nodes_df.columns:
+        if column not in REQUIRED_NODE_COLS and column not in NODE_ELEMENT_KEYS:
+            named[str(column)] = _Cells(nodes_df[column], _serialize_extra_value)
+    if communities is not None:
+        labels = nodes_df[id_column].astype(str).map(communities)
+        named["community"] = _Cells(labels, _serialize_extra_value, kind="long")
+    return list(named.items())
+
+
+def _edge_attributes(edges_df: pd.DataFrame, keys: np.ndarray) -> list[tuple[str, _Cells]]:
+    _, _, relationship_column, description_column = REQUIRED_EDGE_COLS
+    named = {
+        relationship_column: _Cells(edges_df[relationship_column], _serialize_extra_value),
+        description_column: _Cells(edges_df[description_column], _normalize_optional_text),
+    }
+    for column in edges_df.columns:
+        if column not in REQUIRED_EDGE_COLS and column not in EDGE_ELEMENT_KEYS:
+            named[str(column)] = _Cells(edges_df[column], _serialize_extra_value)
+    named[EDGE_KEY_ATTRIBUTE] = _Cells(pd.Series(keys), _serialize_extra_value)
+    return list(named.items())
+
+
+def _endpoint_codes(edges_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return integer codes for edge sources and targets plus the distinct endpoint ids."""
+    source_column, target_column = REQUIRED_EDGE_COLS[:2]
+    codes, endpoints = pd.factorize(pd.concat([edges_df[source_column], edges_df[target_column]], ignore_index=True))
+    return codes[: len(edges_df)], codes[len(edges_df) :], np.asarray(endpoints, dtype=object)
+
+
+def _parallel_edge_keys(source_codes: np.ndarray, target_codes: np.ndarray, endpoint_count: int) -> np.ndarray:
+    """Return the MultiGraph key of each edge: how many earlier rows join the same node pair."""
+    pairs = np.minimum(source_codes, target_codes).astype(np.int64) * endpoint_count + np.maximum(
+        source_codes, target_codes
+    )
+    order = np.argsort(pairs, kind="stable")
+    sorted_pairs = pairs[order]
+    starts = np.flatnonzero(np.r_[True, sorted_pairs[1:] != sorted_pairs[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(pairs)])
+    keys = np.empty(len(pairs), dtype=np.int64)
+    keys[order] = np.arange(len(pairs)) - np.repeat(starts, run_lengths)
+    return keys
+
+
+def _element_attributes(df: pd.DataFrame, keys: tuple[str, ...], start: int, stop: int) -> np.ndarray:
+    """Return the reserved keys NetworkX writes as XML attributes (``pid``, edge ``label``...)."""
+    parts = np.full(stop - start, "", dtype=object)
+    for key in keys:
+        if key in df.columns:
+            text = _Cells(df[key], _serialize_extra_value).text(start, stop, skip_blank=True)
+            present = text != None  # noqa: E711 - elementwise comparison
+            parts[present] = parts[present] + f' {key}="' + text[present] + '"'
+    return parts
+
+
+def _attvalues(columns: list[_Column], start: int, stop: int) -> np.ndarray:
+    body = np.full(stop - start, "", dtype=object)
+    for column in columns:
+        body = body + column.fragments(start, stop)
+    present = body != ""
+    body[present] = "<attvalues>" + body[present] + "</attvalues>"
+    return body
+
+
+def _elements(tag: str, openings: np.ndarray, attvalues: np.ndarray) -> str:
+    closed = attvalues != ""
+    lines = openings + " />\n"
+    lines[closed] = openings[closed] + ">" + attvalues[closed] + f"</{tag}>\n"
+    return "".join(lines.tolist())
+
+
+def _write_nodes(handle: TextIO, nodes_df: pd.DataFrame, columns: list[_Column]) -> None:
+    id_column, label_column = REQUIRED_NODE_COLS[:2]
+    for start, stop in _chunks(len(nodes_df)):
+        ids = _escaped(_text(nodes_df[id_column].iloc[start:stop]))
+        labels = _escaped(_text(nodes_df[label_column].iloc[start:stop]))
+        extras = _element_attributes(nodes_df, NODE_ELEMENT_KEYS, start, stop)
+        openings = '      <node id="' + ids + '" label="' + labels + '"' + extras
+        handle.write(_elements("node", openings, _attvalues(columns, start, stop)))
+
+
+def _write_bare_nodes(
+    handle: TextIO,
+    nodes_df: pd.DataFrame,
+    source_codes: np.ndarray,
+    target_codes: np.ndarray,
+    endpoints: np.ndarray,
+) -> None:
+    """Write edge endpoints missing from the node table as bare nodes, as the MultiGraph has them."""
+    unknown = ~pd.Series(endpoints, dtype=object).isin(nodes_df[REQUIRED_NODE_COLS[0]].to_numpy(dtype=object))
+    unknown = unknown.to_numpy(dtype=bool)
+    if not unknown.any():
+        return
+    # Interleave source and target per row so the order matches NetworkX's add_edge calls.
+    codes = np.column_stack([source_codes, target_codes]).ravel()
+    missing = endpoints[pd.unique(codes[unknown[codes]])]
+    handle.write("".join(f'      <node id="{_xml(node_id)}" label="{_xml(node_id)}" />\n' for node_id in missing))
+
+
+def _write_edges(handle: TextIO, edges_df: pd.DataFrame, columns: list[_Column]) -> None:
+    source_column, target_column = REQUIRED_EDGE_COLS[:2]
+    for start, stop in _chunks(len(edges_df)):
+        # Rows without an ``id`` value are numbered by position, like NetworkX's edge counter.
+        ids = np.arange(start, stop).astype(str).astype(object)
+        if EDGE_ELEMENT_KEYS[0] in edges_df.columns:
+            given = _Cells(edges_df[EDGE_ELEMENT_KEYS[0]], _serialize_extra_value).text(start, stop, skip_blank=True)
+            present = given != None  # noqa: E711 - elementwise comparison
+            ids[present] = given[present]
+        sources = _escaped(_text(edges_df[source_column].iloc[start:stop]))
+        targets = _escaped(_text(edges_df[target_column].iloc[start:stop]))
+        extras = _element_attributes(edges_df, EDGE_ELEMENT_KEYS[1:], start, stop)
+        openings = '      <edge id="' + ids + '" source="' + sources + '" target="' + targets + '"' + extras
+        handle.write(_elements("edge", openings, _attvalues(columns, start, stop)))
+
+
+def write_gexf(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    handle: TextIO,
+    communities: dict[str, int] | None = None,
+) -> None:
+    """Write the tables as an undirected GEXF graph, one chunk of rows at a time.
+
+    Attributes follow ``build_networkx_graph``: ``type``/``relationship_type``, ``description``,
+    every extra column, ``community`` when ``communities`` is given and the parallel-edge
+    ``networkx_key``, so ``nx.read_gexf`` and Gephi see the same graph as before. Each attribute is
+    declared with one type for the whole column; blank cells of numeric columns are left out.
+    """
+    node_columns = _declare(_node_attributes(nodes_df, communities), 0)
+    source_codes, target_codes, endpoints = _endpoint_codes(edges_df)
+    keys = _parallel_edge_keys(source_codes, target_codes, len(endpoints))
+    edge_columns = _declare(_edge_attributes(edges_df, keys), len(node_columns))
+
+    handle.write("<?xml version='1.0' encoding='utf-8'?>\n")
+    handle.write(
+        f'<gexf xmlns="{GEXF_NAMESPACE}" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        f'xsi:schemaLocation="{GEXF_SCHEMA_LOCATION}" version="1.2">\n'
+        f'  <meta lastmodifieddate="{date.today().isoformat()}">\n'
+        "    <creator>digitalization</creator>\n"
+        "  </meta>\n"
+        '  <graph defaultedgetype="undirected" mode="static" name="">\n'
+    )
+    for class_name, columns in (("node", node_columns), ("edge", edge_columns)):
+        if columns:
+            handle.write(f'    <attributes mode="static" class="{class_name}">\n')
+            handle.write("".join(f"      {column.declaration}\n" for column in columns))
+            handle.write("    </attributes>\n")
+    handle.write("    <nodes>\n")
+    _write_nodes(handle, nodes_df, node_columns)
+    _write_bare_nodes(handle, nodes_df, source_codes, target_codes, endpoints)
+    handle.write("    </nodes>\n    <edges>\n")
+    _write_edges(handle, edges_df, edge_columns)
+    handle.write("    </edges>\n  </graph>\n</gexf>\n")
@@ -29,8 +29,15 @@ def _serialize_extra_value(value: Any) -> str | int | float | bool | None:
     return str(value)
 
 
-def build_cytoscape_elements(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> list[dict[str, dict[str, Any]]]:
-    """Convert nodes and edges tables into Cytoscape element dictionaries."""
+def build_cytoscape_elements(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    communities: dict[str, int] | None = None,
+) -> list[dict[str, dict[str, Any]]]:
+    """Convert nodes and edges tables into Cytoscape element dictionaries.
+
+    When ``communities`` maps node ids to labels, nodes get a ``community`` data field.
+    """
     elements: list[dict[str, dict[str, Any]]] = []
 
     node_required = set(REQUIRED_NODE_COLS)
@@ -49,6 +56,9 @@ def build_cytoscape_elements(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) ->
                 continue
             node_data[column] = _serialize_extra_value(row[column])
 
+        if communities is not None and str(node_data["id"]) in communities:
+            node_data["community"] = communities[str(node_data["id"])]
+
         elements.append({"data": node_data})
 
     for row_index, row in edges_df.iterrows():
@@ -75,8 +85,15 @@ def build_cytoscape_elements(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) ->
     return elements
 
 
-def build_networkx_graph(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> "nx.MultiGraph":
-    """Build an undirected MultiGraph so duplicate source/target edges are preserved as parallel edges."""
+def build_networkx_graph(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    communities: dict[str, int] | None = None,
+) -> "nx.MultiGraph":
+    """Build an undirected MultiGraph so duplicate source/target edges are preserved as parallel edges.
+
+    When ``communities`` maps node ids to labels, nodes get a ``community`` attribute.
+    """
     import networkx as nx
 
     graph = nx.MultiGraph()
@@ -97,6 +114,9 @@ def build_networkx_graph(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> "nx.
                 continue
             node_attributes[column] = _serialize_extra_value(row[column])
 
+        if communities is not None and str(node_id) in communities:
+            node_attributes["community"] = communities[str(node_id)]
+
         graph.add_node(node_id, **node_attributes)
 
     for _, row in edges_df.iterrows():
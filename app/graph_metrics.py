@@ -0,0 +1,300 @@
+"""Degree, component, triangle and clustering metrics kept up to date across CRUD edits."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import pandas as pd
+
+from app.crud_edges import diff_edge_frames
+
+
+class GraphMetrics:
+    """Structural metrics of the undirected graph behind the nodes and edges tables.
+
+    Degree follows the NetworkX MultiGraph built by ``build_networkx_graph`` (parallel
+    edges count, a self-loop counts twice). Triangles and clustering use the simple
+    graph without self-loops, like ``nx.triangles``/``nx.clustering``. Components are
+    disjoint sets merged smaller-into-larger on edge adds; removing the last edge
+    between two nodes runs a bidirectional search that stops as soon as the two sides
+    meet, and splits off the side that was exhausted first. Each edit therefore only
+    touches the neighbourhood of its endpoints (or the smaller split-off component).
+    """
+
+    def __init__(self) -> None:
+        self._explicit: set[str] = set()
+        self._degree: dict[str, int] = {}
+        self._neighbours: dict[str, dict[str, int]] = {}
+        self._triangles: dict[str, int] = {}
+        self._component_of: dict[str, int] = {}
+        self._members: dict[int, set[str]] = {}
+        self._next_component = 0
+        self._edge_count = 0
+        self._triangle_total = 0
+        self._clustering_total = 0.0
+
+    @classmethod
+    def from_frames(cls, nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> GraphMetrics:
+        """Build metrics for the tables by replaying every node and edge."""
+        metrics = cls()
+        for node_id in nodes_df['id'].astype(str).tolist():
+            metrics.add_node(node_id)
+        for source, target in zip(edges_df['source'].astype(str).tolist(), edges_df['target'].astype(str).tolist()):
+            metrics.add_edge(source, target)
+        return metrics
+
+    # -- queries -------------------------------------------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return len(self._degree)
+
+    @property
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    @property
+    def component_count(self) -> int:
+        return len(self._members)
+
+    @property
+    def triangle_count(self) -> int:
+        return self._triangle_total
+
+    @property
+    def average_clustering(self) -> float:
+        return self._clustering_total / self.node_count if self.node_count else 0.0
+
+    def degree(self, node_id: Any) -> int:
+        return self._degree.get(str(node_id), 0)
+
+    def triangles(self, node_id: Any) -> int:
+        return self._triangles.get(str(node_id), 0)
+
+    def clustering(self, node_id: Any) -> float:
+        node_id = str(node_id)
+        if node_id not in self._degree:
+            return 0.0
+        return self._local_clustering(node_id)
+
+    def component_size(self, node_id: Any) -> int:
+        label = self._component_of.get(str(node_id))
+        return 0 if label is None else len(self._members[label])
+
+    def same_component(self, first: Any, second: Any) -> bool:
+        label = self._component_of.get(str(first))
+        return label is not None and label == self._component_of.get(str(second))
+
+    def summary(self) -> dict[str, float]:
+        """Return the graph-level metrics as a flat dictionary."""
+        return {
+            'nodes': self.node_count,
+            'edges': self.edge_count,
+            'components': self.component_count,
+            'largest_component': max((len(members) for members in self._members.values()), default=0),
+            'triangles': self.triangle_count,
+            'average_clustering': self.average_clustering,
+        }
+
+    def node_metrics(self, node_id: Any) -> dict[str, float]:
+        """Return the per-node metrics, or an empty dict for unknown ids."""
+        node_id = str(node_id)
+        if node_id not in self._degree:
+            return {}
+        return {
+            'degree': self.degree(node_id),
+            'triangles': self.triangles(node_id),
+            'clustering': self.clustering(node_id),
+            'component_size': self.component_size(node_id),
+        }
+
+    # -- nodes ---------------------------------------------------------------------
+
+    def _local_clustering(self, node_id: str) -> float:
+        neighbours = len(self._neighbours[node_id])
+        if neighbours < 2:
+            return 0.0
+        return 2 * self._triangles[node_id] / (neighbours * (neighbours - 1))
+
+    def _ensure_node(self, node_id: str) -> None:
+        if node_id in self._degree:
+            return
+        self._degree[node_id] = 0
+        self._neighbours[node_id] = {}
+        self._triangles[node_id] = 0
+        label = self._next_component
+        self._next_component += 1
+        self._component_of[node_id] = label
+        self._members[label] = {node_id}
+
+    def _drop_node(self, node_id: str) -> None:
+        label = self._component_of.pop(node_id)
+        del self._members[label]
+        del self._degree[node_id]
+        del self._neighbours[node_id]
+        del self._triangles[node_id]
+
+    def add_node(self, node_id: Any) -> None:
+        """Register a node row (isolated until edges reference it)."""
+        node_id = str(node_id)
+        self._explicit.add(node_id)
+        self._ensure_node(node_id)
+
+    def remove_node(self, node_id: Any) -> None:
+        """Forget a node row; it stays in the graph while edges still reference it."""
+        node_id = str(node_id)
+        self._explicit.discard(node_id)
+        if node_id in self._degree and self._degree[node_id] == 0:
+            self._drop_node(node_id)
+
+    def rename_node(self, old_id: Any, new_id: Any) -> None:
+        """Apply a node id edit (edges keep referencing the old id until they are edited)."""
+        if str(old_id) != str(new_id):
+            self.remove_node(old_id)
+            self.add_node(new_id)
+
+    # -- edges ---------------------------------------------------------------------
+
+    def _shift_triangles(self, first: str, second: str, sign: int) -> None:
+        """Count the triangles closed by the simple edge first-second into every corner."""
+        near, far = self._neighbours[first], self._neighbours[second]
+        if len(near) > len(far):
+            near, far = far, near
+        common = [node for node in near if node in far]
+        if not common:
+            return
+        touched = [first, second, *common]
+        before = sum(self._local_clustering(node) for node in touched)
+        self._triangles[first] += sign * len(common)
+        self._triangles[second] += sign * len(common)
+        for node in common:
+            self._triangles[node] += sign
+        self._triangle_total += sign * len(common)
+        self._clustering_total += sum(self._local_clustering(node) for node in touched) - before
+
+    def _set_adjacent(self, first: str, second: str, adjacent: bool) -> None:
+        touched = (first, second)
+        before = sum(self._local_clustering(node) for node in touched)
+        if adjacent:
+            self._neighbours[first][second] = 0
+            self._neighbours[second][first] = 0
+        else:
+            del self._neighbours[first][second]
+            del self._neighbours[second][first]
+        self._clustering_total += sum(self._local_clustering(node) for node in touched) - before
+
+    def _merge(self, first: str, second: str) -> None:
+        keep, gone = self._component_of[first], self._component_of[second]
+        if keep == gone:
+            return
+        if len(self._members[keep]) < len(self._members[gone]):
+            keep, gone = gone, keep
+        moved = self._members.pop(gone)
+        for node in moved:
+            self._component_of[node] = keep
+        self._members[keep] |= moved
+
+    def _split_if_disconnected(self, first: str, second: str) -> None:
+        seen = ({first}, {second})
+        frontiers = ([first], [second])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(seen[0]) <= len(seen[1]) else 1
+            other = seen[1 - side]
+            reached: list[str] = []
+            for node in frontiers[side]:
+                for neighbour in self._neighbours[node]:
+                    if neighbour in other:
+                        return
+                    if neighbour not in seen[side]:
+                        seen[side].add(neighbour)
+                        reached.append(neighbour)
+            frontiers[side][:] = reached
+        detached = seen[0] if not frontiers[0] else seen[1]
+        old = self._component_of[next(iter(detached))]
+        self._members[old] -= detached
+        label = self._next_component
+        self._next_component += 1
+        self._members[label] = detached
+        for node in detached:
+            self._component_of[node] = label
+
+    def add_edge(self, source: Any, target: Any) -> None:
+        """Apply one added edge row."""
+        source, target = str(source), str(target)
+        self._ensure_node(source)
+        self._ensure_node(target)
+        self._edge_count += 1
+        self._degree[source] += 1
+        self._degree[target] += 1
+        if source == target:
+            return
+        count = self._neighbours[source].get(target)
+        if count is None:
+            self._shift_triangles(source, target, 1)
+            self._set_adjacent(source, target, True)
+            self._merge(source, target)
+        self._neighbours[source][target] += 1
+        self._neighbours[target][source] += 1
+
+    def remove_edge(self, source: Any, target: Any) -> None:
+        """Apply one removed edge row; unknown edges raise ValueError."""
+        source, target = str(source), str(target)
+        if source not in self._degree or target not in self._degree:
+            raise ValueError(f"Unknown edge '{source}' -> '{target}'")
+        if source != target:
+            count = self._neighbours[source].get(target)
+            if count is None:
+                raise ValueError(f"Unknown edge '{source}' -> '{target}'")
+            if count > 1:
+                self._neighbours[source][target] -= 1
+                self._neighbours[target][source] -= 1
+            else:
+                self._set_adjacent(source, target, False)
+                self._shift_triangles(source, target, -1)
+                self._split_if_disconnected(source, target)
+        elif self._degree[source] < 2:
+            raise ValueError(f"Unknown edge '{source}' -> '{target}'")
+        self._edge_count -= 1
+        self._degree[source] -= 1
+        self._degree[target] -= 1
+        for node in {source, target}:
+            if self._degree[node] == 0 and node not in self._explicit:
+                self._drop_node(node)
+
+    def apply_edge_pairs(
+        self,
+        removed: Iterable[tuple[Any, Any]] = (),
+        added: Iterable[tuple[Any, Any]] = (),
+    ) -> None:
+        """Apply removed edges first, then added ones."""
+        for source, target in removed:
+            self.remove_edge(source, target)
+        for source, target in added:
+            self.add_edge(source, target)
+
+    def sync_edges(self, old_edges_df: pd.DataFrame, new_edges_df: pd.DataFrame) -> bool:
+        """Apply the difference between two edge tables; returns False when the caller must rebuild.
+
+        Rows are matched by index label, so this needs unique labels in both frames.
+        """
+        changes = diff_edge_frames(old_edges_df, new_edges_df)
+        if not (old_edges_df.index.is_unique and new_edges_df.index.is_unique):
+            return False
+        removed = [
+            (old_edges_df['source'].iloc[position], old_edges_df['target'].iloc[position])
+            for position in changes.removed_positions
+        ]
+        added = [
+            (new_edges_df['source'].iloc[position], new_edges_df['target'].iloc[position])
+            for position in changes.added_positions
+        ]
+        for position in changes.changed_positions:
+            label = new_edges_df.index[position]
+            old_pair = (str(old_edges_df.at[label, 'source']), str(old_edges_df.at[label, 'target']))
+            new_pair = (str(new_edges_df.at[label, 'source']), str(new_edges_df.at[label, 'target']))
+            if old_pair != new_pair:
+                removed.append(old_pair)
+                added.append(new_pair)
+        self.apply_edge_pairs(removed, added)
+        return True
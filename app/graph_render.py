@@ -2,79 +2,242 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from collections.abc import Callable
+from pathlib import Path
+from typing import Any
 from uuid import uuid4
 
-from fastapi import Body
+from fastapi import Body, HTTPException
+from fastapi.responses import FileResponse
 from nicegui import app, ui
 
-_CYTOSCAPE_CDN_INJECTED = False
-_CYTOSCAPE_CDN_URL = 'https://unpkg.com/cytoscape@3.29.2/dist/cytoscape.min.js'
-_SELECTION_ENDPOINT_REGISTERED = False
-_SELECTION_CALLBACKS: dict[str, Callable[[dict], None]] = {}
+from app.spatial_index import ViewportSource
 
+_VENDOR_DIR = Path(__file__).resolve().parent / 'static' / 'vendor'
+_CYTOSCAPE_ASSET = 'cytoscape.esm.min.js'
+_ASSET_URL_PREFIX = '/_dhviz/assets'
+_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+_CYTOSCAPE_ASSETS_INJECTED = False
+_ASSET_ROUTE_REGISTERED = False
+_HASHED_ASSETS: dict[str, Path] = {}
+_SELECTION_EVENT = 'dhviz_selection'
+_VIEWPORT_ENDPOINT_REGISTERED = False
+_METRICS_ENDPOINT_REGISTERED = False
 
-def _ensure_selection_endpoint() -> None:
-    """Register an API endpoint that receives Cytoscape selection payloads from JS."""
-    global _SELECTION_ENDPOINT_REGISTERED
-    if _SELECTION_ENDPOINT_REGISTERED:
+
+class ClientRegistry:
+    """Hold at most one value per NiceGUI client id; re-registering replaces the old value."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, Any] = {}
+
+    def set(self, client_id: str, value: Any) -> None:
+        """Store value for client_id, dropping whatever the client registered before."""
+        self._entries[client_id] = value
+
+    def get(self, client_id: str) -> Any | None:
+        """Return the value registered for client_id, if any."""
+        return self._entries.get(client_id)
+
+    def discard(self, client_id: str) -> None:
+        """Forget the value registered for client_id."""
+        self._entries.pop(client_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_SELECTION_CALLBACKS = ClientRegistry()
+_VIEWPORT_SOURCES = ClientRegistry()
+_TRACKED_CLIENT_IDS: set[str] = set()
+
+
+def registry_metrics() -> dict[str, int]:
+    """Return the number of live per-client renderer registrations."""
+    return {
+        'selection_callbacks': len(_SELECTION_CALLBACKS),
+        'viewport_sources': len(_VIEWPORT_SOURCES),
+        'tracked_clients': len(_TRACKED_CLIENT_IDS),
+    }
+
+
+def _release_client(client_id: str) -> None:
+    """Drop every registration held for a deleted client."""
+    _SELECTION_CALLBACKS.discard(client_id)
+    _VIEWPORT_SOURCES.discard(client_id)
+    _TRACKED_CLIENT_IDS.discard(client_id)
+
+
+def _normalize_selection(payload: Any) -> dict:
+    """Coerce a raw selection payload from JS into a {'kind', 'data'} dictionary."""
+    safe_payload = payload if isinstance(payload, dict) else {}
+    kind = safe_payload.get('kind')
+    if kind not in {'node', 'edge', 'none'}:
+        kind = 'none'
+
+    data = safe_payload.get('data')
+    if not isinstance(data, dict):
+        data = {}
+    return {'kind': kind, 'data': data}
+
+
+def _dispatch_selection(client_id: str, payload: Any) -> None:
+    """Forward a selection event to the callback currently registered for the client."""
+    callback = _SELECTION_CALLBACKS.get(client_id)
+    if callback is not None:
+        callback(_normalize_selection(payload))
+
+
+def _track_client(client) -> None:
+    """Subscribe once to the client's selection events and release its registrations on delete."""
+    if client.id in _TRACKED_CLIENT_IDS:
+        return
+    _TRACKED_CLIENT_IDS.add(client.id)
+    client_id = client.id
+    ui.on(_SELECTION_EVENT, lambda event: _dispatch_selection(client_id, event.args))
+    client.on_delete(lambda: _release_client(client_id))
+
+
+def _ensure_metrics_endpoint() -> None:
+    """Register an API endpoint reporting renderer registry sizes."""
+    global _METRICS_ENDPOINT_REGISTERED
+    if _METRICS_ENDPOINT_REGISTERED:
         return
 
-    @app.post('/api/selection/{selection_id}')
-    async def _receive_selection(selection_id: str, payload: dict = Body(default=None)) -> dict[str, str]:
-        callback = _SELECTION_CALLBACKS.get(selection_id)
-        if callback is None:
-            return {'status': 'ignored'}
+    @app.get('/api/metrics/renderer')
+    async def _renderer_metrics() -> dict[str, int]:
+        return registry_metrics()
+
+    _METRICS_ENDPOINT_REGISTERED = True
+
+
+def _ensure_viewport_endpoint() -> None:
+    """Register an API endpoint that returns the elements inside a Cytoscape viewport."""
+    global _VIEWPORT_ENDPOINT_REGISTERED
+    if _VIEWPORT_ENDPOINT_REGISTERED:
+        return
+
+    @app.post('/api/viewport/{view_id}')
+    async def _receive_viewport(view_id: str, payload: dict = Body(default=None)) -> dict:
+        source = _VIEWPORT_SOURCES.get(view_id)
+        if source is None:
+            return {'status': 'ignored', 'elements': []}
 
         safe_payload = payload if isinstance(payload, dict) else {}
-        kind = safe_payload.get('kind')
-        if kind not in {'node', 'edge', 'none'}:
-            kind = 'none'
+        try:
+            x1, y1, x2, y2 = (float(safe_payload[key]) for key in ('x1', 'y1', 'x2', 'y2'))
+            zoom = float(safe_payload.get('zoom', 1.0))
+        except (KeyError, TypeError, ValueError):
+            return {'status': 'invalid', 'elements': []}
+
+        return {'status': 'ok', 'elements': source.query(x1, y1, x2, y2, zoom)}
+
+    _VIEWPORT_ENDPOINT_REGISTERED = True
+
+
+def hashed_asset_name(path: Path) -> str:
+    """Return the file name with a short content hash inserted before the extensions."""
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    stem, _, suffix = path.name.partition('.')
+    return f'{stem}.{digest}.{suffix}'
+
+
+def _ensure_asset_route() -> None:
+    """Register a route serving vendored assets under content-hashed, immutable URLs."""
+    global _ASSET_ROUTE_REGISTERED
+    if _ASSET_ROUTE_REGISTERED:
+        return
 
-        data = safe_payload.get('data')
-        if not isinstance(data, dict):
-            data = {}
+    @app.get(_ASSET_URL_PREFIX + '/{asset_name}')
+    async def _serve_asset(asset_name: str) -> FileResponse:
+        asset_path = _HASHED_ASSETS.get(asset_name)
+        if asset_path is None:
+            raise HTTPException(status_code=404)
+        return FileResponse(
+            asset_path,
+            media_type='text/javascript',
+            headers={'Cache-Control': _IMMUTABLE_CACHE_CONTROL},
+        )
+
+    _ASSET_ROUTE_REGISTERED = True
 
-        callback({'kind': kind, 'data': data})
-        return {'status': 'ok'}
 
-    _SELECTION_ENDPOINT_REGISTERED = True
+def _asset_url(file_name: str) -> str:
+    """Register a vendored asset for serving and return its content-hashed URL."""
+    asset_path = _VENDOR_DIR / file_name
+    asset_name = hashed_asset_name(asset_path)
+    _HASHED_ASSETS[asset_name] = asset_path
+    return f'{_ASSET_URL_PREFIX}/{asset_name}'
 
 
-def _ensure_cytoscape_cdn() -> None:
-    """Inject Cytoscape.js into the page head once."""
-    global _CYTOSCAPE_CDN_INJECTED
-    if _CYTOSCAPE_CDN_INJECTED:
+def _ensure_cytoscape_assets() -> None:
+    """Expose the vendored Cytoscape.js build to every page as a load promise."""
+    global _CYTOSCAPE_ASSETS_INJECTED
+    if _CYTOSCAPE_ASSETS_INJECTED:
         return
 
+    _ensure_asset_route()
+    cytoscape_url = _asset_url(_CYTOSCAPE_ASSET)
     ui.add_head_html(
         (
+            f'<link rel="modulepreload" href="{cytoscape_url}">'
             '<script>'
-            "if (!window.__cytoscapeScriptRequested) {"
-            '  window.__cytoscapeScriptRequested = true;'
-            "  const script = document.createElement('script');"
-            f"  script.src = '{_CYTOSCAPE_CDN_URL}';"
-            '  script.async = true;'
-            '  document.head.appendChild(script);'
-            '}'
+            'window.__cytoscapeReady = window.__cytoscapeReady'
+            f" || import('{cytoscape_url}').then((module) => {{"
+            '  window.cytoscape = module.c;'
+            '  return module.c;'
+            '});'
             '</script>'
-        )
+        ),
+        shared=True,
     )
-    _CYTOSCAPE_CDN_INJECTED = True
+    _CYTOSCAPE_ASSETS_INJECTED = True
 
 
-def render_cytoscape(container, elements: list[dict], *, height: str = '75vh', on_select=None) -> None:
-    """Render Cytoscape graph inside the given NiceGUI container."""
-    _ensure_cytoscape_cdn()
-    if on_select is not None:
-        _ensure_selection_endpoint()
+def render_cytoscape(
+    container,
+    elements: list[dict],
+    *,
+    height: str = '75vh',
+    on_select=None,
+    viewport_source: ViewportSource | None = None,
+    serialized_elements: str | None = None,
+    node_sizes: dict[str, float] | None = None,
+    highlight: dict[str, list] | None = None,
+) -> None:
+    """Render Cytoscape graph inside the given NiceGUI container.
+
+    When ``viewport_source`` is given, ``elements`` is ignored and the browser only
+    receives the elements inside its current viewport, fetched again as the user pans.
+    ``serialized_elements`` lets callers pass a cached JSON encoding of ``elements``.
+    ``node_sizes`` maps node ids to diameters applied in the browser as ``data(size)``.
+    ``highlight`` holds ``nodes`` (ids) and ``edges`` (``[source, target, relationship_type]``
+    triples, matched in either direction) that get the ``path-node``/``path-edge`` classes.
+    """
+    _ensure_cytoscape_assets()
+    _ensure_metrics_endpoint()
+
+    client = ui.context.client
+    _track_client(client)
 
     container_id = f'cy-{uuid4().hex}'
-    serialized_elements = json.dumps(elements)
-    selection_id = uuid4().hex if on_select is not None else None
-    if selection_id is not None:
-        _SELECTION_CALLBACKS[selection_id] = on_select
+    if on_select is not None:
+        _SELECTION_CALLBACKS.set(client.id, on_select)
+    else:
+        _SELECTION_CALLBACKS.discard(client.id)
+
+    view_id = None
+    bounds = None
+    _VIEWPORT_SOURCES.discard(client.id)
+    if viewport_source is not None:
+        _ensure_viewport_endpoint()
+        view_id = client.id
+        _VIEWPORT_SOURCES.set(client.id, viewport_source)
+        bounds = dict(zip(('x1', 'y1', 'x2', 'y2'), viewport_source.bounds))
+        serialized_elements = '[]'
+    elif serialized_elements is None:
+        serialized_elements = json.dumps(elements)
 
     with container:
         ui.html(
@@ -86,15 +249,80 @@ def render_cytoscape(container, elements: list[dict], *, height: str = '75vh', o
         (() => {{
           const targetId = {json.dumps(container_id)};
           const graphElements = {serialized_elements};
+          const viewId = {json.dumps(view_id)};
+          const viewBounds = {json.dumps(bounds)};
+          const nodeSizes = {json.dumps(node_sizes)};
+          const pathHighlight = {json.dumps(highlight)};
+
+          function withSizes(list) {{
+            if (!nodeSizes) return list;
+            list.forEach((element) => {{
+              const size = nodeSizes[element.data.id];
+              if (size !== undefined && element.data.source === undefined) element.data.size = size;
+            }});
+            return list;
+          }}
+
+          function markPath(collection) {{
+            if (!pathHighlight) return;
+            const nodeIds = new Set(pathHighlight.nodes);
+            const edgeKeys = new Set(pathHighlight.edges.map((edge) => JSON.stringify(edge)));
+            collection.forEach((element) => {{
+              const data = element.data();
+              if (element.isNode()) {{
+                if (nodeIds.has(data.id)) element.addClass('path-node');
+              }} else if (
+                edgeKeys.has(JSON.stringify([data.source, data.target, data.relationship_type]))
+                || edgeKeys.has(JSON.stringify([data.target, data.source, data.relationship_type]))
+              ) {{
+                element.addClass('path-edge');
+              }}
+            }});
+          }}
 
           function sendSelection(kind, data) {{
-            const selectionId = {json.dumps(selection_id)};
-            if (!selectionId) return;
-            fetch(`/api/selection/${{selectionId}}`, {{
-              method: 'POST',
-              headers: {{ 'Content-Type': 'application/json' }},
-              body: JSON.stringify({{ kind, data }}),
-            }}).catch(() => {{}});
+            if (!{json.dumps(on_select is not None)}) return;
+            emitEvent({json.dumps(_SELECTION_EVENT)}, {{ kind, data }});
+          }}
+
+          function streamViewport(cy) {{
+            let pending = null;
+            let requestSeq = 0;
+            const refresh = () => {{
+              const extent = cy.extent();
+              const seq = ++requestSeq;
+              fetch(`/api/viewport/${{viewId}}`, {{
+                method: 'POST',
+                headers: {{ 'Content-Type': 'application/json' }},
+                body: JSON.stringify({{ ...extent, zoom: cy.zoom() }}),
+              }})
+                .then((response) => response.json())
+                .then((result) => {{
+                  if (seq !== requestSeq) return;
+                  const incoming = withSizes(result.elements || []);
+                  const keep = new Set(incoming.map((element) => element.data.id));
+                  cy.batch(() => {{
+                    cy.elements().filter((element) => !keep.has(element.id())).remove();
+                    markPath(cy.add(incoming.filter((element) => cy.getElementById(element.data.id).empty())));
+                  }});
+                }})
+                .catch(() => {{}});
+            }};
+            cy.on('viewport', () => {{
+              clearTimeout(pending);
+              pending = setTimeout(refresh, 120);
+            }});
+            const width = Math.max(viewBounds.x2 - viewBounds.x1, 1);
+            const graphHeight = Math.max(viewBounds.y2 - viewBounds.y1, 1);
+            const zoom = Math.min(cy.width() / width, cy.height() / graphHeight) * 0.9;
+            cy.viewport({{
+              zoom,
+              pan: {{
+                x: cy.width() / 2 - zoom * (viewBounds.x1 + width / 2),
+                y: cy.height() / 2 - zoom * (viewBounds.y1 + graphHeight / 2),
+              }},
+            }});
+            refresh();
           }}
 
           function initCytoscape() {{
@@ -103,7 +331,7 @@ def render_cytoscape(container, elements: list[dict], *, height: str = '75vh', o
 
             const cy = window.cytoscape({{
               container: host,
-              elements: graphElements,
+              elements: withSizes(graphElements),
               style: [
                 {{
                   selector: 'node',
@@ -124,6 +352,13 @@ def render_cytoscape(container, elements: list[dict], *, height: str = '75vh', o
                     'text-max-width': 90
                   }}
                 }},
+                {{
+                  selector: 'node[size]',
+                  style: {{
+                    'width': 'data(size)',
+                    'height': 'data(size)'
+                  }}
+                }},
                 {{
                   selector: 'edge',
                   style: {{
@@ -133,9 +368,24 @@ def render_cytoscape(container, elements: list[dict], *, height: str = '75vh', o
                     'target-arrow-shape': 'none',
                     'source-arrow-shape': 'none'
                   }}
+                }},
+                {{
+                  selector: 'node.path-node',
+                  style: {{
+                    'border-color': '#f59e0b',
+                    'border-width': 4
+                  }}
+                }},
+                {{
+                  selector: 'edge.path-edge',
+                  style: {{
+                    'line-color': '#f59e0b',
+                    'width': 4,
+                    'z-index': 10
+                  }}
                 }}
               ],
-              layout: {{
+              layout: viewId ? {{ name: 'preset' }} : {{
                 name: 'cose',
                 animate: false,
                 fit: true,
@@ -145,6 +395,11 @@ def render_cytoscape(container, elements: list[dict], *, height: str = '75vh', o
               }}
             }});
 
+            markPath(cy.elements());
+            if (viewId) {{
+              streamViewport(cy);
+            }}
+
             cy.on('tap', 'node', (event) => {{
               sendSelection('node', event.target.data());
             }});
@@ -161,16 +416,9 @@ def render_cytoscape(container, elements: list[dict], *, height: str = '75vh', o
             return true;
           }}
 
-          if (!initCytoscape()) {{
-            let attempts = 0;
-            const maxAttempts = 50;
-            const timer = setInterval(() => {{
-              attempts += 1;
-              if (initCytoscape() || attempts >= maxAttempts) {{
-                clearInterval(timer);
-              }}
-            }}, 100);
-          }}
+          window.__cytoscapeReady.then(() => {{
+            if (!initCytoscape()) requestAnimationFrame(initCytoscape);
+          }});
         }})();
         """
     )
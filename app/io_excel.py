@@ -1,4 +1,4 @@
-"""Excel loading utilities for the crime network workbook."""
+"""Loading and saving utilities for the crime network workbook and its columnar exports."""
 
 from __future__ import annotations
 
@@ -14,6 +14,9 @@ from app.schema import (
     SHEET_NODES,
 )
 
+# Table file suffixes the loader reads instead of a workbook, mapped to their format.
+COLUMNAR_FORMATS = {".parquet": "parquet", ".arrow": "arrow"}
+
 
 def load_workbook(path: str | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
     """Load nodes and edges sheets from the workbook and perform minimal schema checks."""
@@ -55,6 +58,11 @@ def load_workbook(path: str | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
         engine="openpyxl",
     )
 
+    _check_required_columns(nodes_df, edges_df, "Workbook")
+    return nodes_df, edges_df
+
+
+def _check_required_columns(nodes_df: pd.DataFrame, edges_df: pd.DataFrame, source: str) -> None:
     missing_node_cols = [col for col in REQUIRED_NODE_COLS if col not in nodes_df.columns]
     missing_edge_cols = [col for col in REQUIRED_EDGE_COLS if col not in edges_df.columns]
 
@@ -66,13 +74,108 @@ def load_workbook(path: str | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
 
     if errors:
         raise ValueError(
-            f"Workbook is missing required column(s): {'; '.join(errors)}. "
+            f"{source} is missing required column(s): {'; '.join(errors)}. "
             "Add the missing columns and try again."
         )
 
+
+def _columnar_paths(path: Path) -> tuple[Path, Path, str]:
+    """Return the nodes/edges files for a columnar path: a table file or a directory holding both.
+
+    A table file must be ``nodes.<suffix>`` or ``edges.<suffix>``; other names raise ValueError.
+    """
+    if path.is_dir():
+        for suffix in COLUMNAR_FORMATS:
+            if (path / f"{SHEET_NODES}{suffix}").exists():
+                return path / f"{SHEET_NODES}{suffix}", path / f"{SHEET_EDGES}{suffix}", COLUMNAR_FORMATS[suffix]
+        raise FileNotFoundError(
+            f"No nodes.parquet or nodes.arrow found in '{path}'. "
+            "Export the tables there or point DHVIZ_DATA_PATH at a workbook."
+        )
+    suffix = path.suffix.lower()
+    if path.stem not in (SHEET_NODES, SHEET_EDGES):
+        # Any other name would silently read and rewrite the nodes/edges pair beside it.
+        raise ValueError(
+            f"Columnar data path '{path}' must be named {SHEET_NODES}{suffix} or {SHEET_EDGES}{suffix}. "
+            "Keep each dataset's tables in their own folder and point DHVIZ_DATA_PATH at that folder or file."
+        )
+    return path.parent / f"{SHEET_NODES}{suffix}", path.parent / f"{SHEET_EDGES}{suffix}", COLUMNAR_FORMATS[suffix]
+
+
+def _read_columnar_table(path: Path, file_format: str) -> pd.DataFrame:
+    import pyarrow as pa
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    frame = table.to_pandas()
+    # The app keeps dates as YYYY-MM-DD text, the way they are typed into the workbook.
+    for field in table.schema:
+        if pa.types.is_date(field.type):
+            frame[field.name] = pd.to_datetime(frame[field.name]).dt.strftime("%Y-%m-%d")
+    return frame
+
+
+def load_columnar(path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Load ``nodes``/``edges`` tables written by ``export.export_parquet`` or ``export.export_arrow``."""
+    nodes_path, edges_path, file_format = _columnar_paths(Path(path))
+    for table_path in (nodes_path, edges_path):
+        if not table_path.exists():
+            raise FileNotFoundError(
+                f"Table not found at '{table_path}'. "
+                f"Columnar data needs both {nodes_path.name} and {edges_path.name} in the same folder."
+            )
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as error:
+        raise ValueError(
+            f"Reading '{nodes_path}' needs the optional 'pyarrow' package. Install it with 'pip install pyarrow'."
+        ) from error
+
+    try:
+        nodes_df = _read_columnar_table(nodes_path, file_format)
+        edges_df = _read_columnar_table(edges_path, file_format)
+    except Exception as error:
+        raise ValueError(
+            f"Unable to read {file_format} tables in '{nodes_path.parent}'. "
+            "Ensure they were written by the export and are not truncated."
+        ) from error
+
+    _check_required_columns(nodes_df, edges_df, f"{file_format.capitalize()} data")
     return nodes_df, edges_df
 
 
+def is_columnar_path(path: str | Path) -> bool:
+    """Return True when ``path`` names Parquet/Arrow tables (a table file or a folder), not a workbook."""
+    data_path = Path(path)
+    return data_path.suffix.lower() in COLUMNAR_FORMATS or data_path.is_dir()
+
+
+def data_exists(path: str | Path) -> bool:
+    """Return True when the workbook, or the nodes table of a columnar data path, exists."""
+    data_path = Path(path)
+    if not is_columnar_path(data_path):
+        return data_path.exists()
+    try:
+        nodes_path, _, _ = _columnar_paths(data_path)
+    except (FileNotFoundError, ValueError):
+        return False
+    return nodes_path.exists()
+
+
+def load_tables(path: str | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Load nodes/edges from a workbook or, by suffix, from Parquet/Arrow tables."""
+    if path is None:
+        path = get_default_data_path()
+    if is_columnar_path(path):
+        return load_columnar(str(path))
+    return load_workbook(str(path))
+
+
 def _ordered_columns(df: pd.DataFrame, required_cols: list[str]) -> list[str]:
     required = [col for col in required_cols if col in df.columns]
     extras = [col for col in df.columns if col not in required_cols]
@@ -112,3 +215,20 @@ def save_workbook(nodes_df: pd.DataFrame, edges_df: pd.DataFrame, path: str | No
             f"Failed to save workbook to '{workbook_path}'. "
             "Verify the destination path exists and is writable."
         ) from error
+
+
+def save_tables(nodes_df: pd.DataFrame, edges_df: pd.DataFrame, path: str | None = None) -> None:
+    """Persist to the workbook, or rewrite the Parquet/Arrow tables when the data path names them."""
+    if path is None:
+        path = get_default_data_path()
+    if not is_columnar_path(path):
+        save_workbook(nodes_df, edges_df, path)
+        return
+    from app.export import export_columnar
+
+    try:
+        nodes_path, _, file_format = _columnar_paths(Path(path))
+    except FileNotFoundError:
+        # A folder without tables yet: start it with Parquet.
+        nodes_path, file_format = Path(path) / f"{SHEET_NODES}.parquet", "parquet"
+    export_columnar(nodes_df, edges_df, out_dir=str(nodes_path.parent), file_format=file_format)
@@ -6,26 +6,56 @@ import json
 from pathlib import Path
 from typing import Any
 
-from nicegui import ui
+import numpy as np
+from nicegui import background_tasks, run, ui
 
 from app.config import get_default_data_path
-from app.crud_edges import can_add_or_edit_edge
+from app.adjacency import AdjacencyIndex
+from app.analytics import CENTRALITY_LABELS, CentralityCache, compute_centrality, graph_fingerprint, node_sizes
+from app.communities import detect_communities
+from app.crud_edges import can_add_or_edit_edge, diff_edge_frames
 from app.crud_nodes import NODE_TYPE_OPTIONS, can_delete_node, is_unique_node_id
-from app.export import export_csv, export_gexf, export_summary
+from app.entity_resolution import find_duplicates, merge_nodes
+from app.export import export_all, export_csv, export_gexf_frames, export_summary, read_export_manifest
+from app.facet_index import FacetIndex
+from app.filter_cache import FilterResultCache, FilteredView, filter_key
+from app.filter_query import compile_query, query_masks
 from app.filtering import (
     DEFAULT_NODE_TYPE_FILTER,
     DEFAULT_RELATIONSHIP_FILTER,
+    DEFAULT_EGO_RADIUS,
+    DEFAULT_HUB_METRIC,
+    DEFAULT_RANGE_SCOPE,
     DEFAULT_SEARCH_FILTER,
-    apply_filters,
+    RANGE_SCOPE_OPTIONS,
+    core_network_masks,
+    core_numbers,
+    core_threshold,
+    ego_network_masks,
+    filter_masks,
+    parse_date_bound,
+    parse_seed_ids,
+    provenance_range_mask,
 )
 from app.graph_build import build_cytoscape_elements, build_networkx_graph
+from app.graph_metrics import GraphMetrics
 from app.graph_render import render_cytoscape
-from app.io_excel import load_workbook, save_workbook
+from app.io_excel import data_exists, is_columnar_path, load_tables, save_tables
+from app.paths import MAX_PATH_COUNT, PathFinder, path_highlight
+from app.patterns import PatternIndex, looks_like_pattern, parse_pattern
 from app.provenance import ensure_metadata_columns, is_valid_optional_date, parse_optional_confidence
+from app.range_index import build_range_indexes
 from app.sample_data import create_sample_workbook
+from app.spatial_index import ViewportSource, compute_layout_positions, seed_layout_positions
 from app.state_guardrails import is_dirty, mark_clean, mark_dirty
+from app.temporal import DEFAULT_WINDOW_DAYS, TemporalIndex, day_label
+from app.text_index import TrigramIndex
 from app.validate import validate_data
 
+VIEWPORT_STREAMING_THRESHOLD = 2000
+ALL_COMMUNITIES = -1
+MAX_COMMUNITY_OPTIONS = 50
+
 
 @ui.page('/')
 def index() -> None:
@@ -74,14 +104,65 @@ def index() -> None:
         'filter_type': DEFAULT_NODE_TYPE_FILTER,
         'filter_relationship_type': DEFAULT_RELATIONSHIP_FILTER,
         'filter_search': DEFAULT_SEARCH_FILTER,
+        'filter_fuzzy': False,
+        'filter_query': '',
+        'filter_ego_seeds': '',
+        'filter_ego_radius': DEFAULT_EGO_RADIUS,
+        'filter_date_range': (None, None),
+        'filter_confidence_range': (None, None),
+        'filter_range_scope': DEFAULT_RANGE_SCOPE,
         'active_view': 'graph',
         'render_loading': False,
+        'data_version': 0,
+        'layout_positions': None,
+        'layout_version': None,
+        'layout_pending': None,
+        'interim_positions': None,
+        'interim_version': None,
+        'viewport_source': None,
+        'search_index': None,
+        'node_facets': None,
+        'edge_facets': None,
+        'node_ranges': None,
+        'edge_ranges': None,
+        'filter_cache': FilterResultCache(),
+        'serialized_elements': None,
+        'validation_version': None,
+        'nx_version': None,
+        'adjacency': None,
+        'adjacency_version': None,
+        'centrality_cache': CentralityCache(),
+        'centrality': None,
+        'centrality_version': None,
+        'centrality_pending': None,
+        'size_metric': 'none',
+        'communities': None,
+        'communities_version': None,
+        'communities_pending': None,
+        'filter_community': None,
+        'path_finder': None,
+        'path_finder_version': None,
+        'paths': [],
+        'paths_version': None,
+        'paths_weighted': False,
+        'temporal': None,
+        'temporal_version': None,
+        'filter_time_window': (None, None),
+        'graph_metrics': None,
+        'patterns': None,
+        'patterns_version': None,
+        'cores': None,
+        'cores_version': None,
+        'filter_min_core': 0,
+        'filter_top_hubs': 0,
+        'filter_hub_metric': DEFAULT_HUB_METRIC,
     }
     selection_state = {'kind': 'none', 'data': {}}
-    last_selection_signature = {'value': None}
     filter_debounce = {'token': 0}
     workbook_path = Path(get_default_data_path())
     workbook_label = str(workbook_path)
+    data_kind = 'tables' if is_columnar_path(workbook_path) else 'workbook'
+    sample_button_text = f'Create Sample {data_kind.capitalize()}'
 
     def has_validation_errors() -> bool:
         return bool(state['validation_errors'])
@@ -97,61 +178,393 @@ def index() -> None:
         prefix = f"[{', '.join(parts)}] " if parts else ''
         return prefix + str(error.get('message', 'Unknown validation error'))
 
+    def bump_data_version() -> None:
+        state['data_version'] += 1
+
+    def layout_positions() -> dict[str, tuple[float, float]]:
+        version = state['data_version']
+        if state['layout_version'] == version:
+            return state['layout_positions']
+        schedule_layout()
+        if state['interim_version'] != version:
+            # Until the background layout arrives, keep known nodes where they were and seed new ones.
+            previous = state['layout_positions'] or {}
+            seeds = seed_layout_positions(state['nodes_df'])
+            state['interim_positions'] = {node_id: previous.get(node_id, point) for node_id, point in seeds.items()}
+            state['interim_version'] = version
+        return state['interim_positions']
+
+    def schedule_layout() -> None:
+        version = state['data_version']
+        if version == state['layout_pending']:
+            return
+        state['layout_pending'] = version
+        background_tasks.create(refresh_layout(version, state['nodes_df'], state['edges_df']))
+
+    async def refresh_layout(version: int, nodes_df, edges_df) -> None:
+        try:
+            positions = await run.cpu_bound(compute_layout_positions, nodes_df, edges_df)
+        finally:
+            if state['layout_pending'] == version:
+                state['layout_pending'] = None
+        if positions is None or version != state['data_version']:
+            return
+        state['layout_positions'] = positions
+        state['layout_version'] = version
+        with view_container:
+            if state['active_view'] == 'graph':
+                refresh_graph_state()
+                render_graph_view()
+
+    def adjacency_index() -> AdjacencyIndex:
+        if state['adjacency_version'] != state['data_version'] or state['adjacency'] is None:
+            state['adjacency'] = AdjacencyIndex.from_frames(state['nodes_df'], state['edges_df'])
+            state['adjacency_version'] = state['data_version']
+        return state['adjacency']
+
+    def path_finder() -> PathFinder:
+        if state['path_finder_version'] != state['data_version'] or state['path_finder'] is None:
+            state['path_finder'] = PathFinder.from_frames(state['nodes_df'], state['edges_df'], adjacency_index())
+            state['path_finder_version'] = state['data_version']
+        return state['path_finder']
+
+    def temporal_index() -> TemporalIndex:
+        if state['temporal_version'] != state['data_version'] or state['temporal'] is None:
+            state['temporal'] = TemporalIndex.from_frames(state['nodes_df'], state['edges_df'], adjacency_index())
+            state['temporal_version'] = state['data_version']
+        return state['temporal']
+
+    def pattern_index() -> PatternIndex:
+        if state['patterns_version'] != state['data_version'] or state['patterns'] is None:
+            state['patterns'] = PatternIndex.from_frames(state['nodes_df'], state['edges_df'], adjacency_index())
+            state['patterns_version'] = state['data_version']
+        return state['patterns']
+
+    def node_cores():
+        if state['cores_version'] != state['data_version'] or state['cores'] is None:
+            state['cores'] = core_numbers(adjacency_index())
+            state['cores_version'] = state['data_version']
+        return state['cores']
+
+    def hub_scores(metric: str):
+        # Degree comes straight from the adjacency index; other metrics wait for the background centrality run.
+        centrality = state['centrality']
+        if metric == DEFAULT_HUB_METRIC or centrality is None or state['centrality_version'] != state['data_version']:
+            return None
+        return centrality.metrics.get(metric)
+
+    def current_paths() -> list:
+        # Paths refer to edge row positions, so they are dropped once the data changes.
+        return state['paths'] if state['paths_version'] == state['data_version'] else []
+
+    def rebuild_edge_indexes() -> None:
+        state['edge_facets'] = FacetIndex.from_series(state['edges_df']['relationship_type'])
+        state['edge_ranges'] = build_range_indexes(state['edges_df'])
+
+    def rebuild_indexes() -> None:
+        state['search_index'] = TrigramIndex.from_nodes(state['nodes_df'])
+        state['node_facets'] = FacetIndex.from_series(state['nodes_df']['type'])
+        state['node_ranges'] = build_range_indexes(state['nodes_df'])
+        state['graph_metrics'] = GraphMetrics.from_frames(state['nodes_df'], state['edges_df'])
+        rebuild_edge_indexes()
+
+    def sync_edge_indexes(old_edges_df, new_edges_df) -> None:
+        changes = diff_edge_frames(old_edges_df, new_edges_df)
+        if not changes.appended:
+            rebuild_edge_indexes()
+            return
+        relationship_types = new_edges_df['relationship_type']
+        facets = state['edge_facets']
+        facets.delete(changes.removed_positions)
+        for position in changes.changed_positions:
+            facets.set(position, relationship_types.iloc[position])
+        facets.append(relationship_types.iloc[changes.added_positions].tolist())
+        for column, index in state['edge_ranges'].items():
+            values = new_edges_df[column] if column in new_edges_df.columns else None
+            index.delete(changes.removed_positions)
+            for position in changes.changed_positions:
+                index.set(position, values.iloc[position] if values is not None else None)
+            index.append(
+                values.iloc[changes.added_positions].tolist() if values is not None else [None] * len(changes.added_positions)
+            )
+
+    def filtered_view() -> FilteredView:
+        nodes_df = state['nodes_df']
+        edges_df = state['edges_df']
+        key = filter_key(
+            state['filter_type'],
+            state['filter_relationship_type'],
+            state['filter_search'],
+            ego_seeds=parse_seed_ids(state['filter_ego_seeds']),
+            ego_radius=state['filter_ego_radius'],
+            date_range=state['filter_date_range'],
+            confidence_range=state['filter_confidence_range'],
+            range_scope=state['filter_range_scope'],
+            fuzzy=state['filter_fuzzy'],
+            query=state['filter_query'],
+            community=state['filter_community'] if current_partition() is not None else None,
+            time_window=state['filter_time_window'],
+            min_core=state['filter_min_core'],
+            top_hubs=state['filter_top_hubs'],
+            hub_metric=state['filter_hub_metric'],
+        )
+        (
+            type_value,
+            rel_value,
+            search_value,
+            ego_seeds,
+            ego_radius,
+            date_range,
+            confidence_range,
+            range_scope,
+            fuzzy,
+            query,
+            community,
+            time_window,
+            (min_core, top_hubs, hub_metric),
+        ) = key
+        cache = state['filter_cache']
+        cache.invalidate(state['data_version'])
+        view = cache.get(state['data_version'], key)
+        if view is not None:
+            return view
+
+        node_mask, edge_mask = filter_masks(
+            nodes_df,
+            edges_df,
+            type_value,
+            rel_value,
+            search_value,
+            search_index=state['search_index'],
+            node_facets=state['node_facets'],
+            edge_facets=state['edge_facets'],
+            fuzzy=fuzzy,
+        )
+        if ego_seeds:
+            relationship_types = None if rel_value == DEFAULT_RELATIONSHIP_FILTER else [rel_value]
+            ego_nodes, ego_edges = ego_network_masks(
+                nodes_df,
+                edges_df,
+                ego_seeds,
+                ego_radius,
+                relationship_types,
+                adjacency=adjacency_index(),
+            )
+            node_mask &= ego_nodes
+            edge_mask &= ego_edges
+        if any(bound is not None for bound in (*date_range, *confidence_range)):
+            if range_scope != 'Edges':
+                node_mask &= provenance_range_mask(
+                    nodes_df, date_range, confidence_range, indexes=state['node_ranges']
+                )
+                edge_mask = adjacency_index().induced_edge_mask(node_mask, edge_mask)
+            if range_scope != 'Nodes':
+                edge_mask &= provenance_range_mask(
+                    edges_df, date_range, confidence_range, indexes=state['edge_ranges']
+                )
+        pattern_matches = None
+        if query and looks_like_pattern(query):
+            pattern_matches = pattern_index().match(query)
+            node_mask &= pattern_matches.node_mask
+            edge_mask = adjacency_index().induced_edge_mask(node_mask, edge_mask & pattern_matches.edge_mask)
+        elif query:
+            query_nodes, query_edges = query_masks(
+                nodes_df,
+                edges_df,
+                query,
+                search_index=state['search_index'],
+                node_facets=state['node_facets'],
+                edge_facets=state['edge_facets'],
+                node_ranges=state['node_ranges'],
+                edge_ranges=state['edge_ranges'],
+            )
+            node_mask &= query_nodes
+            edge_mask = adjacency_index().induced_edge_mask(node_mask, edge_mask & query_edges)
+        if community is not None:
+            node_mask &= current_partition().labels == community
+            edge_mask = adjacency_index().induced_edge_mask(node_mask, edge_mask)
+        if time_window != (None, None):
+            timeline = temporal_index()
+            timeline.move_to(*time_window)
+            node_mask &= timeline.node_mask()
+            edge_mask = adjacency_index().induced_edge_mask(node_mask, edge_mask & timeline.edge_mask())
+        if min_core or top_hubs:
+            node_mask, _ = core_network_masks(
+                nodes_df,
+                edges_df,
+                min_core,
+                top_hubs,
+                hub_scores=hub_scores(hub_metric),
+                within=node_mask,
+                adjacency=adjacency_index(),
+                cores=node_cores() if min_core else None,
+            )
+            edge_mask = adjacency_index().induced_edge_mask(node_mask, edge_mask)
+        elements = build_cytoscape_elements(
+            nodes_df[node_mask],
+            edges_df[edge_mask].reset_index(drop=True),
+            current_communities(),
+        )
+        view = FilteredView(
+            node_positions=np.flatnonzero(node_mask),
+            edge_positions=np.flatnonzero(edge_mask),
+            elements=elements,
+            serialized_elements=json.dumps(elements),
+        )
+        if pattern_matches is not None:
+            view.extras['pattern_matches'] = pattern_matches
+        cache.put(state['data_version'], key, view)
+        return view
+
     def refresh_graph_state() -> None:
         nodes_df = state['nodes_df']
         edges_df = state['edges_df']
         if nodes_df is None or edges_df is None:
             return
 
-        errors = validate_data(nodes_df, edges_df)
-        state['validation_errors'] = errors
+        if state['validation_version'] != state['data_version']:
+            state['validation_errors'] = validate_data(nodes_df, edges_df)
+            state['validation_version'] = state['data_version']
+        errors = state['validation_errors']
         if errors:
             state['status_text'] = f'Validation errors: {len(errors)}'
             state['status_classes'] = 'text-sm text-amber-300'
             state['built_elements_status'] = ''
             state['networkx_status'] = ''
             state['elements'] = None
+            state['serialized_elements'] = None
             state['nx_graph'] = None
+            state['viewport_source'] = None
             return
 
         state['status_text'] = f"Loaded: {len(nodes_df)} nodes, {len(edges_df)} edges"
         state['status_classes'] = 'text-sm text-emerald-300'
 
-        nodes_f, edges_f = apply_filters(
-            nodes_df,
-            edges_df,
-            state['filter_type'],
-            state['filter_relationship_type'],
-            state['filter_search'],
-        )
+        view = filtered_view()
+        elements = view.elements
 
         if selection_state['kind'] == 'node':
             selected_id = str(selection_state['data'].get('id', ''))
-            if selected_id and not nodes_f['id'].astype(str).eq(selected_id).any():
+            if selected_id and not nodes_df['id'].iloc[view.node_positions].astype(str).eq(selected_id).any():
                 clear_selection()
         elif selection_state['kind'] == 'edge':
             selected_id = str(selection_state['data'].get('id', ''))
-            edge_ids = build_cytoscape_elements(nodes_f, edges_f)
-            if selected_id and not any(el['data'].get('id') == selected_id for el in edge_ids if 'source' in el['data']):
+            if selected_id and not any(el['data'].get('id') == selected_id for el in elements if 'source' in el['data']):
                 clear_selection()
 
-        elements = build_cytoscape_elements(nodes_f, edges_f)
         state['elements'] = elements
-        node_elements = sum(1 for element in elements if 'label' in element['data'])
-        edge_elements = sum(1 for element in elements if 'source' in element['data'])
-        state['built_elements_status'] = f'Rendered: {node_elements} nodes, {edge_elements} edges (filtered)'
-        graph = build_networkx_graph(nodes_df, edges_df)
-        state['nx_graph'] = graph
+        state['serialized_elements'] = view.serialized_elements
+        state['viewport_source'] = None
+        if len(elements) > VIEWPORT_STREAMING_THRESHOLD:
+            positions = layout_positions()
+            if view.extras.get('viewport_positions') is not positions:
+                view.extras['viewport_source'] = ViewportSource(elements, positions)
+                view.extras['viewport_positions'] = positions
+            state['viewport_source'] = view.extras['viewport_source']
+        state['built_elements_status'] = (
+            f'Rendered: {len(view.node_positions)} nodes, {len(view.edge_positions)} edges (filtered)'
+        )
+        pattern_matches = view.extras.get('pattern_matches')
+        if pattern_matches is not None:
+            limit_note = ', first ones shown' if pattern_matches.truncated else ''
+            state['built_elements_status'] += f'; pattern matches: {pattern_matches.match_count}{limit_note}'
+        if state['nx_version'] != state['data_version'] or state['nx_graph'] is None:
+            state['nx_graph'] = build_networkx_graph(nodes_df, edges_df, current_communities())
+            state['nx_version'] = state['data_version']
+        graph = state['nx_graph']
         state['networkx_status'] = f'NetworkX (full): {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges'
+        schedule_centrality()
+        schedule_communities()
+
+    def current_partition():
+        if state['communities_version'] != state['data_version']:
+            return None
+        return state['communities']
+
+    def current_communities() -> dict[str, int] | None:
+        partition = current_partition()
+        return partition.membership if partition is not None else None
+
+    def schedule_communities() -> None:
+        version = state['data_version']
+        if version in (state['communities_version'], state['communities_pending']):
+            return
+        state['communities_pending'] = version
+        background_tasks.create(
+            refresh_communities(version, state['nodes_df'], state['edges_df'], state['communities'])
+        )
+
+    async def refresh_communities(version: int, nodes_df, edges_df, previous) -> None:
+        try:
+            # Louvain is a Python loop: run it in the process pool so it cannot hold the event loop's GIL.
+            partition = await run.cpu_bound(detect_communities, nodes_df, edges_df, previous=previous)
+        finally:
+            if state['communities_pending'] == version:
+                state['communities_pending'] = None
+        if partition is None or version != state['data_version']:
+            return
+        state['communities'] = partition
+        state['communities_version'] = version
+        # Cached views and the NetworkX graph were built before labels existed.
+        state['filter_cache'].clear()
+        state['nx_version'] = None
+        with view_container:
+            refresh_community_options()
+            refresh_inspector()
+            if state['filter_community'] is not None and state['active_view'] == 'graph':
+                refresh_graph_state()
+                refresh_sidebar_status()
+                render_graph_view()
+
+    def schedule_centrality() -> None:
+        version = state['data_version']
+        if version in (state['centrality_version'], state['centrality_pending']):
+            return
+        state['centrality_pending'] = version
+        background_tasks.create(refresh_centrality(version, state['nodes_df'], state['edges_df']))
+
+    async def refresh_centrality(version: int, nodes_df, edges_df) -> None:
+        # Hashing and scoring run in the process pool; only the cache lookup stays on the event loop.
+        cache = state['centrality_cache']
+        scores = None
+        try:
+            fingerprint = await run.cpu_bound(graph_fingerprint, nodes_df, edges_df)
+            if fingerprint is not None:
+                scores = cache.get(fingerprint)
+                if scores is None:
+                    scores = await run.cpu_bound(compute_centrality, nodes_df, edges_df, fingerprint=fingerprint)
+                    if scores is not None:
+                        cache.put(scores)
+        finally:
+            if state['centrality_pending'] == version:
+                state['centrality_pending'] = None
+        if scores is None or version != state['data_version']:
+            return
+        state['centrality'] = scores
+        state['centrality_version'] = version
+        ranks_hubs = state['filter_top_hubs'] > 0 and state['filter_hub_metric'] != DEFAULT_HUB_METRIC
+        if ranks_hubs:
+            # Views cached before the scores arrived ranked hubs by degree.
+            state['filter_cache'].clear()
+        with view_container:
+            refresh_inspector()
+            if (state['size_metric'] != 'none' or ranks_hubs) and state['active_view'] == 'graph':
+                if ranks_hubs:
+                    refresh_graph_state()
+                    refresh_sidebar_status()
+                render_graph_view()
 
     try:
-        nodes_df, edges_df = load_workbook()
+        nodes_df, edges_df = load_tables()
         state['nodes_df'] = nodes_df
         state['edges_df'] = edges_df
+        rebuild_indexes()
         mark_clean()
         refresh_graph_state()
     except (FileNotFoundError, ValueError) as error:
-        state['status_text'] = f"Workbook error: {error} Tip: click 'Create Sample Workbook' to generate a starter file."
+        state['status_text'] = (
+            f"{data_kind.capitalize()} error: {error} Tip: click '{sample_button_text}' to generate starter data."
+        )
         state['status_classes'] = 'text-sm text-rose-300'
 
     with ui.row().classes('app-shell w-full no-wrap bg-slate-100'):
@@ -160,6 +573,7 @@ def index() -> None:
             status_label = ui.label(state['status_text']).classes(state['status_classes'])
             built_label = ui.label(state['built_elements_status']).classes('text-xs text-emerald-100')
             networkx_label = ui.label(state['networkx_status']).classes('text-xs text-emerald-100')
+            metrics_label = ui.label().classes('text-xs text-emerald-100')
 
             with ui.card().classes('w-full bg-slate-800 text-white'):
                 ui.label('Validation').classes('text-sm font-semibold')
@@ -172,7 +586,7 @@ def index() -> None:
             dirty_label = ui.label('Saved').classes('text-xs text-emerald-300')
 
             type_filter = ui.select(
-                options=['All', 'Person', 'Place', 'Institution', 'Group'],
+                options=[DEFAULT_NODE_TYPE_FILTER, *NODE_TYPE_OPTIONS],
                 label='Node type',
                 value=DEFAULT_NODE_TYPE_FILTER,
             ).classes('w-full')
@@ -182,19 +596,111 @@ def index() -> None:
                 value=DEFAULT_RELATIONSHIP_FILTER,
             ).classes('w-full')
             label_search = ui.input('Search label contains').props('dense clearable').classes('w-full')
+            fuzzy_search_toggle = ui.checkbox('Fuzzy match (typo tolerant)').props('dense')
+            query_input = ui.input(
+                'Query',
+                placeholder='type:Person AND rel:funds AND confidence>=0.6 AND label~"kel"',
+            ).props('dense clearable').classes('w-full')
+            ui.label('Or a pattern: (Person)-[funds]->(Group)<-[member_of]-(Person)').classes(
+                'text-xs text-slate-300'
+            )
+            with ui.row().classes('w-full no-wrap items-center gap-2'):
+                ego_seeds_input = ui.input('Ego seeds (node ids)').props('dense clearable').classes('flex-grow')
+                ego_radius_input = ui.number('Hops', value=DEFAULT_EGO_RADIUS, min=0, max=6, step=1, format='%d').props(
+                    'dense'
+                ).classes('w-16')
+            with ui.row().classes('w-full no-wrap items-center gap-2'):
+                date_from_input = ui.input('Date from', placeholder='YYYY[-MM[-DD]]').props('dense clearable').classes(
+                    'flex-grow'
+                )
+                date_to_input = ui.input('Date to', placeholder='YYYY[-MM[-DD]]').props('dense clearable').classes(
+                    'flex-grow'
+                )
+            with ui.row().classes('w-full no-wrap items-center gap-2'):
+                min_confidence_input = ui.number('Min confidence', min=0, max=1, step=0.05).props(
+                    'dense clearable'
+                ).classes('w-28')
+                range_scope_select = ui.select(
+                    options=list(RANGE_SCOPE_OPTIONS),
+                    label='Range applies to',
+                    value=DEFAULT_RANGE_SCOPE,
+                ).props('dense').classes('flex-grow')
             reset_filters_button = ui.button('Reset Filters').props('outline')
+            community_filter = ui.select(
+                options={ALL_COMMUNITIES: 'All communities'},
+                label='Community',
+                value=ALL_COMMUNITIES,
+            ).classes('w-full')
+            size_metric_select = ui.select(
+                options={'none': 'Uniform', **CENTRALITY_LABELS},
+                label='Size nodes by',
+                value='none',
+            ).classes('w-full')
+
+            ui.separator().classes('bg-slate-700')
+            ui.label('Core network').classes('text-sm text-slate-300')
+            with ui.row().classes('w-full no-wrap items-center gap-2'):
+                min_core_input = ui.number('Min core (k)', value=0, min=0, step=1, format='%d').props('dense').classes(
+                    'w-28'
+                )
+                top_hubs_input = ui.number('Top hubs', value=0, min=0, step=10, format='%d').props('dense').classes(
+                    'w-24'
+                )
+            hub_metric_select = ui.select(
+                options=CENTRALITY_LABELS,
+                label='Rank hubs by',
+                value=DEFAULT_HUB_METRIC,
+            ).classes('w-full')
+            with ui.row().classes('w-full gap-2'):
+                show_core_button = ui.button('Show Core').props('outline dense')
+                show_periphery_button = ui.button('Show All Nodes').props('outline dense')
+
+            ui.separator().classes('bg-slate-700')
+            ui.label('Timeline').classes('text-sm text-slate-300')
+            timeline_toggle = ui.checkbox('Show one time window').props('dense')
+            timeline_slider = ui.slider(min=0, max=1, step=1, value=0).classes('w-full')
+            with ui.row().classes('w-full no-wrap items-center gap-2'):
+                window_days_input = ui.number('Window (days)', value=DEFAULT_WINDOW_DAYS, min=1, step=1, format='%d').props(
+                    'dense'
+                ).classes('w-28')
+                timeline_label = ui.label('').classes('text-xs text-slate-300 break-words')
+
+            ui.separator().classes('bg-slate-700')
+            ui.label('Path finder').classes('text-sm text-slate-300')
+            with ui.row().classes('w-full no-wrap items-center gap-2'):
+                path_source_input = ui.input('From id').props('dense clearable').classes('flex-grow')
+                path_target_input = ui.input('To id').props('dense clearable').classes('flex-grow')
+            with ui.row().classes('w-full no-wrap items-center gap-2'):
+                path_count_input = ui.number('Paths', value=1, min=1, max=MAX_PATH_COUNT, step=1, format='%d').props(
+                    'dense'
+                ).classes('w-16')
+                path_min_confidence_input = ui.number('Min confidence', min=0, max=1, step=0.05).props(
+                    'dense clearable'
+                ).classes('flex-grow')
+            path_weighted_toggle = ui.checkbox('Prefer high-confidence edges').props('dense')
+            path_relationship_select = ui.select(
+                options=[],
+                label='Via relationship types',
+                multiple=True,
+                value=[],
+            ).props('dense use-chips').classes('w-full')
+            with ui.row().classes('w-full gap-2'):
+                find_paths_button = ui.button('Find Paths').props('outline')
+                clear_paths_button = ui.button('Clear Paths').props('outline')
+            path_results = ui.column().classes('w-full gap-1 max-h-40 overflow-auto')
 
             ui.separator().classes('bg-slate-700')
             ui.label('Navigation').classes('text-sm text-slate-300')
             back_button = ui.button('Back to Graph').props('outline')
             manage_button = ui.button('Manage Nodes').props('outline')
             manage_edges_button = ui.button('Manage Edges').props('outline')
-            save_button = ui.button('Save to Excel').props('color=primary')
+            save_button = ui.button('Save to Excel' if data_kind == 'workbook' else 'Save Tables').props('color=primary')
             demo_button = ui.button('Demo Mode').props('outline')
-            sample_button = ui.button('Create Sample Workbook').props('outline')
+            sample_button = ui.button(sample_button_text).props('outline')
             export_csv_button = ui.button('Export CSV').props('outline')
             export_gexf_button = ui.button('Export GEXF').props('outline')
             export_summary_button = ui.button('Export Summary').props('outline')
+            export_all_button = ui.button('Export All').props('outline')
 
             def refresh_sidebar_status() -> None:
                 status_label.set_text(state['status_text'])
@@ -203,6 +709,14 @@ def index() -> None:
                 built_label.set_visibility(bool(state['built_elements_status']))
                 networkx_label.set_text(state['networkx_status'])
                 networkx_label.set_visibility(bool(state['networkx_status']))
+                metrics = state['graph_metrics']
+                if metrics is not None:
+                    summary = metrics.summary()
+                    metrics_label.set_text(
+                        f"Components: {summary['components']} (largest {summary['largest_component']}), "
+                        f"triangles: {summary['triangles']}, avg clustering: {summary['average_clustering']:.3f}"
+                    )
+                metrics_label.set_visibility(metrics is not None and not has_validation_errors())
                 dirty_label.set_text('Unsaved changes' if is_dirty() else 'Saved')
                 dirty_label.classes(replace='text-xs text-amber-300' if is_dirty() else 'text-xs text-emerald-300')
 
@@ -217,6 +731,20 @@ def index() -> None:
                 export_csv_button.disable() if disabled else export_csv_button.enable()
                 export_gexf_button.disable() if disabled else export_gexf_button.enable()
                 export_summary_button.disable() if disabled else export_summary_button.enable()
+                export_all_button.disable() if disabled else export_all_button.enable()
+                find_paths_button.disable() if disabled else find_paths_button.enable()
+                refresh_path_results()
+
+            def refresh_path_results() -> None:
+                path_results.clear()
+                with path_results:
+                    for number, path in enumerate(current_paths(), start=1):
+                        summary = f'{path.hops} hop(s)'
+                        if state['paths_weighted']:
+                            summary += f', cost {path.cost:.2f}'
+                        ui.label(f"{number}. {' → '.join(path.node_ids)} ({summary})").classes(
+                            'text-xs text-amber-100 break-words'
+                        )
 
         with ui.column().classes('w-3/5 self-stretch p-6 gap-4'):
             ui.label('Crime Network Viewer').classes('text-2xl font-bold text-slate-800')
@@ -235,7 +763,6 @@ def index() -> None:
 
     def clear_selection() -> None:
         selection_state.update(kind='none', data={})
-        last_selection_signature['value'] = None
         refresh_inspector()
 
     def confirm_discard_unsaved(on_confirm) -> bool:
@@ -277,11 +804,6 @@ def index() -> None:
     def refresh_inspector() -> None:
         kind = selection_state.get('kind', 'none')
         data = selection_state.get('data', {}) if isinstance(selection_state.get('data'), dict) else {}
-        selection_signature = (kind, repr(data))
-        if selection_signature == last_selection_signature['value']:
-            return
-        last_selection_signature['value'] = selection_signature
-
         inspector_rows.clear()
         if kind == 'none':
             inspector_placeholder.set_visibility(True)
@@ -294,7 +816,29 @@ def index() -> None:
                 ui.label(f"id: {data.get('id', '')}").classes('text-xs text-slate-500')
                 ui.label(f"Type: {data.get('type', '')}").classes('text-sm font-medium text-indigo-700')
                 ui.label(str(data.get('description', '') or '')).classes('text-sm text-slate-700')
-                core_keys = {'id', 'label', 'type', 'description'}
+                core_keys = {'id', 'label', 'type', 'description', 'community'}
+                partition = current_partition()
+                community = partition.community_of(data.get('id', '')) if partition is not None else None
+                if community is not None:
+                    ui.label(f'Community: {community}').classes('text-sm text-emerald-700')
+                metrics = state['graph_metrics']
+                structure = metrics.node_metrics(data.get('id', '')) if metrics is not None else {}
+                if structure:
+                    ui.label(
+                        f"Degree {structure['degree']} · triangles {structure['triangles']} · "
+                        f"clustering {structure['clustering']:.3f} · component of {structure['component_size']}"
+                    ).classes('text-xs text-slate-600')
+                centrality = state['centrality']
+                scores = centrality.for_node(data.get('id', '')) if centrality is not None else {}
+                with ui.expansion('Centrality', value=True).classes('w-full'):
+                    if not scores:
+                        ui.label('Computing…' if state['centrality_pending'] is not None else '(unavailable)').classes(
+                            'text-xs text-slate-500'
+                        )
+                    for metric, value in scores.items():
+                        with ui.row().classes('w-full justify-between gap-2 text-sm'):
+                            ui.label(CENTRALITY_LABELS[metric]).classes('text-slate-500')
+                            ui.label(f'{value:g}' if metric == 'degree' else f'{value:.4f}').classes('text-slate-800')
             else:
                 ui.label(str(data.get('relationship_type', ''))).classes('text-lg font-semibold text-slate-900')
                 ui.label(f"{data.get('source', '')} → {data.get('target', '')}").classes('text-sm text-slate-600')
@@ -310,6 +854,21 @@ def index() -> None:
                         ui.label(key).classes('text-slate-500')
                         ui.label(value).classes('text-slate-800 text-right break-all')
 
+    def on_graph_select(payload: dict) -> None:
+        selection_state.update(kind=payload.get('kind', 'none'), data=payload.get('data', {}))
+        refresh_inspector()
+
+    def current_node_sizes() -> dict[str, float] | None:
+        centrality = state['centrality']
+        if state['size_metric'] == 'none' or centrality is None or state['centrality_version'] != state['data_version']:
+            return None
+        return node_sizes(centrality, state['size_metric'])
+
+    def on_size_metric_change() -> None:
+        state['size_metric'] = str(size_metric_select.value or 'none')
+        if state['active_view'] == 'graph':
+            render_graph_view()
+
     def render_graph_view() -> None:
         state['active_view'] = 'graph'
         view_container.clear()
@@ -321,10 +880,11 @@ def index() -> None:
                 render_cytoscape(
                     graph_card,
                     state['elements'],
-                    on_select=lambda payload: selection_state.update(
-                        kind=payload.get('kind', 'none'),
-                        data=payload.get('data', {}),
-                    ),
+                    serialized_elements=state['serialized_elements'],
+                    viewport_source=state['viewport_source'],
+                    on_select=on_graph_select,
+                    node_sizes=current_node_sizes(),
+                    highlight=path_highlight(current_paths(), state['edges_df']) if current_paths() else None,
                 )
             else:
                 with graph_card:
@@ -334,6 +894,7 @@ def index() -> None:
 
     def set_validation_error_state(errors: list[dict]) -> None:
         state['validation_errors'] = errors
+        state['validation_version'] = None
         state['status_text'] = f'Validation errors: {len(errors)}'
         state['status_classes'] = 'text-sm text-amber-300'
         refresh_sidebar_status()
@@ -349,7 +910,11 @@ def index() -> None:
             ui.notify('Cannot apply edge changes due to validation errors', type='warning')
             return False
 
+        sync_edge_indexes(state['edges_df'], updated_edges_df)
+        if not state['graph_metrics'].sync_edges(state['edges_df'], updated_edges_df):
+            state['graph_metrics'] = GraphMetrics.from_frames(nodes_df, updated_edges_df)
         state['edges_df'] = updated_edges_df
+        bump_data_version()
         mark_dirty()
         refresh_graph_state()
         refresh_sidebar_status()
@@ -358,6 +923,22 @@ def index() -> None:
         clear_selection()
         return True
 
+    def current_date_range() -> tuple[str | None, str | None]:
+        try:
+            return parse_date_bound(date_from_input.value), parse_date_bound(date_to_input.value, upper=True)
+        except ValueError as exc:
+            ui.notify(str(exc), type='warning')
+            return state['filter_date_range']
+
+    def current_query() -> str:
+        text = str(query_input.value or '').strip()
+        try:
+            parse_pattern(text) if looks_like_pattern(text) else compile_query(text)
+        except ValueError as exc:
+            ui.notify(f'Query error: {exc}', type='warning')
+            return state['filter_query']
+        return text
+
     def on_filter_change() -> None:
         nodes_df = state['nodes_df']
         edges_df = state['edges_df']
@@ -366,6 +947,21 @@ def index() -> None:
         state['filter_type'] = str(type_filter.value or DEFAULT_NODE_TYPE_FILTER)
         state['filter_relationship_type'] = str(rel_filter.value or DEFAULT_RELATIONSHIP_FILTER)
         state['filter_search'] = str(label_search.value or DEFAULT_SEARCH_FILTER)
+        state['filter_fuzzy'] = bool(fuzzy_search_toggle.value)
+        state['filter_query'] = current_query()
+        state['filter_community'] = None if community_filter.value in (None, ALL_COMMUNITIES) else int(community_filter.value)
+        state['filter_ego_seeds'] = str(ego_seeds_input.value or '')
+        state['filter_ego_radius'] = int(ego_radius_input.value if ego_radius_input.value is not None else DEFAULT_EGO_RADIUS)
+        state['filter_date_range'] = current_date_range()
+        state['filter_confidence_range'] = (
+            float(min_confidence_input.value) if min_confidence_input.value is not None else None,
+            None,
+        )
+        state['filter_range_scope'] = str(range_scope_select.value or DEFAULT_RANGE_SCOPE)
+        state['filter_time_window'] = current_time_window()
+        state['filter_min_core'] = int(min_core_input.value or 0)
+        state['filter_top_hubs'] = int(top_hubs_input.value or 0)
+        state['filter_hub_metric'] = str(hub_metric_select.value or DEFAULT_HUB_METRIC)
         refresh_graph_state()
         refresh_sidebar_status()
         state['render_loading'] = False
@@ -382,28 +978,188 @@ def index() -> None:
 
         ui.timer(0.25, run_if_latest, once=True)
 
+    def facet_options(default_value: str, counts: dict[str, int], always: list[str]) -> dict[str, str]:
+        options = {default_value: default_value}
+        for value in [*always, *(value for value in counts if value not in always)]:
+            options[value] = f'{value} ({counts.get(value, 0)})'
+        return options
+
+    def refresh_type_filter_options() -> None:
+        facets = state['node_facets']
+        counts = facets.counts() if facets is not None else {}
+        type_filter.options = facet_options(DEFAULT_NODE_TYPE_FILTER, counts, NODE_TYPE_OPTIONS)
+        if type_filter.value not in type_filter.options:
+            type_filter.value = DEFAULT_NODE_TYPE_FILTER
+        type_filter.update()
+
     def refresh_relationship_filter_options() -> None:
-        edges_df = state['edges_df']
-        if edges_df is None or 'relationship_type' not in edges_df.columns:
+        facets = state['edge_facets']
+        if facets is None:
             rel_filter.options = [DEFAULT_RELATIONSHIP_FILTER]
             rel_filter.value = DEFAULT_RELATIONSHIP_FILTER
             return
-        values = sorted({str(v) for v in edges_df['relationship_type'].fillna('').tolist() if str(v)})
-        options = [DEFAULT_RELATIONSHIP_FILTER, *values]
+        counts = {value: count for value, count in facets.counts().items() if value not in {'', 'nan', 'None'}}
+        options = facet_options(DEFAULT_RELATIONSHIP_FILTER, counts, [])
         rel_filter.options = options
         if rel_filter.value not in options:
             rel_filter.value = DEFAULT_RELATIONSHIP_FILTER
         rel_filter.update()
+        path_relationship_select.options = sorted(counts)
+        path_relationship_select.value = [value for value in path_relationship_select.value or [] if value in counts]
+        path_relationship_select.update()
+
+    def refresh_community_options() -> None:
+        partition = current_partition()
+        options = {ALL_COMMUNITIES: 'All communities'}
+        if partition is not None:
+            for label, size in list(partition.sizes().items())[:MAX_COMMUNITY_OPTIONS]:
+                options[label] = f'Community {label} ({size})'
+        community_filter.options = options
+        if community_filter.value not in options:
+            community_filter.value = ALL_COMMUNITIES
+        community_filter.update()
+
+    def refresh_timeline_options() -> None:
+        bounds = temporal_index().bounds() if state['nodes_df'] is not None else None
+        if bounds is None:
+            timeline_toggle.value = False
+            timeline_toggle.disable()
+            timeline_label.set_text('No dated edges')
+            return
+        first, last = bounds
+        timeline_toggle.enable()
+        timeline_slider.props['min'] = first
+        timeline_slider.props['max'] = last
+        timeline_slider.update()
+        if not first <= int(timeline_slider.value) <= last:
+            timeline_slider.value = first
+        refresh_timeline_label()
+
+    def current_time_window() -> tuple[int | None, int | None]:
+        if not timeline_toggle.value:
+            return None, None
+        start = int(timeline_slider.value)
+        return start, start + max(int(window_days_input.value or DEFAULT_WINDOW_DAYS), 1) - 1
+
+    def refresh_timeline_label() -> None:
+        start, end = current_time_window()
+        if start is None:
+            first, last = temporal_index().bounds() or (None, None)
+            timeline_label.set_text(f'Dated edges span {day_label(first)} → {day_label(last)}' if first is not None else '')
+            return
+        # Moving the window only applies the edges that enter or leave it.
+        stats = temporal_index().move_to(start, end)
+        timeline_label.set_text(
+            f'{stats.start} → {stats.end}: {stats.node_count} nodes, {stats.edge_count} edges'
+        )
+
+    def on_timeline_change() -> None:
+        refresh_timeline_label()
+        on_filter_change_debounced()
+
+    def refresh_filter_options() -> None:
+        refresh_type_filter_options()
+        refresh_relationship_filter_options()
+        refresh_timeline_options()
 
     def reset_filters() -> None:
         type_filter.value = DEFAULT_NODE_TYPE_FILTER
         rel_filter.value = DEFAULT_RELATIONSHIP_FILTER
         label_search.value = DEFAULT_SEARCH_FILTER
+        fuzzy_search_toggle.value = False
+        query_input.value = ''
+        community_filter.value = ALL_COMMUNITIES
+        ego_seeds_input.value = ''
+        ego_radius_input.value = DEFAULT_EGO_RADIUS
+        date_from_input.value = ''
+        date_to_input.value = ''
+        min_confidence_input.value = None
+        range_scope_select.value = DEFAULT_RANGE_SCOPE
+        timeline_toggle.value = False
+        min_core_input.value = 0
+        top_hubs_input.value = 0
+        hub_metric_select.value = DEFAULT_HUB_METRIC
         on_filter_change()
 
+    def show_core() -> None:
+        if state['nodes_df'] is None or has_validation_errors():
+            ui.notify('Fix validation errors before filtering the core', type='warning')
+            return
+        cores = node_cores()
+        k = core_threshold(cores)
+        if k == 0:
+            ui.notify(f'All {len(cores)} nodes already fit in the core view', type='info')
+            return
+        min_core_input.value = k
+        ui.notify(f'Showing the {k}-core: {int((cores >= k).sum())} of {len(cores)} nodes', type='info')
+
+    def show_all_nodes() -> None:
+        min_core_input.value = 0
+        top_hubs_input.value = 0
+
     type_filter.on_value_change(lambda _: on_filter_change_debounced())
     rel_filter.on_value_change(lambda _: on_filter_change_debounced())
     label_search.on_value_change(lambda _: on_filter_change_debounced())
+    fuzzy_search_toggle.on_value_change(lambda _: on_filter_change_debounced())
+    query_input.on_value_change(lambda _: on_filter_change_debounced())
+    community_filter.on_value_change(lambda _: on_filter_change_debounced())
+    size_metric_select.on_value_change(lambda _: on_size_metric_change())
+    ego_seeds_input.on_value_change(lambda _: on_filter_change_debounced())
+    ego_radius_input.on_value_change(lambda _: on_filter_change_debounced())
+    for range_control in (date_from_input, date_to_input, min_confidence_input, range_scope_select):
+        range_control.on_value_change(lambda _: on_filter_change_debounced())
+    for timeline_control in (timeline_toggle, timeline_slider, window_days_input):
+        timeline_control.on_value_change(lambda _: on_timeline_change())
+    for core_control in (min_core_input, top_hubs_input, hub_metric_select):
+        core_control.on_value_change(lambda _: on_filter_change_debounced())
+    show_core_button.on_click(show_core)
+    show_periphery_button.on_click(show_all_nodes)
+
+    def on_find_paths() -> None:
+        if state['nodes_df'] is None or has_validation_errors():
+            ui.notify('Fix validation errors before finding paths', type='warning')
+            return
+        source_id = str(path_source_input.value or '').strip()
+        target_id = str(path_target_input.value or '').strip()
+        if not source_id or not target_id:
+            ui.notify('Enter both a From id and a To id', type='warning')
+            return
+        count = int(path_count_input.value or 1)
+        weighted = bool(path_weighted_toggle.value)
+        min_confidence = path_min_confidence_input.value
+        try:
+            paths = path_finder().k_shortest_paths(
+                source_id,
+                target_id,
+                max(1, min(count, MAX_PATH_COUNT)),
+                weighted=weighted,
+                relationship_types=list(path_relationship_select.value or []) or None,
+                min_confidence=float(min_confidence) if min_confidence is not None else None,
+            )
+        except ValueError as exc:
+            ui.notify(str(exc), type='warning')
+            return
+
+        state['paths'] = paths
+        state['paths_version'] = state['data_version']
+        state['paths_weighted'] = weighted
+        refresh_path_results()
+        if not paths:
+            ui.notify(f'No path between {source_id} and {target_id}', type='info')
+        else:
+            visible = set(state['nodes_df']['id'].iloc[filtered_view().node_positions].astype(str))
+            hidden = {node_id for path in paths for node_id in path.node_ids} - visible
+            if hidden:
+                ui.notify(f'{len(hidden)} path node(s) are hidden by the current filters', type='warning')
+        if state['active_view'] == 'graph':
+            render_graph_view()
+
+    def clear_paths() -> None:
+        state['paths'] = []
+        state['paths_version'] = None
+        refresh_path_results()
+        if state['active_view'] == 'graph':
+            render_graph_view()
 
     def current_nodes_rows() -> list[dict]:
         nodes_df = state['nodes_df']
@@ -541,16 +1297,28 @@ def index() -> None:
                     state['nodes_df'] = target_nodes_df.loc[:, target_nodes_df.columns].copy()
                     state['nodes_df'].loc[len(state['nodes_df'])] = new_row
                     selected_node['id'] = id_value
+                    state['search_index'].add(id_value, new_row)
+                    state['node_facets'].append([type_value])
+                    state['graph_metrics'].add_node(id_value)
+                    for column, index in state['node_ranges'].items():
+                        index.append([new_row[column]])
                 else:
                     state['nodes_df'] = target_nodes_df.copy()
                     for key, value in new_row.items():
                         if key in state['nodes_df'].columns:
                             state['nodes_df'].at[editing_index, key] = value
                     selected_node['id'] = id_value
-
+                    state['search_index'].update(editing_id, id_value, new_row)
+                    position = state['nodes_df'].index.get_loc(editing_index)
+                    state['node_facets'].set(position, type_value)
+                    state['graph_metrics'].rename_node(editing_id, id_value)
+                    for column, index in state['node_ranges'].items():
+                        index.set(position, new_row[column])
+
+                bump_data_version()
                 mark_dirty()
 
-                refresh_relationship_filter_options()
+                refresh_filter_options()
                 refresh_graph_state()
                 refresh_sidebar_status()
                 refresh_nodes_table()
@@ -586,8 +1354,15 @@ def index() -> None:
             ui.label(f"Are you sure you want to delete node '{node_id}'?")
 
             def confirm_delete() -> None:
+                removed_positions = np.flatnonzero(nodes_df['id'].astype(str).eq(str(node_id)).to_numpy())
                 state['nodes_df'] = nodes_df[~nodes_df['id'].astype(str).eq(str(node_id))].reset_index(drop=True)
+                state['search_index'].remove(node_id)
+                state['node_facets'].delete(removed_positions)
+                state['graph_metrics'].remove_node(node_id)
+                for index in state['node_ranges'].values():
+                    index.delete(removed_positions)
                 selected_node['id'] = None
+                bump_data_version()
                 mark_dirty()
                 refresh_graph_state()
                 refresh_sidebar_status()
@@ -639,6 +1414,84 @@ def index() -> None:
                     ui.button('Add', on_click=lambda: open_node_dialog('add'))
                     ui.button('Edit', on_click=lambda: open_node_dialog('edit')).props('outline')
                     ui.button('Delete', on_click=delete_selected_node).props('outline color=negative')
+                    ui.button('Find Duplicates', on_click=open_duplicates_dialog).props('outline')
+
+    def apply_merge(keep_id: str, merge_id: str) -> bool:
+        try:
+            nodes_df, edges_df = merge_nodes(state['nodes_df'], state['edges_df'], keep_id, merge_id)
+        except ValueError as exc:
+            ui.notify(str(exc), type='warning')
+            return False
+        errors = validate_data(nodes_df, edges_df)
+        if errors:
+            set_validation_error_state(errors)
+            ui.notify('Cannot merge nodes due to validation errors', type='warning')
+            return False
+
+        state['nodes_df'] = nodes_df
+        state['edges_df'] = edges_df
+        if selected_node['id'] == merge_id:
+            selected_node['id'] = None
+        rebuild_indexes()
+        bump_data_version()
+        mark_dirty()
+        refresh_filter_options()
+        refresh_graph_state()
+        refresh_sidebar_status()
+        refresh_nodes_table()
+        refresh_edges_table()
+        clear_selection()
+        ui.notify(f"Merged '{merge_id}' into '{keep_id}'", type='positive')
+        return True
+
+    def open_duplicates_dialog() -> None:
+        nodes_df = state['nodes_df']
+        edges_df = state['edges_df']
+        if nodes_df is None or edges_df is None:
+            ui.notify('Data is not available', type='negative')
+            return
+
+        with ui.dialog() as dialog, ui.card().classes('w-[36rem]'):
+            ui.label('Possible duplicates').classes('text-lg font-semibold')
+            suggestion_list = ui.column().classes('w-full gap-2 max-h-96 overflow-auto')
+            with suggestion_list:
+                ui.spinner()
+            with ui.row().classes('w-full justify-end'):
+                ui.button('Close', on_click=dialog.close).props('outline')
+        dialog.open()
+        suggestions = []
+
+        def render_suggestions() -> None:
+            suggestion_list.clear()
+            with suggestion_list:
+                if not suggestions:
+                    ui.label('No likely duplicates found').classes('text-sm text-slate-500')
+                for suggestion in suggestions:
+                    with ui.row().classes('w-full items-center justify-between no-wrap gap-2'):
+                        with ui.column().classes('gap-0'):
+                            ui.label(f'{suggestion.merge_id} → {suggestion.keep_id}').classes('text-sm font-medium')
+                            ui.label(
+                                f'score {suggestion.score:.2f} (name {suggestion.name_score:.2f}, '
+                                f'shared neighbours {suggestion.neighbour_score:.2f})'
+                            ).classes('text-xs text-slate-500')
+                        ui.button('Merge', on_click=lambda _, chosen=suggestion: merge_suggestion(chosen)).props(
+                            'dense outline'
+                        )
+
+        def merge_suggestion(chosen) -> None:
+            if not apply_merge(chosen.keep_id, chosen.merge_id):
+                return
+            merged = {chosen.merge_id}
+            suggestions[:] = [item for item in suggestions if not {item.keep_id, item.merge_id} & merged]
+            render_suggestions()
+
+        async def load_suggestions() -> None:
+            suggestions.extend(
+                await run.io_bound(find_duplicates, nodes_df, edges_df, adjacency=adjacency_index())
+            )
+            render_suggestions()
+
+        background_tasks.create(load_suggestions())
 
     def open_edge_dialog(mode: str) -> None:
         edges_df = state['edges_df']
@@ -746,7 +1599,7 @@ def index() -> None:
                     selected_edge['index'] = editing_index
 
                 if apply_edges_update(updated_edges_df):
-                    refresh_relationship_filter_options()
+                    refresh_filter_options()
                     dialog.close()
 
             with ui.row().classes('w-full justify-end gap-2'):
@@ -776,7 +1629,7 @@ def index() -> None:
                 updated_edges_df = edges_df.drop(index=editing_index)
                 selected_edge['index'] = None
                 if apply_edges_update(updated_edges_df):
-                    refresh_relationship_filter_options()
+                    refresh_filter_options()
                     dialog.close()
 
             with ui.row().classes('w-full justify-end gap-2'):
@@ -830,7 +1683,7 @@ def index() -> None:
                     ui.button('Delete', on_click=delete_selected_edge).props('outline color=negative')
 
     render_graph_view()
-    refresh_relationship_filter_options()
+    refresh_filter_options()
     refresh_sidebar_status()
 
     def on_save_to_excel() -> None:
@@ -844,7 +1697,7 @@ def index() -> None:
             return
 
         try:
-            save_workbook(nodes_df, edges_df)
+            save_tables(nodes_df, edges_df)
         except RuntimeError as error:
             ui.notify(str(error), type='negative')
             return
@@ -876,12 +1729,7 @@ def index() -> None:
             ui.notify('Cannot export GEXF: fix validation errors first', type='warning')
             return
 
-        nx_graph = state['nx_graph']
-        if nx_graph is None:
-            nx_graph = build_networkx_graph(nodes_df, edges_df)
-            state['nx_graph'] = nx_graph
-
-        gexf_path = export_gexf(nx_graph)
+        gexf_path = export_gexf_frames(nodes_df, edges_df, communities=current_communities())
         ui.notify(f'Exported GEXF: {gexf_path}', type='positive')
 
     def on_export_summary() -> None:
@@ -897,17 +1745,45 @@ def index() -> None:
         summary_path = export_summary(nodes_df, edges_df)
         ui.notify(f'Exported summary: {summary_path}', type='positive')
 
+    async def on_export_all() -> None:
+        nodes_df = state['nodes_df']
+        edges_df = state['edges_df']
+        if nodes_df is None or edges_df is None:
+            ui.notify('Cannot export: workbook data is not loaded', type='warning')
+            return
+        if has_validation_errors():
+            ui.notify('Cannot export: fix validation errors first', type='warning')
+            return
+
+        export_all_button.disable()
+        try:
+            paths = await run.io_bound(export_all, nodes_df, edges_df, communities=current_communities())
+        except RuntimeError as error:
+            ui.notify(str(error), type='negative')
+            return
+        finally:
+            refresh_sidebar_status()
+        manifest = read_export_manifest(Path(paths['manifest']).parent) or {}
+        rewritten = len(manifest.get('rewritten', []))
+        unchanged = len(paths) - 1 - rewritten
+        ui.notify(
+            f"Exported {rewritten} files ({unchanged} unchanged) with manifest: {paths['manifest']}",
+            type='positive',
+        )
+
     def apply_loaded_workbook(nodes_df, edges_df) -> bool:
         validation_errors = validate_data(nodes_df, edges_df)
         if validation_errors:
             set_validation_error_state(validation_errors)
-            ui.notify('Sample workbook validation failed unexpectedly', type='negative')
+            ui.notify(f'Sample {data_kind} validation failed unexpectedly', type='negative')
             return False
 
         state['nodes_df'] = nodes_df
         state['edges_df'] = edges_df
+        rebuild_indexes()
+        bump_data_version()
         mark_clean()
-        refresh_relationship_filter_options()
+        refresh_filter_options()
         refresh_graph_state()
         refresh_sidebar_status()
         refresh_nodes_table()
@@ -917,29 +1793,33 @@ def index() -> None:
         return True
 
     def create_sample_and_reload() -> None:
-        created_path = create_sample_workbook(str(workbook_path))
-        nodes_df, edges_df = load_workbook(str(workbook_path))
+        try:
+            created_path = create_sample_workbook(str(workbook_path))
+            nodes_df, edges_df = load_tables(str(workbook_path))
+        except (RuntimeError, FileNotFoundError, ValueError) as error:
+            ui.notify(f'Cannot create sample {data_kind}: {error}', type='negative')
+            return
         if apply_loaded_workbook(nodes_df, edges_df):
             reset_filters()
             render_graph_view()
-            ui.notify(f'Created sample workbook at {created_path}', type='positive')
+            ui.notify(f'Created sample {data_kind} at {created_path}', type='positive')
 
     def on_demo_mode() -> None:
         def load_existing() -> None:
             try:
-                nodes_df, edges_df = load_workbook(str(workbook_path))
+                nodes_df, edges_df = load_tables(str(workbook_path))
             except (FileNotFoundError, ValueError) as error:
-                ui.notify(f'Cannot load workbook: {error}', type='negative')
+                ui.notify(f'Cannot load {data_kind}: {error}', type='negative')
                 return
             if apply_loaded_workbook(nodes_df, edges_df):
                 reset_filters()
                 render_graph_view()
-                ui.notify('Demo Mode loaded existing workbook', type='positive')
+                ui.notify(f'Demo Mode loaded existing {data_kind}', type='positive')
 
         def overwrite_with_sample() -> None:
             create_sample_and_reload()
 
-        if not workbook_path.exists():
+        if not data_exists(workbook_path):
             overwrite_with_sample()
             return
 
@@ -961,9 +1841,9 @@ def index() -> None:
         dialog.open()
 
     def on_create_sample_workbook() -> None:
-        if workbook_path.exists():
+        if data_exists(workbook_path):
             with ui.dialog() as dialog, ui.card().classes('w-96'):
-                ui.label('Overwrite existing workbook?').classes('text-lg font-semibold')
+                ui.label(f'Overwrite existing {data_kind}?').classes('text-lg font-semibold')
                 ui.label(f'{workbook_label} already exists. This will replace it.')
 
                 def confirm_overwrite() -> None:
@@ -990,13 +1870,14 @@ def index() -> None:
     back_button.on_click(on_back_to_graph)
     save_button.on_click(on_save_to_excel)
     reset_filters_button.on_click(reset_filters)
+    find_paths_button.on_click(on_find_paths)
+    clear_paths_button.on_click(clear_paths)
     demo_button.on_click(on_demo_mode)
     sample_button.on_click(on_create_sample_workbook)
     export_csv_button.on_click(on_export_csv)
     export_gexf_button.on_click(on_export_gexf)
     export_summary_button.on_click(on_export_summary)
-
-    ui.timer(0.1, refresh_inspector)
+    export_all_button.on_click(on_export_all)
 
 
 if __name__ in {'__main__', '__mp_main__'}:
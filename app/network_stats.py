@@ -0,0 +1,201 @@
+"""Whole-network statistics for the export summary, computed over integer-coded edge arrays."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEGREE_PERCENTILES = (0, 25, 50, 75, 90, 99, 100)
+LARGEST_COMPONENTS_SHOWN = 5
+PROVENANCE_COLUMNS = ('source_ref', 'date', 'confidence')
+
+
+@dataclass(frozen=True)
+class TypeCoverage:
+    """Row count of one node type or relationship type and its filled provenance cells."""
+
+    name: str
+    rows: int
+    filled: dict[str, int]
+
+
+@dataclass(frozen=True)
+class NetworkStatistics:
+    """Structural statistics of the undirected multigraph behind the tables.
+
+    Degree follows ``GraphMetrics`` (parallel edges count, a self-loop counts twice).
+    Density uses distinct node pairs without self-loops. Reciprocity is the share of
+    distinct directed pairs of a relationship type whose reverse pair has the same type.
+    Edges whose endpoints are not node ids are counted but left out of the structure.
+    Confidence statistics are ``(min, mean, max)`` of the numeric confidence cells, or None.
+    """
+
+    node_count: int
+    edge_count: int
+    dangling_edges: int
+    self_loops: int
+    connected_pairs: int
+    density: float
+    degree_mean: float
+    degree_percentiles: dict[int, int]
+    component_count: int
+    largest_components: list[int]
+    isolates: int
+    reciprocity: dict[str, tuple[int, int]]
+    node_coverage: list[TypeCoverage]
+    edge_coverage: list[TypeCoverage]
+    node_confidence: tuple[float, float, float] | None
+    edge_confidence: tuple[float, float, float] | None
+
+
+def filled_mask(series: pd.Series) -> np.ndarray:
+    """Return which cells hold a value; blank and whitespace-only strings count as empty."""
+    present = series.notna().to_numpy(dtype=bool)
+    if pd.api.types.is_numeric_dtype(series.dtype) or not present.any():
+        return present
+    if pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'mixed', 'mixed-integer', 'empty'):
+        return present
+    stripped = series.str.strip()  # non-string cells become missing here
+    is_text = stripped.notna().to_numpy(dtype=bool)
+    return np.where(is_text, stripped.ne('').to_numpy(dtype=bool), present)
+
+
+def _confidence_stats(series: pd.Series, filled: np.ndarray) -> tuple[float, float, float] | None:
+    values = pd.to_numeric(series[filled], errors='coerce').to_numpy(dtype=float)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    return float(values.min()), float(values.mean()), float(values.max())
+
+
+def _provenance(df: pd.DataFrame, type_column: str) -> tuple[list[TypeCoverage], tuple[float, float, float] | None]:
+    """Return per-type provenance coverage and confidence min/mean/max from one filled-mask pass."""
+    filled = {column: filled_mask(df[column]) for column in PROVENANCE_COLUMNS if column in df.columns}
+    confidence = _confidence_stats(df['confidence'], filled['confidence']) if 'confidence' in filled else None
+    if type_column not in df.columns:
+        return [], confidence
+    codes, names = pd.factorize(df[type_column].astype(str), sort=True)
+    rows = np.bincount(codes, minlength=len(names))
+    counts = {
+        column: np.bincount(codes, weights=mask, minlength=len(names)).astype(np.int64)
+        for column, mask in filled.items()
+    }
+    coverage = [
+        TypeCoverage(str(name), int(rows[code]), {column: int(values[code]) for column, values in counts.items()})
+        for code, name in enumerate(names)
+    ]
+    return coverage, confidence
+
+
+def component_labels(node_count: int, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Label each node code with the smallest code in its connected component.
+
+    Every round hooks the larger root of each edge onto the smaller one and then
+    compresses paths by pointer jumping; edges inside one component drop out.
+    """
+    parent = np.arange(node_count, dtype=np.int64)
+    while len(sources):
+        source_roots, target_roots = parent[sources], parent[targets]
+        differ = source_roots != target_roots
+        if not differ.any():
+            break
+        sources, targets = sources[differ], targets[differ]
+        low = np.minimum(source_roots[differ], target_roots[differ])
+        high = np.maximum(source_roots[differ], target_roots[differ])
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return parent
+
+
+def _distinct_sorted(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the sorted distinct keys and the row of the first occurrence of each."""
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]] if len(keys) else np.zeros(0, dtype=bool)
+    return sorted_keys[starts], order[starts]
+
+
+def _reciprocity(
+    sources: np.ndarray, targets: np.ndarray, relationships: np.ndarray, names: list[str], node_count: int
+) -> dict[str, tuple[int, int]]:
+    """Return ``(reciprocated, distinct)`` directed pair counts per relationship type.
+
+    Each directed pair is keyed by its type, its unordered node pair and a direction bit,
+    so after sorting the two directions of a reciprocated pair sit next to each other.
+    """
+    if not len(sources):
+        return {}
+    low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+    if len(names) * node_count * node_count < 2**61:
+        pairs = relationships * node_count * node_count + low * node_count + high
+    else:
+        # Too many nodes and types for one int64 key: number the node pairs first.
+        pair_codes, _ = pd.factorize(low * node_count + high)
+        pairs = pair_codes.astype(np.int64) * len(names) + relationships
+    distinct_keys, first = _distinct_sorted(pairs * 2 + (sources > targets))
+    both_ways = (distinct_keys[1:] >> 1) == (distinct_keys[:-1] >> 1)
+    reciprocated = np.r_[both_ways, False] | np.r_[False, both_ways]
+    types = relationships[first]
+    distinct = np.bincount(types, minlength=len(names))
+    matched = np.bincount(types, weights=reciprocated, minlength=len(names)).astype(np.int64)
+    return {name: (int(matched[code]), int(distinct[code])) for code, name in enumerate(names) if distinct[code]}
+
+
+def network_statistics(nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> NetworkStatistics:
+    """Compute the summary statistics of the tables without building a NetworkX graph."""
+    node_index = pd.Index(pd.unique(nodes_df['id'].astype(str)))
+    node_count = len(node_index)
+    # Factorize the endpoint columns once, then look up only the distinct ids.
+    endpoint_codes, endpoints = pd.factorize(
+        pd.concat([edges_df['source'].astype(str), edges_df['target'].astype(str)], ignore_index=True)
+    )
+    # The trailing -1 maps the -1 code of a missing endpoint to "unknown".
+    lookup = np.append(node_index.get_indexer(endpoints), -1).astype(np.int64)
+    sources, targets = lookup[endpoint_codes[: len(edges_df)]], lookup[endpoint_codes[len(edges_df) :]]
+    relationship_codes, relationship_names = pd.factorize(edges_df['relationship_type'].astype(str), sort=True)
+
+    known = (sources >= 0) & (targets >= 0)
+    sources, targets, relationships = sources[known], targets[known], relationship_codes[known].astype(np.int64)
+    degree = np.bincount(sources, minlength=node_count) + np.bincount(targets, minlength=node_count)
+    loops = sources == targets
+
+    low = np.minimum(sources[~loops], targets[~loops])
+    high = np.maximum(sources[~loops], targets[~loops])
+    connected_pairs = len(_distinct_sorted(low * node_count + high)[0])
+    possible_pairs = node_count * (node_count - 1) // 2
+
+    labels = component_labels(node_count, sources, targets)
+    sizes = np.bincount(labels, minlength=node_count)
+    sizes = np.sort(sizes[sizes > 0])[::-1]
+
+    node_coverage, node_confidence = _provenance(nodes_df, 'type')
+    edge_coverage, edge_confidence = _provenance(edges_df, 'relationship_type')
+    percentiles = (
+        np.percentile(degree, DEGREE_PERCENTILES, method='inverted_cdf') if node_count else [0] * len(DEGREE_PERCENTILES)
+    )
+    return NetworkStatistics(
+        node_count=node_count,
+        edge_count=len(edges_df),
+        dangling_edges=int((~known).sum()),
+        self_loops=int(loops.sum()),
+        connected_pairs=connected_pairs,
+        density=connected_pairs / possible_pairs if possible_pairs else 0.0,
+        degree_mean=float(degree.mean()) if node_count else 0.0,
+        degree_percentiles={rank: int(value) for rank, value in zip(DEGREE_PERCENTILES, percentiles)},
+        component_count=len(sizes),
+        largest_components=[int(size) for size in sizes[:LARGEST_COMPONENTS_SHOWN]],
+        isolates=int((degree == 0).sum()),
+        reciprocity=_reciprocity(
+            sources[~loops], targets[~loops], relationships[~loops], [str(name) for name in relationship_names], node_count
+        ),
+        node_coverage=node_coverage,
+        edge_coverage=edge_coverage,
+        node_confidence=node_confidence,
+        edge_confidence=edge_confidence,
+    )
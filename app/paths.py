@@ -0,0 +1,326 @@
+"""Shortest and k-shortest connection paths between two entities over the adjacency index."""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from app.adjacency import AdjacencyIndex
+from app.range_index import confidence_key
+
+DEFAULT_PATH_CONFIDENCE = 0.5
+MAX_PATH_COUNT = 10
+
+
+@dataclass(frozen=True)
+class Path:
+    """One connection: node ids in order plus the edge row positions between them."""
+
+    node_ids: tuple[str, ...]
+    edge_positions: tuple[int, ...]
+    cost: float
+
+    @property
+    def hops(self) -> int:
+        return len(self.edge_positions)
+
+
+def edge_confidences(edges_df: pd.DataFrame) -> np.ndarray:
+    """Return per-edge confidence, using DEFAULT_PATH_CONFIDENCE where it is missing."""
+    if 'confidence' not in edges_df.columns:
+        return np.full(len(edges_df), DEFAULT_PATH_CONFIDENCE)
+    keys = [confidence_key(value) for value in edges_df['confidence'].tolist()]
+    return np.asarray([DEFAULT_PATH_CONFIDENCE if key is None else key for key in keys], dtype=float)
+
+
+def edge_costs(edges_df: pd.DataFrame) -> np.ndarray:
+    """Return traversal costs ``2 - confidence`` so confident edges are cheaper but never free."""
+    return 2.0 - edge_confidences(edges_df)
+
+
+def path_highlight(paths: Iterable[Path], edges_df: pd.DataFrame) -> dict[str, list]:
+    """Return the node ids and ``[source, target, relationship_type]`` edge keys covered by paths."""
+    nodes: dict[str, None] = {}
+    edges: dict[tuple[str, str, str], None] = {}
+    for path in paths:
+        nodes.update(dict.fromkeys(path.node_ids))
+        for position in path.edge_positions:
+            row = edges_df.iloc[position]
+            edges[(str(row['source']), str(row['target']), str(row['relationship_type']))] = None
+    return {'nodes': list(nodes), 'edges': [list(edge) for edge in edges]}
+
+
+def _walk_back(entry_heads: list[int], parents, node: int) -> list[int]:
+    """Return the entries leading from the search root to node, root first."""
+    entries: list[int] = []
+    entry = parents[node]
+    while entry >= 0:
+        entries.append(int(entry))
+        node = entry_heads[entry]
+        entry = parents[node]
+    entries.reverse()
+    return entries
+
+
+def _twin_entry(adjacency: AdjacencyIndex, entry: int) -> int:
+    """Return the entry for the same edge traversed in the opposite direction."""
+    head = int(adjacency.indices[entry])
+    start, stop = adjacency.indptr[head], adjacency.indptr[head + 1]
+    candidates = np.flatnonzero(adjacency.entry_edges[start:stop] == adjacency.entry_edges[entry]) + start
+    if len(candidates) > 1:
+        candidates = candidates[adjacency.entry_forward[candidates] != adjacency.entry_forward[entry]]
+    return int(candidates[0])
+
+
+def _join(adjacency: AdjacencyIndex, forward: list[int], backward: list[int]) -> list[int]:
+    """Join a source-side prefix with target-side entries (which point towards the meeting node)."""
+    return forward + [_twin_entry(adjacency, entry) for entry in reversed(backward)]
+
+
+def _bidirectional_bfs(
+    adjacency: AdjacencyIndex,
+    source: int,
+    target: int,
+    allowed_edges: np.ndarray | None,
+    banned_edges: set[int],
+    banned_nodes: set[int],
+) -> list[int] | None:
+    """Return the entries of a fewest-hops path, expanding the smaller frontier level by level."""
+    if source == target:
+        return []
+    count = adjacency.node_count
+    depth = [np.full(count, -1, dtype=np.int64), np.full(count, -1, dtype=np.int64)]
+    parents = [np.full(count, -1, dtype=np.int64), np.full(count, -1, dtype=np.int64)]
+    frontiers = [np.array([source]), np.array([target])]
+    depth[0][source] = 0
+    depth[1][target] = 0
+    banned_edge_array = np.fromiter(banned_edges, dtype=np.int64)
+    banned_node_array = np.fromiter(banned_nodes, dtype=np.int64)
+    while len(frontiers[0]) and len(frontiers[1]):
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        entries = adjacency.entry_slices(frontiers[side])
+        edges = adjacency.entry_edges[entries]
+        keep = np.ones(len(entries), dtype=bool) if allowed_edges is None else allowed_edges[edges]
+        if len(banned_edge_array):
+            keep &= ~np.isin(edges, banned_edge_array)
+        entries = entries[keep]
+        reached = adjacency.indices[entries]
+        fresh = depth[side][reached] < 0
+        if len(banned_node_array):
+            fresh &= ~np.isin(reached, banned_node_array)
+        reached, first = np.unique(reached[fresh], return_index=True)
+        depth[side][reached] = depth[side][frontiers[side][0]] + 1
+        parents[side][reached] = entries[fresh][first]
+        frontiers[side] = reached
+
+        meets = reached[depth[1 - side][reached] >= 0]
+        if len(meets):
+            meet = int(meets[np.argmin(depth[1 - side][meets])])
+            heads = adjacency.entry_heads
+            return _join(adjacency, _walk_back(heads, parents[0], meet), _walk_back(heads, parents[1], meet))
+    return None
+
+
+class PathFinder:
+    """Answers connection queries between node ids over one immutable adjacency index."""
+
+    def __init__(self, adjacency: AdjacencyIndex, confidences: np.ndarray, relationship_types: np.ndarray) -> None:
+        self.adjacency = adjacency
+        self.confidences = confidences
+        self.costs = 2.0 - confidences
+        self.relationship_types = relationship_types
+        self._list_cache: tuple[list[int], list[int], list[int], list[int], list[float]] | None = None
+
+    @classmethod
+    def from_frames(
+        cls,
+        nodes_df: pd.DataFrame,
+        edges_df: pd.DataFrame,
+        adjacency: AdjacencyIndex | None = None,
+    ) -> PathFinder:
+        """Build a finder, reusing a prebuilt adjacency index when given."""
+        return cls(
+            adjacency if adjacency is not None else AdjacencyIndex.from_frames(nodes_df, edges_df),
+            edge_confidences(edges_df),
+            edges_df['relationship_type'].astype(str).to_numpy(),
+        )
+
+    def _code(self, node_id: object) -> int:
+        code = self.adjacency.code_of.get(str(node_id))
+        if code is None:
+            raise ValueError(f"Unknown node id '{node_id}'")
+        return code
+
+    def allowed_edges(
+        self,
+        relationship_types: Iterable[str] | None = None,
+        min_confidence: float | None = None,
+    ) -> np.ndarray | None:
+        """Return the edge mask implied by the restrictions, or None when unrestricted."""
+        mask = self.adjacency.relationship_mask(relationship_types)
+        if min_confidence is not None:
+            confident = self.confidences >= float(min_confidence)
+            mask = confident if mask is None else mask & confident
+        return mask
+
+    def _lists(self) -> tuple[list[int], list[int], list[int], list[int], list[float]]:
+        """Return the CSR arrays as Python lists for the per-node Dijkstra loop (built once)."""
+        if self._list_cache is None:
+            adjacency = self.adjacency
+            self._list_cache = (
+                adjacency.indptr.tolist(),
+                adjacency.indices.tolist(),
+                adjacency.entry_edges.tolist(),
+                adjacency.entry_heads.tolist(),
+                self.costs.tolist(),
+            )
+        return self._list_cache
+
+    def _bidirectional_dijkstra(
+        self,
+        source: int,
+        target: int,
+        allowed_edges: list[bool] | None,
+        banned_edges: set[int],
+        banned_nodes: set[int],
+    ) -> list[int] | None:
+        """Return the entries of a least-cost path, growing searches from both ends until they can no longer improve."""
+        if source == target:
+            return []
+        indptr, indices, entry_edges, entry_heads, costs = self._lists()
+        distance: list[dict[int, float]] = [{source: 0.0}, {target: 0.0}]
+        parents: list[dict[int, int]] = [{source: -1}, {target: -1}]
+        settled: list[set[int]] = [set(), set()]
+        heaps: list[list[tuple[float, int]]] = [[(0.0, source)], [(0.0, target)]]
+        best = float('inf')
+        meet = -1
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            cost, node = heapq.heappop(heaps[side])
+            if node in settled[side]:
+                continue
+            settled[side].add(node)
+            near, far = distance[side], distance[1 - side]
+            for entry in range(indptr[node], indptr[node + 1]):
+                edge = entry_edges[entry]
+                if (allowed_edges is not None and not allowed_edges[edge]) or edge in banned_edges:
+                    continue
+                neighbour = indices[entry]
+                if neighbour in banned_nodes:
+                    continue
+                candidate = cost + costs[edge]
+                if candidate < near.get(neighbour, float('inf')):
+                    near[neighbour] = candidate
+                    parents[side][neighbour] = entry
+                    heapq.heappush(heaps[side], (candidate, neighbour))
+                if neighbour in far and near[neighbour] + far[neighbour] < best:
+                    best = near[neighbour] + far[neighbour]
+                    meet = neighbour
+        if meet < 0:
+            return None
+        return _join(
+            self.adjacency,
+            _walk_back(entry_heads, parents[0], meet),
+            _walk_back(entry_heads, parents[1], meet),
+        )
+
+    def _search(
+        self,
+        source: int,
+        target: int,
+        weighted: bool,
+        allowed_edges: np.ndarray | None,
+        allowed_list: list[bool] | None,
+        banned_edges: set[int] = frozenset(),
+        banned_nodes: set[int] = frozenset(),
+    ) -> list[int] | None:
+        if weighted:
+            return self._bidirectional_dijkstra(source, target, allowed_list, banned_edges, banned_nodes)
+        return _bidirectional_bfs(self.adjacency, source, target, allowed_edges, banned_edges, banned_nodes)
+
+    def _node_codes(self, source: int, entries: list[int]) -> list[int]:
+        return [source, *(int(self.adjacency.indices[entry]) for entry in entries)]
+
+    def _path(self, source: int, entries: list[int], weighted: bool) -> Path:
+        nodes = self._node_codes(source, entries)
+        edges = tuple(int(self.adjacency.entry_edges[entry]) for entry in entries)
+        cost = float(self.costs[list(edges)].sum()) if weighted else float(len(edges))
+        return Path(tuple(self.adjacency.node_ids[node] for node in nodes), edges, cost)
+
+    def shortest_path(
+        self,
+        source_id: object,
+        target_id: object,
+        *,
+        weighted: bool = False,
+        relationship_types: Iterable[str] | None = None,
+        min_confidence: float | None = None,
+    ) -> Path | None:
+        """Return the fewest-hops (or, when weighted, most-confident) path, or None if disconnected."""
+        paths = self.k_shortest_paths(
+            source_id,
+            target_id,
+            1,
+            weighted=weighted,
+            relationship_types=relationship_types,
+            min_confidence=min_confidence,
+        )
+        return paths[0] if paths else None
+
+    def k_shortest_paths(
+        self,
+        source_id: object,
+        target_id: object,
+        k: int = 3,
+        *,
+        weighted: bool = False,
+        relationship_types: Iterable[str] | None = None,
+        min_confidence: float | None = None,
+    ) -> list[Path]:
+        """Return up to k loopless paths with distinct node sequences, cheapest first (Yen's algorithm)."""
+        source = self._code(source_id)
+        target = self._code(target_id)
+        allowed = self.allowed_edges(relationship_types, min_confidence)
+        allowed_list = allowed.tolist() if weighted and allowed is not None else None
+        first = self._search(source, target, weighted, allowed, allowed_list)
+        if first is None:
+            return []
+
+        found = [first]
+        seen = {self._path(source, first, weighted).node_ids}
+        candidates: list[tuple[float, int, list[int]]] = []
+        tie_breaker = 0
+        while len(found) < min(k, MAX_PATH_COUNT):
+            previous = found[-1]
+            previous_nodes = self._node_codes(source, previous)
+            for spur_index in range(len(previous)):
+                spur = previous_nodes[spur_index]
+                banned_edges: set[int] = set()
+                for path in found:
+                    path_nodes = self._node_codes(source, path)
+                    if len(path) > spur_index and path_nodes[:spur_index + 1] == previous_nodes[:spur_index + 1]:
+                        start, stop = self.adjacency.indptr[spur], self.adjacency.indptr[spur + 1]
+                        parallel = np.flatnonzero(self.adjacency.indices[start:stop] == path_nodes[spur_index + 1])
+                        banned_edges.update(self.adjacency.entry_edges[parallel + start].tolist())
+                banned_nodes = set(previous_nodes[:spur_index])
+
+                spur_entries = self._search(spur, target, weighted, allowed, allowed_list, banned_edges, banned_nodes)
+                if spur_entries is None:
+                    continue
+                total = previous[:spur_index] + spur_entries
+                path = self._path(source, total, weighted)
+                if path.node_ids in seen:
+                    continue
+                seen.add(path.node_ids)
+                tie_breaker += 1
+                heapq.heappush(candidates, (path.cost, tie_breaker, total))
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates)[2])
+        return [self._path(source, entries, weighted) for entries in found]
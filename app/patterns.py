@@ -0,0 +1,304 @@
+"""Typed path patterns such as ``(Person)-[funds]->(Group)<-[member_of]-(Person)``.
+
+A pattern alternates node slots and edge steps. Node slots hold optional node types,
+``(Person|Group)`` or ``()`` for any node. Steps are ``-[rel]->``, ``<-[rel]-`` or
+``-[rel]-`` (either direction), with ``rel1|rel2`` alternatives; ``-[]->``, ``-->``,
+``<--`` and ``--`` match any relationship. Types and relationships compare
+case-insensitively. As in Cypher, one edge fills at most one step of a match while
+nodes may repeat.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from app.adjacency import AdjacencyIndex
+
+OUT = 'out'
+IN = 'in'
+BOTH = 'both'
+ANY_RELATIONSHIP = -1
+MAX_PATTERN_MATCHES = 5000
+PATTERN_CACHE_SIZE = 128
+
+_NODE_PATTERN = re.compile(r'\s*\(\s*:?\s*(?P<types>[^()\[\]]*?)\s*\)\s*')
+_STEP_PATTERN = re.compile(r'(?P<left><)?-(?:\[\s*:?\s*(?P<rels>[^\[\]()]*?)\s*\])?-(?P<right>>)?')
+_LOOKS_LIKE_PATTERN = re.compile(r'\s*\(\s*:?[^():~=<>!"]*\)\s*(?:$|<?-)')
+
+
+@dataclass(frozen=True)
+class PatternStep:
+    """One edge step between two node slots; ``out`` means the left slot is the source."""
+
+    relationship_types: tuple[str, ...]
+    direction: str
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """Parsed pattern: node type alternatives per slot and the steps between slots."""
+
+    text: str
+    node_types: tuple[tuple[str, ...], ...]
+    steps: tuple[PatternStep, ...]
+
+
+def looks_like_pattern(text: str | None) -> bool:
+    """Return whether query text is a path pattern rather than a filter query."""
+    return bool(text) and _LOOKS_LIKE_PATTERN.match(text) is not None
+
+
+def _names(text: str | None) -> tuple[str, ...]:
+    return tuple(name.strip() for name in (text or '').split('|') if name.strip())
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def parse_pattern(text: str) -> Pattern:
+    """Parse pattern text, caching by text; raises ValueError on bad syntax."""
+    node_types: list[tuple[str, ...]] = []
+    steps: list[PatternStep] = []
+    position = 0
+    while True:
+        node = _NODE_PATTERN.match(text, position)
+        if node is None:
+            raise ValueError(f'Expected a node like (Person) at position {position}')
+        node_types.append(_names(node.group('types')))
+        position = node.end()
+        if position == len(text):
+            break
+        step = _STEP_PATTERN.match(text, position)
+        if step is None:
+            raise ValueError(f'Expected an edge like -[rel]-> at position {position}')
+        if step.group('left') and step.group('right'):
+            raise ValueError('An edge cannot point both ways; use -[rel]- for either direction')
+        direction = IN if step.group('left') else OUT if step.group('right') else BOTH
+        steps.append(PatternStep(_names(step.group('rels')), direction))
+        position = step.end()
+    return Pattern(text, tuple(node_types), tuple(steps))
+
+
+def _gather(indptr: np.ndarray, codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (position in codes, CSR entry) for every entry of the given rows."""
+    starts = indptr[codes]
+    lengths = indptr[codes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    owners = np.repeat(np.arange(len(codes), dtype=np.int64), lengths)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return owners, np.arange(total, dtype=np.int64) + offsets
+
+
+@dataclass
+class PatternMatches:
+    """Matches of one pattern plus the subgraph they cover.
+
+    ``nodes`` holds one row of node codes per match (one column per slot) and
+    ``edges`` the matching edge row positions (one column per step).
+    """
+
+    pattern: Pattern
+    nodes: np.ndarray
+    edges: np.ndarray
+    node_mask: np.ndarray
+    edge_mask: np.ndarray
+    truncated: bool
+
+    @property
+    def match_count(self) -> int:
+        return len(self.nodes)
+
+    def subgraph(self, nodes_df: pd.DataFrame, edges_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Return the node and edge rows covered by the matches, ready to render or export."""
+        return nodes_df[self.node_mask], edges_df[self.edge_mask]
+
+
+class PatternIndex:
+    """Per-relationship directed CSR indexes for matching patterns.
+
+    Each relationship type gets an outgoing and an incoming CSR the first time a
+    pattern uses it, so a query only ever touches edges of the relationships it names.
+    """
+
+    def __init__(self, adjacency: AdjacencyIndex, node_types: list[str]) -> None:
+        self.adjacency = adjacency
+        codes, uniques = pd.factorize(pd.Series([str(value).lower() for value in node_types], dtype=object))
+        self.node_type_codes = codes.astype(np.int64)
+        self.type_code_of = {value: code for code, value in enumerate(uniques)}
+        self.type_counts = np.bincount(self.node_type_codes, minlength=len(uniques))
+        self.relationship_code_of = {value.lower(): code for code, value in enumerate(adjacency.relationship_types)}
+        self._valid = (adjacency.edge_sources >= 0) & (adjacency.edge_targets >= 0)
+        self._csr: dict[tuple[int, str], tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_frames(
+        cls,
+        nodes_df: pd.DataFrame,
+        edges_df: pd.DataFrame,
+        adjacency: AdjacencyIndex | None = None,
+    ) -> PatternIndex:
+        """Build the index, reusing a prebuilt adjacency index when given."""
+        adjacency = adjacency if adjacency is not None else AdjacencyIndex.from_frames(nodes_df, edges_df)
+        return cls(adjacency, nodes_df['type'].tolist())
+
+    def csr(self, relationship: int, direction: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(indptr, neighbours, edge positions)`` for one relationship code and direction."""
+        key = (relationship, direction)
+        if key not in self._csr:
+            adjacency = self.adjacency
+            wanted = self._valid.copy()
+            if relationship != ANY_RELATIONSHIP:
+                wanted &= adjacency.edge_relationship_codes == relationship
+            positions = np.flatnonzero(wanted)
+            heads, tails = adjacency.edge_sources[positions], adjacency.edge_targets[positions]
+            if direction == IN:
+                heads, tails = tails, heads
+            order = np.argsort(heads, kind='stable')
+            counts = np.bincount(heads, minlength=adjacency.node_count)
+            indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+            self._csr[key] = (indptr, tails[order], positions[order])
+        return self._csr[key]
+
+    def slot_mask(self, types: tuple[str, ...]) -> np.ndarray:
+        """Return the candidate node mask for one slot."""
+        if not types:
+            return np.ones(self.adjacency.node_count, dtype=bool)
+        codes = [self.type_code_of[name.lower()] for name in types if name.lower() in self.type_code_of]
+        return np.isin(self.node_type_codes, codes)
+
+    def _lanes(self, step: PatternStep, forward: bool) -> list[tuple[int, str]]:
+        """Return the (relationship, CSR direction) pairs that walk a step left-to-right or back."""
+        if step.relationship_types:
+            relationships = sorted(
+                {self.relationship_code_of[name.lower()] for name in step.relationship_types
+                 if name.lower() in self.relationship_code_of}
+            )
+        else:
+            relationships = [ANY_RELATIONSHIP]
+        if step.direction == BOTH:
+            directions = [OUT, IN]
+        else:
+            directions = [OUT if (step.direction == OUT) == forward else IN]
+        return [(relationship, direction) for relationship in relationships for direction in directions]
+
+    def _expand(self, codes: np.ndarray, step: PatternStep, forward: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (position in codes, neighbour, edge position) for each way to cross step from codes."""
+        owners, neighbours, edges = [], [], []
+        for relationship, direction in self._lanes(step, forward):
+            indptr, tails, positions = self.csr(relationship, direction)
+            owner, entries = _gather(indptr, codes)
+            if step.direction == BOTH and direction == IN:
+                # Self-loops were already reached through the outgoing lane.
+                keep = tails[entries] != codes[owner]
+                owner, entries = owner[keep], entries[keep]
+            owners.append(owner)
+            neighbours.append(tails[entries])
+            edges.append(positions[entries])
+        if not owners:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        return np.concatenate(owners), np.concatenate(neighbours), np.concatenate(edges)
+
+    def _fan_out(self, codes: np.ndarray, step: PatternStep, forward: bool) -> int:
+        total = 0
+        for relationship, direction in self._lanes(step, forward):
+            indptr = self.csr(relationship, direction)[0]
+            total += int((indptr[codes + 1] - indptr[codes]).sum())
+        return total
+
+    def _semi_join(self, candidates: list[np.ndarray], pattern: Pattern, slot: int, forward: bool) -> None:
+        """Keep only the next slot's candidates reachable from this slot's candidates."""
+        step_index = slot if forward else slot - 1
+        following = slot + 1 if forward else slot - 1
+        _, reached, _ = self._expand(np.flatnonzero(candidates[slot]), pattern.steps[step_index], forward)
+        mask = np.zeros(self.adjacency.node_count, dtype=bool)
+        mask[reached] = True
+        candidates[following] &= mask
+
+    def reduce(self, pattern: Pattern, start: int) -> list[np.ndarray]:
+        """Return per-slot candidate masks holding exactly the nodes that take part in some match.
+
+        Semi-joins run outward from the start slot (cheap, as it is the most selective),
+        back in from both ends, and outward again - a full reducer for a path.
+        """
+        candidates = [self.slot_mask(types) for types in pattern.node_types]
+        last = len(candidates) - 1
+        outward = [(slot, True) for slot in range(start, last)] + [(slot, False) for slot in range(start, 0, -1)]
+        inward = [(slot, False) for slot in range(last, start, -1)] + [(slot, True) for slot in range(0, start)]
+        for slot, forward in [*outward, *inward, *outward]:
+            self._semi_join(candidates, pattern, slot, forward)
+        return candidates
+
+    def _start_slot(self, pattern: Pattern) -> int:
+        """Pick the slot with the fewest candidate nodes, judged from type counts alone."""
+        sizes = []
+        for types in pattern.node_types:
+            if not types:
+                sizes.append(self.adjacency.node_count)
+            else:
+                sizes.append(sum(
+                    int(self.type_counts[self.type_code_of[name.lower()]])
+                    for name in set(types) if name.lower() in self.type_code_of
+                ))
+        return int(np.argmin(sizes))
+
+    def match(self, pattern: Pattern | str, limit: int = MAX_PATTERN_MATCHES) -> PatternMatches:
+        """Return up to limit matches of a pattern and the subgraph they cover.
+
+        After reduction every candidate extends to a full match, so partial matches are
+        joined slot by slot - always on the side with the smaller fan-out - and capped at
+        limit rows without enumerating anything that cannot match.
+        """
+        pattern = parse_pattern(pattern) if isinstance(pattern, str) else pattern
+        start = self._start_slot(pattern)
+        candidates = self.reduce(pattern, start)
+        slot_count = len(pattern.node_types)
+
+        rows = np.flatnonzero(candidates[start])
+        truncated = len(rows) > limit
+        rows = rows[:limit]
+        nodes = {start: rows}
+        edges: dict[int, np.ndarray] = {}
+        low = high = start
+        while low > 0 or high < slot_count - 1:
+            options = []
+            if high < slot_count - 1:
+                options.append((self._fan_out(nodes[high], pattern.steps[high], True), high, True))
+            if low > 0:
+                options.append((self._fan_out(nodes[low], pattern.steps[low - 1], False), low, False))
+            _, slot, forward = min(options)
+            step_index = slot if forward else slot - 1
+            owners, reached, crossed = self._expand(nodes[slot], pattern.steps[step_index], forward)
+            keep = candidates[slot + 1 if forward else slot - 1][reached]
+            for other in edges.values():
+                keep &= other[owners] != crossed
+            owners, reached, crossed = owners[keep], reached[keep], crossed[keep]
+            if len(owners) > limit:
+                truncated = True
+                owners, reached, crossed = owners[:limit], reached[:limit], crossed[:limit]
+            nodes = {key: column[owners] for key, column in nodes.items()}
+            edges = {key: column[owners] for key, column in edges.items()}
+            edges[step_index] = crossed
+            if forward:
+                high += 1
+                nodes[high] = reached
+            else:
+                low -= 1
+                nodes[low] = reached
+
+        node_rows = np.column_stack([nodes[slot] for slot in range(slot_count)]).astype(np.int64)
+        edge_rows = (
+            np.column_stack([edges[step] for step in range(slot_count - 1)]).astype(np.int64)
+            if slot_count > 1
+            else np.empty((len(node_rows), 0), dtype=np.int64)
+        )
+        node_mask = np.zeros(self.adjacency.node_count, dtype=bool)
+        node_mask[node_rows.ravel()] = True
+        edge_mask = np.zeros(self.adjacency.edge_count, dtype=bool)
+        edge_mask[edge_rows.ravel()] = True
+        return PatternMatches(pattern, node_rows, edge_rows, node_mask, edge_mask, truncated)
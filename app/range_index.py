@@ -0,0 +1,164 @@
+"""Sorted column indexes for range filters on provenance ``date`` and ``confidence``."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.provenance import is_valid_optional_date, parse_optional_confidence
+
+RANGE_COLUMNS = ('date', 'confidence')
+
+
+def date_key(value: Any) -> str | None:
+    """Return a sortable YYYY-MM-DD key for a date cell, or None when missing or invalid."""
+    if value is None:
+        return None
+    if not isinstance(value, str) and pd.isna(value):
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    text = str(value).strip()[:10]
+    if not text or not is_valid_optional_date(text):
+        return None
+    return text
+
+
+def confidence_key(value: Any) -> float | None:
+    """Return a confidence cell as a float, or None when missing or invalid."""
+    ok, parsed = parse_optional_confidence(value)
+    if not ok or parsed == '':
+        return None
+    return float(parsed)
+
+
+_KEY_FUNCTIONS: dict[str, Callable[[Any], Any]] = {'date': date_key, 'confidence': confidence_key}
+
+
+class SortedColumnIndex:
+    """Row positions kept sorted by column value for O(log n + k) inclusive range lookups.
+
+    Entries are ``(key, position)`` pairs; rows with a missing key are not indexed and
+    therefore never match an active bound.
+    """
+
+    def __init__(self, values: Iterable[Any] = (), key: Callable[[Any], Any] = confidence_key) -> None:
+        self._key = key
+        self._keys: list[Any] = [key(value) for value in values]
+        self._entries: list[tuple[Any, int]] = sorted(
+            (value, position) for position, value in enumerate(self._keys) if value is not None
+        )
+
+    @classmethod
+    def for_column(cls, frame: pd.DataFrame, column: str) -> SortedColumnIndex:
+        """Build an index over a known range column, treating an absent column as all missing."""
+        values = frame[column].tolist() if column in frame.columns else [None] * len(frame)
+        return cls(values, _KEY_FUNCTIONS[column])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def indexed_count(self) -> int:
+        return len(self._entries)
+
+    def bounds(self) -> tuple[Any, Any]:
+        """Return the smallest and largest indexed keys, or (None, None) when empty."""
+        if not self._entries:
+            return None, None
+        return self._entries[0][0], self._entries[-1][0]
+
+    def _span(self, low: Any, high: Any, include_low: bool, include_high: bool) -> tuple[int, int]:
+        if low is None:
+            start = 0
+        elif include_low:
+            start = bisect_left(self._entries, (low, -1))
+        else:
+            start = bisect_right(self._entries, (low, float('inf')))
+        if high is None:
+            stop = len(self._entries)
+        elif include_high:
+            stop = bisect_right(self._entries, (high, float('inf')))
+        else:
+            stop = bisect_left(self._entries, (high, -1))
+        return start, stop
+
+    def count(self, low: Any = None, high: Any = None, *, include_low: bool = True, include_high: bool = True) -> int:
+        """Return how many rows fall in the range without materializing them."""
+        start, stop = self._span(low, high, include_low, include_high)
+        return max(stop - start, 0)
+
+    def range_positions(
+        self,
+        low: Any = None,
+        high: Any = None,
+        *,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> np.ndarray:
+        """Return row positions with low <= key <= high (either bound may be None or exclusive)."""
+        start, stop = self._span(low, high, include_low, include_high)
+        if start >= stop:
+            return np.empty(0, dtype=np.int64)
+        return np.fromiter((position for _, position in self._entries[start:stop]), dtype=np.int64)
+
+    def range_mask(
+        self,
+        low: Any = None,
+        high: Any = None,
+        *,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> np.ndarray:
+        """Return a boolean row mask for the range (inclusive by default)."""
+        mask = np.zeros(len(self._keys), dtype=bool)
+        mask[self.range_positions(low, high, include_low=include_low, include_high=include_high)] = True
+        return mask
+
+    def _discard(self, position: int) -> None:
+        value = self._keys[position]
+        if value is None:
+            return
+        entry = bisect_left(self._entries, (value, position))
+        del self._entries[entry]
+
+    def set(self, position: int, value: Any) -> None:
+        """Change the value of an existing row."""
+        new_key = self._key(value)
+        if new_key == self._keys[position]:
+            return
+        self._discard(position)
+        self._keys[position] = new_key
+        if new_key is not None:
+            insort(self._entries, (new_key, position))
+
+    def append(self, values: Iterable[Any]) -> None:
+        """Add rows at the end of the frame."""
+        for value in values:
+            position = len(self._keys)
+            new_key = self._key(value)
+            self._keys.append(new_key)
+            if new_key is not None:
+                insort(self._entries, (new_key, position))
+
+    def delete(self, positions: Iterable[int]) -> None:
+        """Remove rows at positions, shifting later rows up like ``drop``/``reset_index``."""
+        doomed = sorted(set(int(position) for position in positions))
+        if not doomed:
+            return
+        doomed_set = set(doomed)
+        self._entries = [
+            (value, position - bisect_left(doomed, position))
+            for value, position in self._entries
+            if position not in doomed_set
+        ]
+        self._keys = [value for position, value in enumerate(self._keys) if position not in doomed_set]
+
+
+def build_range_indexes(frame: pd.DataFrame) -> dict[str, SortedColumnIndex]:
+    """Return one sorted index per provenance range column of frame."""
+    return {column: SortedColumnIndex.for_column(frame, column) for column in RANGE_COLUMNS}
@@ -7,7 +7,7 @@ from pathlib import Path
 import pandas as pd
 
 from app.config import get_default_data_path
-from app.io_excel import save_workbook
+from app.io_excel import save_tables
 from app.schema import REQUIRED_EDGE_COLS, REQUIRED_NODE_COLS
 
 
@@ -32,7 +32,11 @@ def _sort_sample_edges(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def create_sample_workbook(path: str | None = None) -> str:
-    """Create a starter workbook at path and return the created file path."""
+    """Create starter data at path and return it.
+
+    A workbook path gets a workbook; a Parquet/Arrow path (a table file or a folder)
+    gets ``nodes``/``edges`` tables, as ``save_tables`` writes them.
+    """
     if path is None:
         path = get_default_data_path()
     workbook_path = Path(path)
@@ -201,5 +205,5 @@ def create_sample_workbook(path: str | None = None) -> str:
     edges_df = edges_df.loc[:, _ordered_columns(edges_df, REQUIRED_EDGE_COLS)]
     edges_df = _sort_sample_edges(edges_df)
 
-    save_workbook(nodes_df, edges_df, path=str(workbook_path))
+    save_tables(nodes_df, edges_df, path=str(workbook_path))
     return str(workbook_path)
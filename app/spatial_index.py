@@ -0,0 +1,204 @@
+"""Spatial grid index over laid-out node positions for viewport streaming."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import defaultdict
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.schema import REQUIRED_EDGE_COLS, REQUIRED_NODE_COLS
+
+LAYOUT_SCALE = 1000.0
+LAYOUT_PASSES = 12
+# Share of each node's position taken from its neighbours' mean on every layout pass.
+LAYOUT_PULL = 0.7
+DEFAULT_MAX_VIEWPORT_NODES = 1500
+DEFAULT_LOD_ZOOM = 0.5
+
+
+def _xy_positions(nodes_df: pd.DataFrame, node_ids: list[str]) -> dict[str, tuple[float, float]] | None:
+    if not {'x', 'y'}.issubset(nodes_df.columns):
+        return None
+    xs = pd.to_numeric(nodes_df['x'], errors='coerce')
+    ys = pd.to_numeric(nodes_df['y'], errors='coerce')
+    if not (xs.notna().all() and ys.notna().all()):
+        return None
+    return {node_id: (float(x), float(y)) for node_id, x, y in zip(node_ids, xs, ys)}
+
+
+def _scaled(node_ids: list[str], points: np.ndarray) -> dict[str, tuple[float, float]]:
+    """Centre the points and scale them into [-LAYOUT_SCALE, LAYOUT_SCALE], like ``nx.rescale_layout``."""
+    points = points - points.mean(axis=0)
+    extent = float(np.abs(points).max()) if len(points) else 0.0
+    if extent > 0:
+        points = points * (LAYOUT_SCALE / extent)
+    return dict(zip(node_ids, map(tuple, points.tolist())))
+
+
+def seed_layout_positions(nodes_df: pd.DataFrame, *, seed: int = 42) -> dict[str, tuple[float, float]]:
+    """Return x/y columns when present, otherwise seeded random positions (linear time)."""
+    node_ids = nodes_df[REQUIRED_NODE_COLS[0]].astype(str).tolist()
+    positions = _xy_positions(nodes_df, node_ids)
+    if positions is not None:
+        return positions
+    return _scaled(node_ids, np.random.default_rng(seed).uniform(-1.0, 1.0, size=(len(node_ids), 2)))
+
+
+def compute_layout_positions(
+    nodes_df: pd.DataFrame,
+    edges_df: pd.DataFrame,
+    *,
+    seed: int = 42,
+    passes: int = LAYOUT_PASSES,
+) -> dict[str, tuple[float, float]]:
+    """Return model-space positions per node id, preferring numeric x/y columns when present.
+
+    Without x/y, nodes start at seeded random anchors and each pass moves every node
+    to a blend of its anchor and the mean of its neighbours, so connected nodes end up
+    near each other. Each pass is two ``bincount`` calls over the edge codes, which keeps
+    the layout linear in nodes plus edges and free of scipy.
+    """
+    node_ids = nodes_df[REQUIRED_NODE_COLS[0]].astype(str).tolist()
+    positions = _xy_positions(nodes_df, node_ids)
+    if positions is not None:
+        return positions
+    if not node_ids:
+        return {}
+
+    node_index = pd.Index(node_ids)
+    sources = node_index.get_indexer(edges_df[REQUIRED_EDGE_COLS[0]].astype(str))
+    targets = node_index.get_indexer(edges_df[REQUIRED_EDGE_COLS[1]].astype(str))
+    keep = (sources >= 0) & (targets >= 0) & (sources != targets)
+    heads = np.concatenate([sources[keep], targets[keep]])
+    tails = np.concatenate([targets[keep], sources[keep]])
+    degree = np.bincount(heads, minlength=len(node_ids))
+    linked = degree > 0
+
+    anchors = np.random.default_rng(seed).uniform(-1.0, 1.0, size=(len(node_ids), 2))
+    points = anchors.copy()
+    for _ in range(passes):
+        for axis in range(2):
+            sums = np.bincount(heads, weights=points[tails, axis], minlength=len(node_ids))
+            means = sums[linked] / degree[linked]
+            points[linked, axis] = (1 - LAYOUT_PULL) * anchors[linked, axis] + LAYOUT_PULL * means
+    return _scaled(node_ids, points)
+
+
+class GridIndex:
+    """Uniform grid over 2D points supporting rectangular range queries."""
+
+    def __init__(self, positions: dict[str, tuple[float, float]], cell_size: float | None = None) -> None:
+        self.positions = positions
+        if positions:
+            xs = [point[0] for point in positions.values()]
+            ys = [point[1] for point in positions.values()]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            self.bounds = (0.0, 0.0, 0.0, 0.0)
+
+        if cell_size is None:
+            width = max(self.bounds[2] - self.bounds[0], 1.0)
+            height = max(self.bounds[3] - self.bounds[1], 1.0)
+            # Aim for roughly eight points per cell on average.
+            cell_size = math.sqrt(width * height * 8 / max(len(positions), 1))
+        self.cell_size = max(float(cell_size), 1e-9)
+
+        self._cells: dict[tuple[int, int], list[str]] = defaultdict(list)
+        for node_id, (x, y) in positions.items():
+            self._cells[self._cell(x, y)].append(node_id)
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> list[str]:
+        """Return ids of points inside the inclusive rectangle (x1, y1)-(x2, y2)."""
+        if x1 > x2:
+            x1, x2 = x2, x1
+        if y1 > y2:
+            y1, y2 = y2, y1
+        # Clamp to the indexed extent so huge zoomed-out viewports do not walk empty cells.
+        x1, y1 = max(x1, self.bounds[0]), max(y1, self.bounds[1])
+        x2, y2 = min(x2, self.bounds[2]), min(y2, self.bounds[3])
+        if x1 > x2 or y1 > y2:
+            return []
+
+        cx1, cy1 = self._cell(x1, y1)
+        cx2, cy2 = self._cell(x2, y2)
+        matches: list[str] = []
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                for node_id in self._cells.get((cx, cy), ()):
+                    x, y = self.positions[node_id]
+                    if x1 <= x <= x2 and y1 <= y <= y2:
+                        matches.append(node_id)
+        return matches
+
+
+class ViewportSource:
+    """Serve the Cytoscape elements that fall inside a viewport, with a degree-based LOD cut."""
+
+    def __init__(
+        self,
+        elements: list[dict[str, dict[str, Any]]],
+        positions: dict[str, tuple[float, float]],
+        *,
+        max_nodes: int = DEFAULT_MAX_VIEWPORT_NODES,
+        lod_zoom: float = DEFAULT_LOD_ZOOM,
+    ) -> None:
+        self.max_nodes = max_nodes
+        self.lod_zoom = lod_zoom
+        self._nodes: dict[str, dict[str, Any]] = {}
+        self._edges_by_node: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.degree: dict[str, int] = defaultdict(int)
+
+        for element in elements:
+            data = element['data']
+            if 'source' in data:
+                source, target = str(data['source']), str(data['target'])
+                self._edges_by_node[source].append(element)
+                self._edges_by_node[target].append(element)
+                self.degree[source] += 1
+                self.degree[target] += 1
+            else:
+                self._nodes[str(data['id'])] = element
+
+        self.index = GridIndex({node_id: positions[node_id] for node_id in self._nodes if node_id in positions})
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """Return the model-space bounding box of all indexed nodes."""
+        return self.index.bounds
+
+    def visible_node_ids(self, x1: float, y1: float, x2: float, y2: float, zoom: float) -> list[str]:
+        """Return ids inside the viewport, keeping only the highest-degree nodes when zoomed out."""
+        node_ids = self.index.query(x1, y1, x2, y2)
+        if zoom >= self.lod_zoom and len(node_ids) <= self.max_nodes:
+            return node_ids
+        limit = self.max_nodes if zoom >= self.lod_zoom else max(1, int(self.max_nodes * zoom / self.lod_zoom))
+        if len(node_ids) <= limit:
+            return node_ids
+        return heapq.nsmallest(limit, node_ids, key=lambda node_id: (-self.degree.get(node_id, 0), node_id))
+
+    def query(self, x1: float, y1: float, x2: float, y2: float, zoom: float) -> list[dict[str, Any]]:
+        """Return positioned node elements plus edges whose endpoints are both visible."""
+        visible = self.visible_node_ids(x1, y1, x2, y2, zoom)
+        visible_set = set(visible)
+        elements: list[dict[str, Any]] = []
+        for node_id in visible:
+            x, y = self.index.positions[node_id]
+            elements.append({**self._nodes[node_id], 'position': {'x': x, 'y': y}})
+
+        seen_edges: set[str] = set()
+        for node_id in visible:
+            for edge in self._edges_by_node.get(node_id, ()):
+                edge_id = edge['data']['id']
+                if edge_id in seen_edges:
+                    continue
+                if str(edge['data']['source']) in visible_set and str(edge['data']['target']) in visible_set:
+                    seen_edges.add(edge_id)
+                    elements.append(edge)
+        return elements
@@ -0,0 +1,170 @@
+"""Sliding time windows over edge dates, maintained incrementally as the window moves."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.adjacency import AdjacencyIndex
+from app.range_index import date_key
+
+DEFAULT_WINDOW_DAYS = 30
+
+
+def day_number(value: Any) -> int | None:
+    """Return a date cell as days since 1970-01-01, or None when missing or invalid."""
+    key = date_key(value)
+    return None if key is None else int(np.datetime64(key, 'D').astype(np.int64))
+
+
+def date_array(values: list[Any]) -> np.ndarray:
+    """Return date cells as ``datetime64[D]``, with NaT for missing or invalid values."""
+    keys = [date_key(value) or 'NaT' for value in values]
+    return np.asarray(keys, dtype='datetime64[D]')
+
+
+def day_label(day: int) -> str:
+    """Return the YYYY-MM-DD text for a day number."""
+    return str(np.datetime64(int(day), 'D'))
+
+
+@dataclass(frozen=True)
+class WindowStats:
+    """Counts and simple metrics for the edges dated inside one window."""
+
+    start: str | None
+    end: str | None
+    node_count: int
+    edge_count: int
+    relationship_counts: dict[str, int]
+
+    @property
+    def average_degree(self) -> float:
+        return 2 * self.edge_count / self.node_count if self.node_count else 0.0
+
+    @property
+    def density(self) -> float:
+        if self.node_count < 2:
+            return 0.0
+        return 2 * self.edge_count / (self.node_count * (self.node_count - 1))
+
+
+class TemporalIndex:
+    """Edges sorted once by date plus the live state of one inclusive day window.
+
+    Moving the window finds its new bounds with two binary searches and only applies
+    the edges that enter or leave, so scrubbing a timeline never rebuilds the graph.
+    Undated edges and edges with unknown endpoints never appear in a window.
+    """
+
+    def __init__(self, adjacency: AdjacencyIndex, edge_dates: np.ndarray) -> None:
+        self.adjacency = adjacency
+        dated = ~np.isnat(edge_dates) & (adjacency.edge_sources >= 0) & (adjacency.edge_targets >= 0)
+        positions = np.flatnonzero(dated)
+        days = edge_dates[positions].astype(np.int64)
+        order = np.argsort(days, kind='stable')
+        self.sorted_days = days[order]
+        self.sorted_edges = positions[order]
+        self._sources = adjacency.edge_sources[self.sorted_edges]
+        self._targets = adjacency.edge_targets[self.sorted_edges]
+        self._relationships = adjacency.edge_relationship_codes[self.sorted_edges]
+
+        self._low = 0
+        self._high = 0
+        self._window: tuple[int | None, int | None] = (None, None)
+        self._degree = np.zeros(adjacency.node_count, dtype=np.int64)
+        self._active_edges = np.zeros(adjacency.edge_count, dtype=bool)
+        self._relationship_counts = np.zeros(len(adjacency.relationship_types), dtype=np.int64)
+        self._active_nodes = 0
+
+    @classmethod
+    def from_frames(
+        cls,
+        nodes_df: pd.DataFrame,
+        edges_df: pd.DataFrame,
+        adjacency: AdjacencyIndex | None = None,
+    ) -> TemporalIndex:
+        """Build the index, reusing a prebuilt adjacency index when given."""
+        values = edges_df['date'].tolist() if 'date' in edges_df.columns else [None] * len(edges_df)
+        return cls(
+            adjacency if adjacency is not None else AdjacencyIndex.from_frames(nodes_df, edges_df),
+            date_array(values),
+        )
+
+    @property
+    def dated_count(self) -> int:
+        return len(self.sorted_days)
+
+    def bounds(self) -> tuple[int, int] | None:
+        """Return the first and last edge day, or None when no edge is dated."""
+        if not self.dated_count:
+            return None
+        return int(self.sorted_days[0]), int(self.sorted_days[-1])
+
+    def _apply(self, start: int, stop: int, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) the sorted edges in [start, stop)."""
+        if start >= stop:
+            return
+        endpoints = np.concatenate([self._sources[start:stop], self._targets[start:stop]])
+        touched, counts = np.unique(endpoints, return_counts=True)
+        was_active = int((self._degree[touched] > 0).sum())
+        self._degree[touched] += sign * counts
+        self._active_nodes += int((self._degree[touched] > 0).sum()) - was_active
+        self._active_edges[self.sorted_edges[start:stop]] = sign > 0
+        relationships, relationship_counts = np.unique(self._relationships[start:stop], return_counts=True)
+        self._relationship_counts[relationships] += sign * relationship_counts
+
+    def move_to(self, start_day: int | None, end_day: int | None) -> WindowStats:
+        """Slide the window to [start_day, end_day] (None leaves that side open) and return its stats."""
+        low = 0 if start_day is None else int(np.searchsorted(self.sorted_days, start_day, side='left'))
+        high = self.dated_count if end_day is None else int(np.searchsorted(self.sorted_days, end_day, side='right'))
+        high = max(high, low)
+        old_low, old_high = self._low, self._high
+        # Leave first so degrees never count an edge twice, then enter.
+        self._apply(old_low, min(old_high, low), -1)
+        self._apply(max(old_low, high), old_high, -1)
+        self._apply(low, min(high, old_low), 1)
+        self._apply(max(low, old_high), high, 1)
+        self._low, self._high = low, high
+        self._window = (start_day, end_day)
+        return self.stats()
+
+    def stats(self) -> WindowStats:
+        """Return the counts for the current window."""
+        start, end = self._window
+        return WindowStats(
+            start=None if start is None else day_label(start),
+            end=None if end is None else day_label(end),
+            node_count=self._active_nodes,
+            edge_count=self._high - self._low,
+            relationship_counts={
+                self.adjacency.relationship_types[code]: int(count)
+                for code, count in enumerate(self._relationship_counts)
+                if count
+            },
+        )
+
+    def edge_mask(self) -> np.ndarray:
+        """Return a per-edge-row mask of the edges inside the window."""
+        return self._active_edges.copy()
+
+    def node_mask(self) -> np.ndarray:
+        """Return a per-node-row mask of the nodes touched by edges inside the window."""
+        return self._degree > 0
+
+    def snapshots(
+        self,
+        start_day: int,
+        end_day: int,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        step_days: int = 1,
+    ) -> Iterator[WindowStats]:
+        """Yield stats for windows of window_days starting every step_days from start_day to end_day."""
+        if window_days < 1 or step_days < 1:
+            raise ValueError('window_days and step_days must be positive')
+        for day in range(int(start_day), int(end_day) + 1, int(step_days)):
+            yield self.move_to(day, day + window_days - 1)
@@ -0,0 +1,211 @@
+"""Trigram index for fast substring search over node text columns."""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from typing import Any
+
+import pandas as pd
+
+NGRAM_SIZE = 3
+DEFAULT_TEXT_COLUMNS = ('label',)
+DEFAULT_FUZZY_LIMIT = 50
+DEFAULT_FUZZY_THRESHOLD = 0.8
+FUZZY_SHORTLIST_FACTOR = 8
+
+
+def normalize_text(value: Any) -> str:
+    """Return lowercase text for indexing, treating missing values as empty."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    return str(value).lower()
+
+
+def ngrams(text: str, size: int = NGRAM_SIZE) -> set[str]:
+    """Return the distinct character n-grams of text."""
+    return {text[start:start + size] for start in range(len(text) - size + 1)}
+
+
+def _match_quality(text: str, query: str) -> int | None:
+    """Rank how query matches text: exact, prefix, word prefix, then plain substring."""
+    position = text.find(query)
+    if position < 0:
+        return None
+    if text == query:
+        return 0
+    if position == 0:
+        return 1
+    if not text[position - 1].isalnum():
+        return 2
+    return 3
+
+
+def jaro_winkler(left: str, right: str, prefix_scale: float = 0.1) -> float:
+    """Return the Jaro-Winkler similarity of two strings in [0, 1]."""
+    if left == right:
+        return 1.0
+    if not left or not right:
+        return 0.0
+    window = max(max(len(left), len(right)) // 2 - 1, 0)
+    left_matched = [False] * len(left)
+    right_matched = [False] * len(right)
+    matches = 0
+    for i, char in enumerate(left):
+        stop = min(len(right), i + window + 1)
+        j = right.find(char, max(0, i - window), stop)
+        while j != -1 and right_matched[j]:
+            j = right.find(char, j + 1, stop)
+        if j != -1:
+            left_matched[i] = right_matched[j] = True
+            matches += 1
+    if matches == 0:
+        return 0.0
+    left_chars = [char for char, matched in zip(left, left_matched) if matched]
+    right_chars = [char for char, matched in zip(right, right_matched) if matched]
+    transpositions = sum(a != b for a, b in zip(left_chars, right_chars)) / 2
+    jaro = (matches / len(left) + matches / len(right) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for a, b in zip(left[:4], right[:4]):
+        if a != b:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def _fuzzy_score(text: str, query: str) -> float:
+    """Score query against the whole text, its sorted words, and every run of as many words as the query has."""
+    words = text.split()
+    query_words = query.split()
+    best = max(jaro_winkler(text, query), jaro_winkler(' '.join(sorted(words)), ' '.join(sorted(query_words))))
+    width = max(len(query_words), 1)
+    for start in range(max(len(words) - width + 1, 0)):
+        best = max(best, jaro_winkler(' '.join(words[start:start + width]), query))
+    return best
+
+
+class TrigramIndex:
+    """Inverted trigram index mapping node ids to lowercase text of selected columns."""
+
+    def __init__(self, columns: tuple[str, ...] = DEFAULT_TEXT_COLUMNS) -> None:
+        self.columns = columns
+        self._texts: dict[str, tuple[str, ...]] = {}
+        self._postings: dict[str, set[str]] = defaultdict(set)
+
+    @classmethod
+    def from_nodes(cls, nodes_df: pd.DataFrame, columns: tuple[str, ...] = DEFAULT_TEXT_COLUMNS) -> TrigramIndex:
+        """Build an index over the given node columns, skipping columns that are absent."""
+        index = cls(columns)
+        present = [column for column in columns if column in nodes_df.columns]
+        node_ids = nodes_df['id'].astype(str).tolist()
+        column_values = [nodes_df[column].tolist() for column in present]
+        for position, node_id in enumerate(node_ids):
+            index.add(node_id, {column: values[position] for column, values in zip(present, column_values)})
+        return index
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, node_id: object) -> bool:
+        return str(node_id) in self._texts
+
+    def add(self, node_id: Any, row: dict[str, Any]) -> None:
+        """Index the configured columns of row under node_id, replacing any previous entry."""
+        key = str(node_id)
+        if key in self._texts:
+            self.remove(key)
+        texts = tuple(normalize_text(row.get(column)) for column in self.columns)
+        self._texts[key] = texts
+        for gram in set().union(*(ngrams(text) for text in texts)):
+            self._postings[gram].add(key)
+
+    def remove(self, node_id: Any) -> None:
+        """Drop node_id from the index if present."""
+        key = str(node_id)
+        texts = self._texts.pop(key, None)
+        if texts is None:
+            return
+        for gram in set().union(*(ngrams(text) for text in texts)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(key)
+            if not posting:
+                del self._postings[gram]
+
+    def update(self, old_node_id: Any, new_node_id: Any, row: dict[str, Any]) -> None:
+        """Re-index an edited node, handling id renames."""
+        self.remove(old_node_id)
+        self.add(new_node_id, row)
+
+    def _candidates(self, query: str) -> set[str] | list[str]:
+        grams = ngrams(query)
+        if not grams:
+            # Queries shorter than one n-gram fall back to the cached lowercase texts.
+            return list(self._texts)
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return candidates
+
+    def estimate(self, query: str) -> int:
+        """Return an upper bound on search matches: the shortest posting list of the query."""
+        grams = ngrams(normalize_text(query).strip())
+        if not grams:
+            return len(self._texts)
+        return min(len(self._postings.get(gram, ())) for gram in grams)
+
+    def search(self, query: str, limit: int | None = None) -> list[str]:
+        """Return ids whose indexed text contains query, best matches first."""
+        normalized = normalize_text(query).strip()
+        if not normalized:
+            return []
+
+        ranked: list[tuple[int, int, int, str]] = []
+        for node_id in self._candidates(normalized):
+            best: tuple[int, int, int] | None = None
+            for column_rank, text in enumerate(self._texts[node_id]):
+                quality = _match_quality(text, normalized)
+                if quality is None:
+                    continue
+                candidate = (column_rank, quality, len(text))
+                if best is None or candidate < best:
+                    best = candidate
+            if best is not None:
+                ranked.append((*best, node_id))
+
+        ranked.sort()
+        matches = [node_id for *_, node_id in ranked]
+        return matches if limit is None else matches[:limit]
+
+    def fuzzy_search(
+        self,
+        query: str,
+        limit: int = DEFAULT_FUZZY_LIMIT,
+        threshold: float = DEFAULT_FUZZY_THRESHOLD,
+    ) -> list[str]:
+        """Return up to limit ids whose text is similar to query, most similar first.
+
+        Trigram postings block candidates: only ids sharing at least one query trigram
+        are counted, and only the ids sharing the most trigrams are scored with
+        Jaro-Winkler. Queries shorter than one trigram fall back to substring search.
+        """
+        normalized = normalize_text(query).strip()
+        grams = ngrams(normalized)
+        if not grams:
+            return self.search(normalized, limit)
+
+        shared: Counter[str] = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        shortlist = shared.most_common(max(limit, 1) * FUZZY_SHORTLIST_FACTOR)
+
+        scored: list[tuple[float, int, str]] = []
+        for node_id, _ in shortlist:
+            score = max(_fuzzy_score(text, normalized) for text in self._texts[node_id])
+            if score >= threshold:
+                scored.append((-score, len(self._texts[node_id][0]), node_id))
+        scored.sort()
+        return [node_id for *_, node_id in scored[:limit]]
@@ -10,8 +10,7 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from app.export import export_csv, export_gexf, export_summary
-from app.graph_build import build_networkx_graph
+from app.export import export_csv, export_gexf_frames, export_summary
 from app.io_excel import load_workbook
 from app.sample_data import create_sample_workbook
 from app.validate import validate_data
@@ -38,8 +37,7 @@ def run_smoke_check(base_dir: Path | None = None) -> dict[str, Path]:
 
     nodes_csv, edges_csv = export_csv(nodes_df, edges_df, out_dir=str(exports_dir))
 
-    graph = build_networkx_graph(nodes_df, edges_df)
-    gexf_path = export_gexf(graph, out_path=str(exports_dir / "graph.gexf"))
+    gexf_path = export_gexf_frames(nodes_df, edges_df, out_path=str(exports_dir / "graph.gexf"))
     summary_path = export_summary(nodes_df, edges_df, out_path=str(exports_dir / "EXPORT_SUMMARY.md"))
 
     paths = {
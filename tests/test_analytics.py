@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("pandas")
+nx = pytest.importorskip("networkx")
+import numpy as np
+import pandas as pd
+
+from app import analytics
+from app.adjacency import AdjacencyIndex
+from app.analytics import CentralityCache, compute_centrality, graph_fingerprint, node_sizes, sampled_betweenness
+
+
+def _karate_frames() -> tuple[pd.DataFrame, pd.DataFrame, "nx.Graph"]:
+    graph = nx.karate_club_graph()
+    nodes_df = pd.DataFrame({"id": [str(node) for node in graph]})
+    edges_df = pd.DataFrame(
+        {
+            "source": [str(u) for u, _ in graph.edges()],
+            "target": [str(v) for _, v in graph.edges()],
+            "relationship_type": "KNOWS",
+            "confidence": [weight / 7 for *_, weight in graph.edges(data="weight")],
+        }
+    )
+    weighted = nx.Graph()
+    weighted.add_nodes_from(graph)
+    for (u, v), confidence in zip(graph.edges(), edges_df["confidence"]):
+        weighted.add_edge(u, v, weight=confidence)
+    return nodes_df, edges_df, weighted
+
+
+def test_compute_centrality_matches_networkx() -> None:
+    nodes_df, edges_df, graph = _karate_frames()
+    scores = compute_centrality(nodes_df, edges_df, workers=1)
+    order = list(graph)
+
+    degree = np.array([graph.degree(node) for node in order])
+    weighted_degree = np.array([graph.degree(node, weight="weight") for node in order])
+    eigenvector = nx.eigenvector_centrality(graph, weight="weight", max_iter=1000, tol=1e-10)
+    betweenness = nx.betweenness_centrality(graph)
+
+    assert scores.metrics["degree"] == pytest.approx(degree)
+    assert scores.metrics["weighted_degree"] == pytest.approx(weighted_degree)
+    assert scores.metrics["eigenvector"] == pytest.approx([eigenvector[node] for node in order], abs=1e-6)
+    assert scores.metrics["betweenness"] == pytest.approx([betweenness[node] for node in order], abs=1e-12)
+    assert scores.metrics["pagerank"].sum() == pytest.approx(1.0)
+    assert int(np.argmax(scores.metrics["pagerank"])) in (0, 33)
+
+
+def test_sampled_betweenness_is_parallel_safe_and_approximate(monkeypatch: pytest.MonkeyPatch) -> None:
+    nodes_df, edges_df, graph = _karate_frames()
+    adjacency = AdjacencyIndex.from_frames(nodes_df, edges_df)
+
+    serial = sampled_betweenness(adjacency, samples=12, workers=1)
+    monkeypatch.setattr(analytics, "PARALLEL_MIN_NODES", 0)
+    parallel = sampled_betweenness(adjacency, samples=12, workers=2)
+    exact = np.array(list(nx.betweenness_centrality(graph).values()))
+
+    assert parallel == pytest.approx(serial)
+    assert np.corrcoef(serial, exact)[0, 1] > 0.9
+
+
+def test_centrality_cache_reuses_scores_by_fingerprint() -> None:
+    nodes_df, edges_df, _ = _karate_frames()
+    cache = CentralityCache(max_entries=1)
+
+    first = cache.scores(nodes_df, edges_df, workers=1)
+    assert cache.scores(nodes_df.copy(), edges_df.copy(), workers=1) is first
+
+    changed = edges_df.copy()
+    changed.loc[0, "confidence"] = 0.1
+    assert graph_fingerprint(nodes_df, changed) != first.fingerprint
+    assert cache.scores(nodes_df, changed, workers=1) is not first
+    assert len(cache) == 1
+
+    cache.put(first)
+    assert cache.get(first.fingerprint) is first and len(cache) == 1
+
+
+def test_node_sizes_scale_into_range_and_inspector_lookup() -> None:
+    nodes_df, edges_df, _ = _karate_frames()
+    scores = compute_centrality(nodes_df, edges_df, workers=1)
+
+    sizes = node_sizes(scores, "degree", min_size=10, max_size=50)
+    assert min(sizes.values()) == 10
+    assert max(sizes.values()) == 50
+    assert sizes["33"] == 50
+    assert scores.for_node(33)["degree"] == 17
+    assert scores.for_node("missing") == {}
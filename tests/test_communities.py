@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+
+pytest.importorskip("pandas")
+nx = pytest.importorskip("networkx")
+import pandas as pd
+
+from app.communities import detect_communities
+from app.graph_build import build_networkx_graph
+
+
+def _frames(graph: "nx.Graph") -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {
+            "id": [str(node) for node in graph],
+            "label": [f"Node {node}" for node in graph],
+            "type": "Person",
+            "description": "",
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            "source": [str(u) for u, _ in graph.edges()],
+            "target": [str(v) for _, v in graph.edges()],
+            "relationship_type": "KNOWS",
+            "description": "",
+        }
+    )
+    return nodes_df, edges_df
+
+
+def _groups(partition) -> list[set[int]]:
+    return [
+        {int(node_id) for node_id, label in zip(partition.node_ids, partition.labels) if label == community}
+        for community in range(partition.community_count)
+    ]
+
+
+def test_detect_communities_recovers_planted_partition() -> None:
+    graph = nx.planted_partition_graph(4, 25, 0.5, 0.01, seed=3)
+    nodes_df, edges_df = _frames(graph)
+
+    partition = detect_communities(nodes_df, edges_df)
+
+    assert partition.community_count == 4
+    assert sorted(partition.sizes().values()) == [25, 25, 25, 25]
+    assert {frozenset(group) for group in _groups(partition)} == {
+        frozenset(range(start, start + 25)) for start in range(0, 100, 25)
+    }
+    assert partition.modularity == pytest.approx(nx.community.modularity(graph, _groups(partition), weight=None))
+
+
+def test_detect_communities_matches_networkx_modularity_on_karate_club() -> None:
+    graph = nx.karate_club_graph()
+    nodes_df, edges_df = _frames(graph)
+
+    partition = detect_communities(nodes_df, edges_df)
+
+    assert partition.modularity == pytest.approx(nx.community.modularity(graph, _groups(partition), weight=None))
+    assert partition.modularity > 0.4
+
+
+def test_warm_restart_only_revisits_changed_neighbourhoods() -> None:
+    graph = nx.planted_partition_graph(4, 25, 0.5, 0.01, seed=3)
+    nodes_df, edges_df = _frames(graph)
+    previous = detect_communities(nodes_df, edges_df)
+
+    unchanged = detect_communities(nodes_df, edges_df, previous=previous)
+    assert unchanged.moved_nodes == 0
+    assert unchanged.labels.tolist() == previous.labels.tolist()
+
+    added = pd.DataFrame([{"source": "0", "target": "99", "relationship_type": "KNOWS", "description": ""}])
+    nodes_with_new = pd.concat(
+        [nodes_df, pd.DataFrame([{"id": "new", "label": "New", "type": "Person", "description": ""}])],
+        ignore_index=True,
+    )
+    edges_with_new = pd.concat(
+        [edges_df, added, pd.DataFrame([{"source": "new", "target": "5", "relationship_type": "KNOWS", "description": ""}])],
+        ignore_index=True,
+    )
+    warm = detect_communities(nodes_with_new, edges_with_new, previous=previous)
+    cold = detect_communities(nodes_with_new, edges_with_new)
+
+    # The UI ships the previous partition to a worker process, so it must survive pickling.
+    shipped = detect_communities(nodes_with_new, edges_with_new, previous=pickle.loads(pickle.dumps(previous)))
+    assert shipped.labels.tolist() == warm.labels.tolist()
+    assert warm.moved_nodes < cold.moved_nodes
+    assert warm.community_of("new") == warm.community_of("5")
+    assert warm.modularity == pytest.approx(cold.modularity, abs=0.02)
+
+
+def test_community_labels_reach_networkx_graph() -> None:
+    graph = nx.planted_partition_graph(2, 10, 0.8, 0.0, seed=1)
+    nodes_df, edges_df = _frames(graph)
+    partition = detect_communities(nodes_df, edges_df)
+
+    exported = build_networkx_graph(nodes_df, edges_df, partition.membership)
+
+    assert exported.nodes["0"]["community"] == partition.community_of("0")
+    assert {data["community"] for _, data in exported.nodes(data=True)} == {0, 1}
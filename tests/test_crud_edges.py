@@ -3,7 +3,7 @@ import pytest
 pytest.importorskip("pandas")
 import pandas as pd
 
-from app.crud_edges import can_add_or_edit_edge
+from app.crud_edges import can_add_or_edit_edge, diff_edge_frames
 
 
 def test_can_add_or_edit_edge_requires_source_target_and_relationship_type() -> None:
@@ -36,3 +36,31 @@ def test_can_add_or_edit_edge_accepts_valid_edge() -> None:
     nodes_df = pd.DataFrame({'id': ['N1', 'N2']})
 
     assert can_add_or_edit_edge(nodes_df, 'N1', 'N2', 'knows') == (True, '')
+
+
+def test_diff_edge_frames_reports_removed_changed_and_appended_rows() -> None:
+    old_edges = pd.DataFrame(
+        {
+            'source': ['N1', 'N1', 'N2'],
+            'target': ['N2', 'N3', 'N3'],
+            'relationship_type': ['knows', 'visited', 'visited'],
+        }
+    )
+    new_edges = old_edges.drop(index=0)
+    new_edges.at[2, 'relationship_type'] = 'funds'
+    new_edges.loc[3] = {'source': 'N3', 'target': 'N1', 'relationship_type': 'knows'}
+
+    changes = diff_edge_frames(old_edges, new_edges)
+
+    assert changes.removed_positions == [0]
+    assert changes.changed_positions == [1]
+    assert changes.added_positions == [2]
+    assert changes.appended is True
+
+
+def test_diff_edge_frames_flags_reordered_frames_for_rebuild() -> None:
+    old_edges = pd.DataFrame({'source': ['N1', 'N2'], 'target': ['N2', 'N3'], 'relationship_type': ['a', 'b']})
+
+    changes = diff_edge_frames(old_edges, old_edges.iloc[::-1])
+
+    assert changes.appended is False
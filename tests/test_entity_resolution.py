@@ -0,0 +1,111 @@
+import pytest
+
+pytest.importorskip("pandas")
+import pandas as pd
+
+import app.entity_resolution as entity_resolution
+from app.adjacency import AdjacencyIndex
+from app.entity_resolution import candidate_pairs, find_duplicates, merge_nodes, name_tokens, node_keys
+
+
+def _frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {
+            "id": ["p_john_kelly", "p_jon_kelly", "p_kelly_j", "g_kelly", "p_maria", "pl_port"],
+            "label": ["John Kelly", "Jon Kelly", "Kelly, John", "Kelly Gang", "María Núñez", "Port"],
+            "type": ["Person", "Person", "Person", "Group", "Person", "Place"],
+            "description": ["Analyst A entry", "", "", "", "", ""],
+            "date": ["", "2021-05-01", "", "", "", ""],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            "source": ["p_john_kelly", "p_jon_kelly", "p_john_kelly", "p_jon_kelly", "p_maria"],
+            "target": ["pl_port", "pl_port", "g_kelly", "p_john_kelly", "pl_port"],
+            "relationship_type": ["visited", "visited", "member_of", "knows", "visited"],
+            "description": "",
+        }
+    )
+    return nodes_df, edges_df
+
+
+def test_name_tokens_fold_case_accents_and_punctuation() -> None:
+    assert name_tokens("María  Núñez-Ortiz") == ["maria", "nunez", "ortiz"]
+    assert name_tokens(None) == []
+
+
+def test_find_duplicates_ranks_same_type_lookalikes() -> None:
+    nodes_df, edges_df = _frames()
+
+    suggestions = find_duplicates(nodes_df, edges_df, threshold=0.8, workers=1)
+    pairs = [{suggestion.keep_id, suggestion.merge_id} for suggestion in suggestions]
+
+    assert {"p_john_kelly", "p_jon_kelly"} in pairs
+    assert {"p_john_kelly", "p_kelly_j"} in pairs
+    assert all("g_kelly" not in pair and "p_maria" not in pair for pair in pairs)
+    assert [suggestion.score for suggestion in suggestions] == sorted(
+        (suggestion.score for suggestion in suggestions), reverse=True
+    )
+    top = next(s for s in suggestions if {s.keep_id, s.merge_id} == {"p_john_kelly", "p_jon_kelly"})
+    assert top.keep_id == "p_john_kelly"
+    assert top.neighbour_score == 0.5
+
+
+def test_blocking_avoids_all_pairs() -> None:
+    count = 2000
+    nodes_df = pd.DataFrame(
+        {
+            "id": [f"n{position}" for position in range(count)],
+            "label": [f"Person {position:05d} Surname{position % 50}x{position}" for position in range(count)],
+            "type": "Person",
+            "description": "",
+        }
+    )
+    edges_df = pd.DataFrame(columns=["source", "target", "relationship_type", "description"])
+    adjacency = AdjacencyIndex.from_frames(nodes_df, edges_df)
+    keys = [node_keys(label, node_id) for label, node_id in zip(nodes_df["label"], nodes_df["id"])]
+
+    pairs = candidate_pairs(nodes_df["type"].tolist(), keys, adjacency)
+
+    assert len(pairs) < count * (count - 1) // 2 // 20
+
+
+def test_process_pool_scoring_matches_serial(monkeypatch: pytest.MonkeyPatch) -> None:
+    nodes_df, edges_df = _frames()
+    serial = find_duplicates(nodes_df, edges_df, threshold=0.7, workers=1)
+    monkeypatch.setattr(entity_resolution, "PARALLEL_MIN_PAIRS", 0)
+
+    assert find_duplicates(nodes_df, edges_df, threshold=0.7, workers=2) == serial
+
+
+def test_merge_nodes_rewires_edges_and_fills_blanks() -> None:
+    nodes_df, edges_df = _frames()
+
+    merged_nodes, merged_edges = merge_nodes(nodes_df, edges_df, "p_john_kelly", "p_jon_kelly")
+
+    assert "p_jon_kelly" not in set(merged_nodes["id"])
+    kept = merged_nodes.set_index("id").loc["p_john_kelly"]
+    assert (kept["description"], kept["date"]) == ("Analyst A entry", "2021-05-01")
+    assert "p_jon_kelly" not in set(merged_edges["source"]) | set(merged_edges["target"])
+    assert len(merged_edges) == len(edges_df) - 1
+    assert (merged_edges["source"] != merged_edges["target"]).all()
+    with pytest.raises(ValueError, match="Unknown node id"):
+        merge_nodes(nodes_df, edges_df, "p_john_kelly", "missing")
+    with pytest.raises(ValueError):
+        merge_nodes(nodes_df, edges_df, "p_maria", "p_maria")
+
+
+def test_merged_edges_can_be_appended_without_overwriting_rows() -> None:
+    nodes_df, edges_df = _frames()
+    _, merged_edges = merge_nodes(nodes_df, edges_df, 'p_john_kelly', 'p_jon_kelly')
+
+    merged_edges.loc[len(merged_edges)] = ['p_maria', 'g_kelly', 'knows', '']
+
+    assert list(merged_edges.index) == list(range(len(edges_df)))
+    assert set(zip(merged_edges['source'], merged_edges['relationship_type'])) >= {
+        ('p_john_kelly', 'visited'),
+        ('p_john_kelly', 'member_of'),
+        ('p_maria', 'visited'),
+        ('p_maria', 'knows'),
+    }
+    assert (merged_edges['relationship_type'] == 'visited').sum() == 3
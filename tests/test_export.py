@@ -1,3 +1,6 @@
+import hashlib
+import importlib.util
+import json
 from pathlib import Path
 
 import pytest
@@ -6,7 +9,7 @@ pytest.importorskip("pandas")
 import pandas as pd
 
 
-from app.export import export_csv, export_gexf
+from app.export import export_all, export_csv, export_gexf, export_gexf_frames
 from app.graph_build import build_networkx_graph
 from app.schema import REQUIRED_EDGE_COLS, REQUIRED_NODE_COLS
 
@@ -98,3 +101,254 @@ def test_export_gexf_writes_nonempty_file(tmp_path: Path) -> None:
     assert 'relationship_type' in content
     assert 'source_ref' in content
     assert 'confidence' in content
+
+
+def _read_gexf(path: Path) -> "tuple[dict, list]":
+    nx = pytest.importorskip("networkx")
+    graph = nx.MultiGraph(nx.read_gexf(path))
+    edges = sorted(
+        (tuple(sorted((source, target))), key, sorted((name, value) for name, value in data.items() if name != 'id'))
+        for source, target, key, data in graph.edges(keys=True, data=True)
+    )
+    return dict(graph.nodes(data=True)), edges
+
+
+def test_export_gexf_frames_matches_networkx_export(tmp_path: Path) -> None:
+    pytest.importorskip("networkx")
+    nodes_df = pd.DataFrame(
+        {
+            'id': ['N1', 'N2', 'N3 & <co>'],
+            'label': ['Node 1', 'Node "2"', 'Line\nbreak'],
+            'type': ['person', 'org', 'person'],
+            'description': ['', None, 'Known associate'],
+            'confidence': [0.7, 0.9, 1.0],
+            'verified': [True, False, True],
+            'risk_score': [3, 7, 1],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            'source': ['N1', 'N2', 'N1', 'N1', 'N4'],
+            'target': ['N2', 'N1', 'N3 & <co>', 'N2', 'N1'],
+            'relationship_type': ['linked', 'linked', 'funds', 'linked', 'knows'],
+            'description': ['', 'Seen together', None, '', ''],
+            'strength': [0.5, float('inf'), 1.0, 2.0, 3.0],
+        }
+    )
+    communities = {'N1': 0, 'N2': 1}
+
+    streamed = export_gexf_frames(nodes_df, edges_df, str(tmp_path / 'streamed.gexf'), communities=communities)
+    graph = build_networkx_graph(nodes_df, edges_df, communities)
+    reference = export_gexf(graph, str(tmp_path / 'reference.gexf'))
+
+    streamed_nodes, streamed_edges = _read_gexf(Path(streamed))
+    reference_nodes, reference_edges = _read_gexf(Path(reference))
+    assert streamed_nodes == reference_nodes
+    assert streamed_edges == reference_edges
+    assert streamed_nodes['N4'] == {'label': 'N4'}
+    assert [key for pair, key, _ in streamed_edges if pair == ('N1', 'N2')] == [0, 1, 2]
+
+
+def test_export_gexf_frames_types_mixed_columns_by_column(tmp_path: Path) -> None:
+    pytest.importorskip("networkx")
+    nodes_df = pd.DataFrame(
+        {
+            'id': ['N1', 'N2', 'N3'],
+            'label': ['Node 1', 'Node 2', 'Node 3'],
+            'type': ['person', 'org', 'person'],
+            'description': ['', '', ''],
+            'confidence': [0.8, '', 1],
+            'date': ['2024-01-01', 20240102, ''],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {'source': ['N1'], 'target': ['N2'], 'relationship_type': ['linked'], 'description': ['\x01ctrl']}
+    )
+    out_path = tmp_path / 'graph.gexf'
+
+    export_gexf_frames(nodes_df, edges_df, str(out_path))
+
+    content = out_path.read_text(encoding='utf-8')
+    assert 'title="confidence" type="double"' in content
+    assert 'title="date" type="string"' in content
+    nodes, edges = _read_gexf(out_path)
+    assert nodes['N1']['confidence'] == 0.8 and nodes['N3']['confidence'] == 1.0
+    assert 'confidence' not in nodes['N2']
+    assert nodes['N2']['date'] == '20240102'
+    assert dict(edges[0][2])['description'] == 'ctrl'
+
+
+def test_export_all_writes_every_artifact_and_a_checksum_manifest(tmp_path: Path) -> None:
+    nodes_df = pd.DataFrame(
+        {
+            'id': ['N2', 'N1'],
+            'label': ['Node 2', 'Node 1'],
+            'type': ['org', 'person'],
+            'description': ['', ''],
+            'confidence': [0.9, 0.7],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {'source': ['N2', 'N1'], 'target': ['N1', 'N2'], 'relationship_type': ['linked', 'funds'], 'description': ''}
+    )
+
+    paths = export_all(nodes_df, edges_df, out_dir=str(tmp_path / 'bundle'), communities={'N1': 0, 'N2': 0})
+
+    expected = {'nodes_csv', 'edges_csv', 'graph_gexf', 'summary_md', 'manifest'}
+    if importlib.util.find_spec('pyarrow') is not None:
+        expected |= {'nodes_parquet', 'edges_parquet'}
+    assert set(paths) == expected
+    single_nodes, single_edges = export_csv(nodes_df, edges_df, out_dir=str(tmp_path / 'single'))
+    assert Path(paths['nodes_csv']).read_bytes() == Path(single_nodes).read_bytes()
+    assert Path(paths['edges_csv']).read_bytes() == Path(single_edges).read_bytes()
+    manifest = json.loads(Path(paths['manifest']).read_text(encoding='utf-8'))
+    assert (manifest['node_count'], manifest['edge_count']) == (2, 2)
+    for name, artifact in manifest['artifacts'].items():
+        content = (tmp_path / 'bundle' / artifact['path']).read_bytes()
+        assert Path(paths[name]).name == artifact['path']
+        assert artifact['bytes'] == len(content)
+        assert artifact['sha256'] == hashlib.sha256(content).hexdigest()
+    assert 'title="community"' in Path(paths['graph_gexf']).read_text(encoding='utf-8')
+
+
+def test_export_all_process_pool_writes_the_same_artifacts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import app.export as export_module
+
+    nodes_df = pd.DataFrame(
+        {
+            'id': ['N2', 'N1', 'N3'],
+            'label': '',
+            'type': ['org', 'person', 'person'],
+            'description': '',
+            'confidence': [0.9, '', 1],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {'source': ['N2', 'N1'], 'target': ['N1', 'N3'], 'relationship_type': ['linked', 'funds'], 'description': ''}
+    )
+    serial = export_all(nodes_df, edges_df, out_dir=str(tmp_path / 'serial'), communities={'N1': 0}, max_workers=1)
+    monkeypatch.setattr(export_module, 'PARALLEL_EXPORT_MIN_ROWS', 0)
+    pooled = export_all(nodes_df, edges_df, out_dir=str(tmp_path / 'pooled'), communities={'N1': 0}, max_workers=2)
+
+    manifests = [json.loads(Path(paths['manifest']).read_text(encoding='utf-8')) for paths in (serial, pooled)]
+    checksums = [{name: artifact['sha256'] for name, artifact in manifest['artifacts'].items()} for manifest in manifests]
+    assert checksums[0] == checksums[1]
+
+    (tmp_path / 'broken' / 'graph.gexf').mkdir(parents=True)
+    with pytest.raises(RuntimeError, match='graph.gexf'):
+        export_all(nodes_df, edges_df, out_dir=str(tmp_path / 'broken'), max_workers=2)
+    assert (tmp_path / 'broken' / 'nodes.csv').exists()
+
+
+def test_export_all_rewrites_only_artifacts_whose_inputs_changed(tmp_path: Path) -> None:
+    nodes_df = pd.DataFrame(
+        {'id': ['N1', 'N2'], 'label': ['A', 'B'], 'type': ['person', 'org'], 'description': '', 'confidence': [0.5, '']}
+    )
+    edges_df = pd.DataFrame({'source': ['N1'], 'target': ['N2'], 'relationship_type': ['funds'], 'description': ''})
+    out_dir = tmp_path / 'bundle'
+
+    def rewritten() -> list[str]:
+        return json.loads((out_dir / 'EXPORT_MANIFEST.json').read_text(encoding='utf-8'))['rewritten']
+
+    first = export_all(nodes_df, edges_df, out_dir=str(out_dir))
+    assert set(rewritten()) == set(first) - {'manifest'}
+
+    export_all(nodes_df.copy(), edges_df.copy(), out_dir=str(out_dir))
+    assert rewritten() == []
+
+    changed_edges = edges_df.assign(relationship_type=['pays'])
+    export_all(nodes_df, changed_edges, out_dir=str(out_dir))
+    expected = {'edges_csv', 'graph_gexf', 'summary_md'}
+    if importlib.util.find_spec('pyarrow') is not None:
+        expected.add('edges_parquet')
+    assert set(rewritten()) == expected
+    assert 'pays' in Path(first['edges_csv']).read_text(encoding='utf-8')
+
+    export_all(nodes_df, changed_edges, out_dir=str(out_dir), communities={'N1': 1, 'N2': 1})
+    assert rewritten() == ['graph_gexf']
+
+    Path(first['nodes_csv']).write_text('tampered', encoding='utf-8')
+    export_all(nodes_df, changed_edges, out_dir=str(out_dir), communities={'N1': 1, 'N2': 1})
+    assert rewritten() == ['nodes_csv']
+    assert Path(first['nodes_csv']).read_text(encoding='utf-8').startswith('id,label')
+
+    export_all(nodes_df.assign(confidence=['0.5', '']), changed_edges, out_dir=str(out_dir))
+    assert 'nodes_csv' in rewritten()
+    export_all(nodes_df, changed_edges, out_dir=str(out_dir), force=True)
+    assert set(rewritten()) == set(first) - {'manifest'}
+
+
+def _compression_frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {'id': [f'N{i}' for i in range(50)], 'label': 'Person', 'type': 'person', 'description': 'same text'}
+    )
+    edges_df = pd.DataFrame(
+        {'source': nodes_df['id'], 'target': 'N0', 'relationship_type': 'knows', 'description': 'same text'}
+    )
+    return nodes_df, edges_df
+
+
+@pytest.mark.parametrize('compression,module', [('gzip', 'gzip'), ('xz', 'lzma'), ('zstd', 'zstandard')])
+def test_compressed_exports_round_trip_to_the_plain_bytes(tmp_path: Path, compression: str, module: str) -> None:
+    codec = pytest.importorskip(module)
+    nodes_df, edges_df = _compression_frames()
+    plain_nodes, plain_edges = export_csv(nodes_df, edges_df, out_dir=str(tmp_path / 'plain'))
+    plain_gexf = export_gexf_frames(nodes_df, edges_df, str(tmp_path / 'plain' / 'graph.gexf'))
+
+    packed = [
+        *export_csv(nodes_df, edges_df, out_dir=str(tmp_path / 'packed'), compression=compression),
+        export_gexf_frames(nodes_df, edges_df, str(tmp_path / 'packed' / 'graph.gexf.z'), compression=compression),
+        export_gexf(build_networkx_graph(nodes_df, edges_df), str(tmp_path / 'packed' / 'nx.gexf.z'), compression),
+    ]
+
+    if module == 'zstandard':
+        def decompress(data: bytes) -> bytes:
+            return codec.ZstdDecompressor().stream_reader(data).read()
+    else:
+        decompress = codec.decompress
+    assert packed[0].endswith('nodes.csv' + {'gzip': '.gz', 'xz': '.xz', 'zstd': '.zst'}[compression])
+    for plain, compressed in zip((plain_nodes, plain_edges, plain_gexf), packed):
+        assert decompress(Path(compressed).read_bytes()) == Path(plain).read_bytes()
+        assert Path(compressed).stat().st_size < Path(plain).stat().st_size
+    assert b'<gexf' in decompress(Path(packed[3]).read_bytes())
+    assert sorted(path.name for path in (tmp_path / 'packed').iterdir()) == sorted(Path(p).name for p in packed)
+
+
+def test_compression_options_are_validated(tmp_path: Path) -> None:
+    nodes_df, edges_df = _compression_frames()
+
+    with pytest.raises(ValueError, match='Unknown compression'):
+        export_csv(nodes_df, edges_df, out_dir=str(tmp_path), compression='bz2')
+    with pytest.raises(ValueError, match='between 0 and 9'):
+        export_gexf_frames(nodes_df, edges_df, str(tmp_path / 'g.gexf.gz'), compression='gzip', compression_level=12)
+    with pytest.raises(ValueError, match='needs a compression method'):
+        export_csv(nodes_df, edges_df, out_dir=str(tmp_path), compression_level=3)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_export_keeps_the_previous_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import app.export as export
+
+    nodes_df, edges_df = _compression_frames()
+    out_path = tmp_path / 'graph.gexf.gz'
+    out_path.write_bytes(b'previous')
+
+    def broken(*args, **kwargs) -> None:
+        raise OSError('disk full')
+
+    monkeypatch.setattr(export, 'write_gexf', broken)
+    with pytest.raises(RuntimeError, match='Failed to export GEXF'):
+        export_gexf_frames(nodes_df, edges_df, str(out_path), compression='gzip')
+
+    assert out_path.read_bytes() == b'previous'
+    assert [path.name for path in tmp_path.iterdir()] == ['graph.gexf.gz']
+
+
+def test_zstd_without_zstandard_reports_the_missing_package(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import sys
+
+    nodes_df, edges_df = _compression_frames()
+    monkeypatch.setitem(sys.modules, 'zstandard', None)
+
+    with pytest.raises(RuntimeError, match="optional 'zstandard' package"):
+        export_csv(nodes_df, edges_df, out_dir=str(tmp_path), compression='zstd')
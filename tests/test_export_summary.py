@@ -54,3 +54,10 @@ def test_export_summary_writes_markdown_with_counts_and_extras(tmp_path: Path) -
     assert '## Extra columns' in content
     assert 'Nodes extras: alias, confidence, date, source_ref' in content
     assert 'Edges extras: confidence, date, source_ref, weight' in content
+    assert '## Network structure' in content
+    assert 'Density: 0.666667 (2 connected node pairs)' in content
+    assert 'Degree (p0/p25/p50/p75/p90/p99/p100): 1/1/1/2/2/2/2' in content
+    assert 'Connected components: 1' in content
+    assert '- VISITED: 0/1 directed pairs reciprocated (0.0%)' in content
+    assert '| Node type | Rows | source_ref | date | confidence |' in content
+    assert '| Person | 1 | 1 (100.0%) | 1 (100.0%) | 1 (100.0%) |' in content
@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("pandas")
+import pandas as pd
+
+from app.facet_index import FacetIndex
+from app.filtering import apply_filters
+
+
+def test_facet_index_counts_and_masks() -> None:
+    facets = FacetIndex(["Person", "Place", "Person", "Group"])
+
+    assert facets.counts() == {"Group": 1, "Person": 2, "Place": 1}
+    assert facets.mask("Person").tolist() == [True, False, True, False]
+    assert facets.mask_any(["Place", "Group"]).tolist() == [False, True, False, True]
+    assert facets.mask("Missing").tolist() == [False, False, False, False]
+
+
+def test_facet_index_set_append_and_delete_keep_counts_live() -> None:
+    facets = FacetIndex(["Person", "Place", "Person"])
+
+    facets.set(1, "Person")
+    assert facets.counts() == {"Person": 3}
+
+    facets.append(["Group", "Person"])
+    assert len(facets) == 5
+    assert facets.counts() == {"Group": 1, "Person": 4}
+
+    facets.delete([0, 3])
+    assert len(facets) == 3
+    assert facets.mask("Person").tolist() == [True, True, True]
+    assert facets.counts() == {"Person": 3}
+
+
+def test_apply_filters_with_facets_matches_string_comparisons() -> None:
+    nodes_df = pd.DataFrame(
+        {
+            "id": ["N1", "N2", "N3"],
+            "label": ["Alice", "Bob", "Berlin"],
+            "type": ["Person", "Person", "Place"],
+            "description": ["", "", ""],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            "source": ["N1", "N1", "N2"],
+            "target": ["N2", "N3", "N3"],
+            "relationship_type": ["KNOWS", "VISITED", "VISITED"],
+            "description": ["", "", ""],
+        }
+    )
+    node_facets = FacetIndex.from_series(nodes_df["type"])
+    edge_facets = FacetIndex.from_series(edges_df["relationship_type"])
+
+    for filters in [("Person", "All", ""), ("All", "VISITED", "b"), ("Place", "KNOWS", "")]:
+        expected = apply_filters(nodes_df, edges_df, *filters)
+        actual = apply_filters(nodes_df, edges_df, *filters, node_facets=node_facets, edge_facets=edge_facets)
+        pd.testing.assert_frame_equal(expected[0], actual[0])
+        pd.testing.assert_frame_equal(expected[1], actual[1])
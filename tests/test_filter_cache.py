@@ -0,0 +1,83 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.filter_cache import FilteredView, FilterResultCache, filter_key
+
+
+def _view(tag: str) -> FilteredView:
+    return FilteredView(
+        node_positions=np.array([0]),
+        edge_positions=np.array([], dtype=int),
+        elements=[{"data": {"id": tag}}],
+        serialized_elements=f'[{{"data": {{"id": "{tag}"}}}}]',
+    )
+
+
+def test_filter_key_normalizes_defaults_and_search_case() -> None:
+    unbounded = ((None, None), (None, None), "Edges", False, "", None, (None, None), (0, 0, "degree"))
+    assert filter_key("", None, "  Kel ") == ("All", "All", "kel", (), 0, *unbounded)
+    assert filter_key(" Person ", "KNOWS", "", ego_seeds=("B", "A", "B"), ego_radius=2) == (
+        "Person",
+        "KNOWS",
+        "",
+        ("A", "B"),
+        2,
+        *unbounded,
+    )
+
+
+def test_filter_key_ignores_range_scope_without_bounds() -> None:
+    assert filter_key("All", "All", "", range_scope="Nodes") == filter_key("All", "All", "")
+    assert filter_key("All", "All", "", date_range=("2021-01-01", None), range_scope="Nodes")[-8:-5] == (
+        ("2021-01-01", None),
+        (None, None),
+        "Nodes",
+    )
+
+
+def test_filter_key_only_marks_fuzzy_when_searching() -> None:
+    assert filter_key("All", "All", "", fuzzy=True) == filter_key("All", "All", "")
+    assert filter_key("All", "All", "kely", fuzzy=True)[-5] is True
+
+
+def test_filter_key_collapses_query_whitespace() -> None:
+    assert filter_key("All", "All", "", query="  type:Person   rel:funds ")[-4] == "type:Person rel:funds"
+
+
+def test_filter_key_only_keeps_hub_metric_when_ranking_hubs() -> None:
+    assert filter_key("All", "All", "", hub_metric="pagerank") == filter_key("All", "All", "")
+    assert filter_key("All", "All", "", min_core=3, top_hubs=50, hub_metric="pagerank")[-1] == (3, 50, "pagerank")
+
+
+def test_cache_returns_hits_for_same_version_and_key() -> None:
+    cache = FilterResultCache()
+    view = _view("a")
+    cache.put(1, filter_key("Person", "All", ""), view)
+
+    assert cache.get(1, filter_key("Person", "All", "")) is view
+    assert cache.get(2, filter_key("Person", "All", "")) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used_entries() -> None:
+    cache = FilterResultCache(max_entries=2)
+    cache.put(1, ("a",), _view("a"))
+    cache.put(1, ("b",), _view("b"))
+    cache.get(1, ("a",))
+    cache.put(1, ("c",), _view("c"))
+
+    assert cache.get(1, ("b",)) is None
+    assert cache.get(1, ("a",)) is not None
+    assert len(cache) == 2
+
+
+def test_invalidate_drops_entries_from_other_versions() -> None:
+    cache = FilterResultCache()
+    cache.put(1, ("a",), _view("a"))
+    cache.put(2, ("a",), _view("a2"))
+
+    cache.invalidate(2)
+
+    assert len(cache) == 1
+    assert cache.get(2, ("a",)) is not None
@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip("pandas")
+import pandas as pd
+
+from app.facet_index import FacetIndex
+from app.filter_query import AnyOf, Predicate, compile_query, query_masks
+from app.range_index import build_range_indexes
+from app.text_index import TrigramIndex
+
+
+def _frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {
+            "id": ["A", "B", "C", "D"],
+            "label": ["Kelly Ortiz", "Bruno", "Kelvin", "Group X"],
+            "type": ["Person", "Person", "Person", "Group"],
+            "date": ["2021-01-01", "", "2022-05-05", ""],
+            "confidence": [0.9, "", 0.5, ""],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            "source": ["A", "B", "C", "A"],
+            "target": ["D", "D", "D", "B"],
+            "relationship_type": ["funds", "funds", "member_of", "knows"],
+            "date": ["2021-02-02", "2022-01-01", "2021-06-06", ""],
+            "confidence": [0.7, 0.5, 0.9, ""],
+        }
+    )
+    return nodes_df, edges_df
+
+
+def test_compile_query_splits_terms_by_frame_and_caches_plans() -> None:
+    plan = compile_query('type:Person AND rel:funds AND confidence>=0.6 AND label~"kel"')
+
+    assert plan.node_terms == (Predicate("node", "type", ":", "Person"), Predicate("node", "label", "~", "kel"))
+    assert plan.edge_terms == (
+        Predicate("edge", "relationship_type", ":", "funds"),
+        Predicate("edge", "confidence", ">=", "0.6"),
+    )
+    assert compile_query('type:Person AND rel:funds AND confidence>=0.6 AND label~"kel"') is plan
+
+
+def test_compile_query_handles_grouping_and_implicit_and() -> None:
+    plan = compile_query("(type:Person OR type:Group) node.date>=2022 NOT rel:knows")
+
+    assert isinstance(plan.node_terms[0], AnyOf)
+    assert plan.node_terms[1] == Predicate("node", "date", ">=", "2022")
+    assert len(plan.edge_terms) == 1
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["type:Person OR rel:funds", "type>3", "foo:1", "type:", "(type:Person", "confidence>=2", "date<soon"],
+)
+def test_compile_query_rejects_invalid_queries(text: str) -> None:
+    with pytest.raises(ValueError):
+        compile_query(text)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected_nodes", "expected_edges"),
+    [
+        ('type:person AND label~"kel"', [True, False, True, False], [False, False, False, False]),
+        ("(type:Person OR type:Group) rel:FUNDS", [True] * 4, [True, True, False, False]),
+        ("NOT type:Person", [False, False, False, True], [False] * 4),
+        ("date:2021", [True] * 4, [True, False, True, False]),
+        ("node.date>2021", [False, False, True, False], [False] * 4),
+        ("confidence<0.9 OR rel:knows", [True] * 4, [True, True, False, True]),
+        ("label:bruno", [False, True, False, False], [False] * 4),
+        ("rel!=funds source:c", [True] * 4, [False, False, True, False]),
+        ("", [True] * 4, [True] * 4),
+    ],
+)
+def test_query_masks_scan_and_indexed_paths_agree(text: str, expected_nodes: list[bool], expected_edges: list[bool]) -> None:
+    nodes_df, edges_df = _frames()
+    indexed = query_masks(
+        nodes_df,
+        edges_df,
+        text,
+        search_index=TrigramIndex.from_nodes(nodes_df),
+        node_facets=FacetIndex.from_series(nodes_df["type"]),
+        edge_facets=FacetIndex.from_series(edges_df["relationship_type"]),
+        node_ranges=build_range_indexes(nodes_df),
+        edge_ranges=build_range_indexes(edges_df),
+    )
+    scanned = query_masks(nodes_df, edges_df, text)
+
+    for node_mask, edge_mask in (indexed, scanned):
+        assert node_mask.tolist() == expected_nodes
+        assert edge_mask.tolist() == expected_edges
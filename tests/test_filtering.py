@@ -1,15 +1,26 @@
 import pytest
 
 pytest.importorskip('pandas')
+import numpy as np
 import pandas as pd
 
+from app.adjacency import AdjacencyIndex
 from app.filtering import (
     DEFAULT_NODE_TYPE_FILTER,
     DEFAULT_RELATIONSHIP_FILTER,
     DEFAULT_SEARCH_FILTER,
     apply_filters,
+    core_network_masks,
+    core_numbers,
+    core_threshold,
     default_filters,
+    ego_network_filter,
+    parse_date_bound,
+    parse_seed_ids,
+    provenance_range_mask,
+    top_n_mask,
 )
+from app.range_index import build_range_indexes
 
 
 def test_default_filters_match_reset_values() -> None:
@@ -92,3 +103,148 @@ def test_apply_filters_default_reset_returns_original_rows() -> None:
 
     assert nodes_f['id'].tolist() == ['N1', 'N2']
     assert edges_f[['source', 'target']].to_dict('records') == [{'source': 'N1', 'target': 'N2'}]
+
+
+def _chain_frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {
+            'id': ['A', 'B', 'C', 'D', 'E'],
+            'label': ['A', 'B', 'C', 'D', 'E'],
+            'type': ['Person'] * 5,
+            'description': [''] * 5,
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            'source': ['A', 'B', 'C', 'A', 'D'],
+            'target': ['B', 'C', 'D', 'E', 'A'],
+            'relationship_type': ['KNOWS', 'KNOWS', 'KNOWS', 'FUNDS', 'FUNDS'],
+            'description': [''] * 5,
+        }
+    )
+    return nodes_df, edges_df
+
+
+def test_parse_seed_ids_splits_and_deduplicates() -> None:
+    assert parse_seed_ids(' B, A ,,B ') == ('A', 'B')
+    assert parse_seed_ids('') == ()
+
+
+def test_ego_network_filter_expands_by_hops() -> None:
+    nodes_df, edges_df = _chain_frames()
+
+    one_hop_nodes, one_hop_edges = ego_network_filter(nodes_df, edges_df, ['B'], radius=1)
+    two_hop_nodes, two_hop_edges = ego_network_filter(nodes_df, edges_df, ['B'], radius=2)
+
+    assert one_hop_nodes['id'].tolist() == ['A', 'B', 'C']
+    assert len(one_hop_edges) == 2
+    assert two_hop_nodes['id'].tolist() == ['A', 'B', 'C', 'D', 'E']
+    assert len(two_hop_edges) == 5
+
+
+def test_ego_network_filter_respects_relationship_restriction_and_unknown_seeds() -> None:
+    nodes_df, edges_df = _chain_frames()
+    adjacency = AdjacencyIndex.from_frames(nodes_df, edges_df)
+
+    nodes_f, edges_f = ego_network_filter(
+        nodes_df, edges_df, ['A', 'missing'], radius=3, relationship_types=['FUNDS'], adjacency=adjacency
+    )
+
+    assert nodes_f['id'].tolist() == ['A', 'D', 'E']
+    assert edges_f['relationship_type'].tolist() == ['FUNDS', 'FUNDS']
+
+
+def test_parse_date_bound_expands_partial_dates() -> None:
+    assert parse_date_bound('2021') == '2021-01-01'
+    assert parse_date_bound('2022', upper=True) == '2022-12-31'
+    assert parse_date_bound('2022-02', upper=True) == '2022-02-31'
+    assert parse_date_bound(' ') is None
+    with pytest.raises(ValueError):
+        parse_date_bound('21/02/2022')
+
+
+def test_provenance_range_mask_combines_date_and_confidence() -> None:
+    edges_df = pd.DataFrame(
+        {
+            'source': ['A', 'A', 'B', 'C'],
+            'target': ['B', 'C', 'C', 'A'],
+            'relationship_type': ['KNOWS'] * 4,
+            'date': ['2021-03-01', '2022-11-30', '2023-01-01', ''],
+            'confidence': [0.9, 0.6, 0.8, 0.95],
+        }
+    )
+    date_range = (parse_date_bound('2021'), parse_date_bound('2022', upper=True))
+
+    mask = provenance_range_mask(edges_df, date_range, (0.7, None))
+    assert mask.tolist() == [True, False, False, False]
+
+    indexes = build_range_indexes(edges_df)
+    assert provenance_range_mask(edges_df, date_range, indexes=indexes).tolist() == [True, True, False, False]
+    assert provenance_range_mask(edges_df, indexes=indexes).tolist() == [True] * 4
+
+
+def _graph_frames(pairs: list[tuple[str, str]]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    node_ids = sorted({node for pair in pairs for node in pair} | {'lonely'})
+    nodes_df = pd.DataFrame({'id': node_ids, 'label': '', 'type': 'Person', 'description': ''})
+    edges_df = pd.DataFrame(
+        {
+            'source': [source for source, _ in pairs],
+            'target': [target for _, target in pairs],
+            'relationship_type': 'knows',
+            'description': '',
+        }
+    )
+    return nodes_df, edges_df
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_core_numbers_match_networkx(seed: int) -> None:
+    nx = pytest.importorskip('networkx')
+    graph = nx.gnm_random_graph(60, 180, seed=seed)
+    pairs = [(f'n{u}', f'n{v}') for u, v in graph.edges()] + [('n0', 'n0'), ('n1', 'n2'), ('n1', 'n2')]
+    nodes_df, edges_df = _graph_frames(pairs)
+    expected = nx.core_number(nx.relabel_nodes(graph, lambda node: f'n{node}'))
+
+    cores = core_numbers(AdjacencyIndex.from_frames(nodes_df, edges_df))
+
+    assert dict(zip(nodes_df['id'], cores.tolist())) == {**expected, 'lonely': 0}
+
+
+def test_core_threshold_picks_smallest_core_that_fits() -> None:
+    cores = np.array([0, 1, 1, 2, 2, 2, 3, 3, 3, 3])
+
+    assert core_threshold(cores, max_nodes=10) == 0
+    assert core_threshold(cores, max_nodes=7) == 2
+    assert core_threshold(cores, max_nodes=4) == 3
+    assert core_threshold(cores, max_nodes=2) == 3
+    assert core_threshold(np.array([], dtype=np.int64)) == 0
+
+
+def test_top_n_mask_uses_row_order_for_ties_and_respects_within() -> None:
+    scores = np.array([5.0, 1.0, 3.0, 3.0, 9.0, 3.0])
+
+    assert np.flatnonzero(top_n_mask(scores, 3)).tolist() == [0, 2, 4]
+    within = np.array([True, True, False, True, False, True])
+    assert np.flatnonzero(top_n_mask(scores, 2, within)).tolist() == [0, 3]
+    assert not top_n_mask(scores, 0).any()
+    assert top_n_mask(scores, 99).all()
+
+
+def test_top_n_mask_ranks_missing_scores_last() -> None:
+    scores = np.array([3.0, np.nan, 1.0, 2.0])
+
+    assert np.flatnonzero(top_n_mask(scores, 2)).tolist() == [0, 3]
+    assert np.flatnonzero(top_n_mask(scores, 4)).tolist() == [0, 1, 2, 3]
+    assert np.flatnonzero(top_n_mask(np.array([np.nan, 2.0, np.nan]), 2)).tolist() == [0, 1]
+
+
+def test_core_network_masks_keep_dense_core_and_hubs() -> None:
+    clique = [(a, b) for position, a in enumerate('abcd') for b in 'abcd'[position + 1:]]
+    nodes_df, edges_df = _graph_frames([*clique, ('a', 'x'), ('x', 'y'), ('b', 'z')])
+
+    node_mask, edge_mask = core_network_masks(nodes_df, edges_df, min_core=3)
+    assert set(nodes_df['id'][node_mask]) == set('abcd')
+    assert edge_mask.sum() == len(clique)
+
+    node_mask, _ = core_network_masks(nodes_df, edges_df, top_hubs=2)
+    assert set(nodes_df['id'][node_mask]) == {'a', 'b'}
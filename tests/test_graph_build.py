@@ -67,3 +67,18 @@ def test_build_cytoscape_elements_edge_id_format_and_stability() -> None:
 
     assert first_edge_ids == ["A__B__knows__5", "A__B__knows__7"]
     assert second_edge_ids == first_edge_ids
+
+
+def test_build_cytoscape_elements_adds_community_labels_to_nodes() -> None:
+    nodes_df = pd.DataFrame(
+        {"id": ["N1", "N2"], "label": ["Node 1", "Node 2"], "type": ["person", "org"], "description": ["", ""]}
+    )
+    edges_df = pd.DataFrame(
+        {"source": ["N1"], "target": ["N2"], "relationship_type": ["linked"], "description": [""]}
+    )
+
+    elements = build_cytoscape_elements(nodes_df, edges_df, {"N1": 0})
+
+    assert elements[0]["data"]["community"] == 0
+    assert "community" not in elements[1]["data"]
+    assert "community" not in elements[2]["data"]
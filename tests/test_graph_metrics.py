@@ -0,0 +1,117 @@
+import pytest
+
+pytest.importorskip("pandas")
+nx = pytest.importorskip("networkx")
+import numpy as np
+import pandas as pd
+
+from app.graph_metrics import GraphMetrics
+
+
+def _assert_matches(metrics: GraphMetrics, graph: "nx.MultiGraph") -> None:
+    simple = nx.Graph(graph)
+    simple.remove_edges_from(nx.selfloop_edges(simple))
+    assert metrics.node_count == graph.number_of_nodes()
+    assert metrics.edge_count == graph.number_of_edges()
+    assert metrics.component_count == nx.number_connected_components(graph)
+    assert metrics.triangle_count == sum(nx.triangles(simple).values()) // 3
+    assert metrics.average_clustering == pytest.approx(nx.average_clustering(simple) if len(simple) else 0.0)
+    clustering = nx.clustering(simple)
+    for component in nx.connected_components(graph):
+        for node in component:
+            assert metrics.degree(node) == graph.degree(node)
+            assert metrics.triangles(node) == nx.triangles(simple, node)
+            assert metrics.clustering(node) == pytest.approx(clustering[node])
+            assert metrics.component_size(node) == len(component)
+
+
+def _frames(graph: "nx.MultiGraph") -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame({"id": list(graph), "label": "", "type": "Person", "description": ""})
+    edges_df = pd.DataFrame(
+        {
+            "source": [u for u, _ in graph.edges()],
+            "target": [v for _, v in graph.edges()],
+            "relationship_type": "KNOWS",
+            "description": "",
+        }
+    )
+    return nodes_df, edges_df
+
+
+def test_from_frames_matches_networkx() -> None:
+    graph = nx.MultiGraph(nx.relabel_nodes(nx.gnm_random_graph(50, 90, seed=2), str))
+    graph.add_edge("0", "1")
+    graph.add_node("lonely")
+    nodes_df, edges_df = _frames(graph)
+
+    _assert_matches(GraphMetrics.from_frames(nodes_df, edges_df), graph)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_stay_in_sync_with_networkx(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    node_ids = [f"n{position}" for position in range(25)]
+    graph = nx.MultiGraph()
+    graph.add_nodes_from(node_ids)
+    metrics = GraphMetrics()
+    for node_id in node_ids:
+        metrics.add_node(node_id)
+
+    for step in range(400):
+        edges = list(graph.edges())
+        if edges and rng.random() < 0.45:
+            source, target = edges[rng.integers(len(edges))]
+            graph.remove_edge(source, target)
+            metrics.remove_edge(source, target)
+        else:
+            source, target = rng.choice(node_ids, size=2)
+            graph.add_edge(source, target)
+            metrics.add_edge(source, target)
+        if step % 20 == 0:
+            _assert_matches(metrics, graph)
+    _assert_matches(metrics, graph)
+
+
+def test_removing_a_bridge_splits_the_component() -> None:
+    metrics = GraphMetrics()
+    for source, target in [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "e")]:
+        metrics.add_edge(source, target)
+    assert metrics.component_count == 1
+
+    metrics.remove_edge("c", "d")
+
+    assert metrics.component_count == 2
+    assert (metrics.component_size("a"), metrics.component_size("e")) == (3, 2)
+    assert not metrics.same_component("a", "e")
+    assert metrics.triangle_count == 1
+
+
+def test_sync_edges_applies_row_level_differences() -> None:
+    graph = nx.MultiGraph([("a", "b"), ("b", "c"), ("c", "d")])
+    nodes_df, edges_df = _frames(graph)
+    metrics = GraphMetrics.from_frames(nodes_df, edges_df)
+
+    updated = edges_df.drop(index=2)
+    updated.at[0, "target"] = "c"
+    updated.loc[10] = {"source": "a", "target": "d", "relationship_type": "KNOWS", "description": ""}
+
+    assert metrics.sync_edges(edges_df, updated)
+    expected = nx.MultiGraph([("a", "c"), ("b", "c"), ("a", "d")])
+    _assert_matches(metrics, expected)
+
+
+def test_node_rows_and_unknown_edges() -> None:
+    metrics = GraphMetrics()
+    metrics.add_node("a")
+    metrics.add_edge("a", "b")
+    metrics.remove_node("a")
+
+    assert metrics.node_count == 2
+    metrics.remove_edge("a", "b")
+    assert metrics.node_count == 0
+    with pytest.raises(ValueError, match="Unknown edge"):
+        metrics.remove_edge("a", "b")
+    metrics.add_node("x")
+    metrics.rename_node("x", "y")
+    assert metrics.node_metrics("y") == {"degree": 0, "triangles": 0, "clustering": 0.0, "component_size": 1}
+    assert metrics.node_metrics("x") == {}
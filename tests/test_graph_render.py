@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("nicegui")
+
+from app.graph_render import (
+    _SELECTION_CALLBACKS,
+    _TRACKED_CLIENT_IDS,
+    ClientRegistry,
+    _dispatch_selection,
+    _release_client,
+    registry_metrics,
+)
+
+
+def test_client_registry_replaces_entries_and_releases_clients() -> None:
+    registry = ClientRegistry()
+    registry.set("client-a", "first")
+    registry.set("client-a", "second")
+    registry.set("client-b", "other")
+
+    assert len(registry) == 2
+    assert registry.get("client-a") == "second"
+
+    registry.discard("client-b")
+    assert registry.get("client-b") is None
+    assert len(registry) == 1
+
+    _SELECTION_CALLBACKS.set("client-z", lambda payload: None)
+    _TRACKED_CLIENT_IDS.add("client-z")
+    before = registry_metrics()
+    _release_client("client-z")
+    after = registry_metrics()
+
+    assert after["selection_callbacks"] == before["selection_callbacks"] - 1
+    assert after["tracked_clients"] == before["tracked_clients"] - 1
+
+
+def test_dispatch_selection_normalizes_payload_for_registered_client() -> None:
+    received: list[dict] = []
+    _SELECTION_CALLBACKS.set("client-s", received.append)
+
+    _dispatch_selection("client-s", {"kind": "node", "data": {"id": "N1"}})
+    _dispatch_selection("client-s", {"kind": "bogus", "data": "not-a-dict"})
+    _dispatch_selection("client-unknown", {"kind": "node", "data": {}})
+    _release_client("client-s")
+
+    assert received == [
+        {"kind": "node", "data": {"id": "N1"}},
+        {"kind": "none", "data": {}},
+    ]
@@ -0,0 +1,25 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("nicegui")
+
+from app.graph_render import _CYTOSCAPE_ASSET, _VENDOR_DIR, hashed_asset_name
+
+
+def test_vendored_cytoscape_asset_is_packaged() -> None:
+    asset_path = _VENDOR_DIR / _CYTOSCAPE_ASSET
+
+    assert asset_path.exists()
+    assert "export{" in asset_path.read_text(encoding="utf-8")[-200:]
+
+
+def test_hashed_asset_name_changes_with_content(tmp_path: Path) -> None:
+    asset_path = tmp_path / "lib.esm.min.js"
+    asset_path.write_text("export const a = 1;", encoding="utf-8")
+    first_name = hashed_asset_name(asset_path)
+    asset_path.write_text("export const a = 2;", encoding="utf-8")
+    second_name = hashed_asset_name(asset_path)
+
+    assert first_name.startswith("lib.") and first_name.endswith(".esm.min.js")
+    assert first_name != second_name
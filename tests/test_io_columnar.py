@@ -0,0 +1,124 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.export import export_arrow, export_csv, export_parquet
+from app.io_excel import data_exists, load_tables, save_tables
+from app.sample_data import create_sample_workbook
+
+
+def _frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {
+            'id': ['N2', 'N1', 'N3'],
+            'label': ['Node 2', 'Node 1', 'Node 3'],
+            'type': ['org', 'person', 'person'],
+            'description': ['', None, 'Known associate'],
+            'source_ref': ['Doc A', '', 'Doc B'],
+            'date': ['2024-01-02', '', '2023-12-31'],
+            'confidence': [0.8, '', 1],
+            'risk_score': [3, 7, 1],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            'source': ['N2', 'N1', 'N1'],
+            'target': ['N3', 'N2', 'N3'],
+            'relationship_type': ['funds', 'linked', 'linked'],
+            'description': ['', 'Seen together', ''],
+            'date': ['2024-05-01', 'circa 1920', ''],
+            'confidence': ['0.5', '', '0.25'],
+        }
+    )
+    return nodes_df, edges_df
+
+
+def test_parquet_export_keeps_types_order_and_row_groups(tmp_path: Path) -> None:
+    nodes_df, edges_df = _frames()
+
+    nodes_path, edges_path = export_parquet(nodes_df, edges_df, str(tmp_path), row_group_size=2)
+
+    schema = pq.read_schema(nodes_path)
+    assert schema.names == ['id', 'label', 'type', 'description', 'source_ref', 'date', 'confidence', 'risk_score']
+    assert schema.field('date').type == pa.date32()
+    assert schema.field('confidence').type == pa.float64()
+    assert schema.field('risk_score').type == pa.int64()
+    assert pq.ParquetFile(nodes_path).metadata.num_row_groups == 2
+    edges = pq.read_table(edges_path)
+    assert pa.types.is_string(edges.schema.field('date').type) or pa.types.is_large_string(edges.schema.field('date').type)
+    assert edges.column('confidence').to_pylist() == [None, 0.25, 0.5]
+    assert edges.column('source').to_pylist() == ['N1', 'N1', 'N2']
+
+
+@pytest.mark.parametrize('export', [export_parquet, export_arrow])
+def test_columnar_round_trip_matches_csv_order(tmp_path: Path, export) -> None:
+    nodes_df, edges_df = _frames()
+    nodes_path, _ = export(nodes_df, edges_df, str(tmp_path / 'tables'))
+    csv_nodes, csv_edges = export_csv(nodes_df, edges_df, str(tmp_path / 'csv'))
+
+    loaded_nodes, loaded_edges = load_tables(nodes_path)
+
+    assert loaded_nodes['id'].tolist() == pd.read_csv(csv_nodes)['id'].tolist()
+    assert loaded_edges['target'].tolist() == pd.read_csv(csv_edges)['target'].tolist()
+    assert loaded_nodes.columns.tolist() == pd.read_csv(csv_nodes).columns.tolist()
+    assert loaded_nodes['date'].tolist()[1:] == ['2024-01-02', '2023-12-31']
+    assert loaded_nodes['confidence'].tolist()[1:] == [0.8, 1.0]
+    assert pd.isna(loaded_nodes['confidence'].iloc[0])
+    dates = load_tables(str(tmp_path / 'tables'))[1]['date'].tolist()
+    assert (dates[0], dates[2]) == ('circa 1920', '2024-05-01')
+
+
+def test_save_tables_rewrites_columnar_data_in_place(tmp_path: Path) -> None:
+    nodes_df, edges_df = _frames()
+    nodes_path, _ = export_parquet(nodes_df, edges_df, str(tmp_path))
+    loaded_nodes, loaded_edges = load_tables(nodes_path)
+
+    save_tables(loaded_nodes[loaded_nodes['id'] != 'N3'], loaded_edges.iloc[:1], nodes_path)
+
+    reloaded_nodes, reloaded_edges = load_tables(nodes_path)
+    assert reloaded_nodes['id'].tolist() == ['N1', 'N2']
+    assert len(reloaded_edges) == 1
+    assert not list(tmp_path.glob('.tmp_*'))
+
+
+def test_arrow_export_rejects_unsupported_compression(tmp_path: Path) -> None:
+    nodes_df, edges_df = _frames()
+
+    with pytest.raises(ValueError, match='lz4'):
+        export_arrow(nodes_df, edges_df, str(tmp_path), compression='gzip')
+    with pytest.raises(FileNotFoundError):
+        load_tables(str(tmp_path / 'nodes.parquet'))
+
+
+def test_columnar_data_path_must_name_the_nodes_or_edges_table(tmp_path: Path) -> None:
+    nodes_df, edges_df = _frames()
+    export_parquet(nodes_df, edges_df, str(tmp_path))
+
+    with pytest.raises(ValueError, match='nodes.parquet or edges.parquet'):
+        load_tables(str(tmp_path / 'case7.parquet'))
+    with pytest.raises(ValueError, match='own folder'):
+        save_tables(nodes_df, edges_df, str(tmp_path / 'case7.parquet'))
+    assert not data_exists(tmp_path / 'case7.parquet')
+    assert len(load_tables(str(tmp_path / 'edges.parquet'))[0]) == 3
+
+
+@pytest.mark.parametrize('target', ['nodes.parquet', 'nodes.arrow', 'folder'])
+def test_sample_data_is_written_as_tables_for_a_columnar_data_path(tmp_path: Path, target: str) -> None:
+    data_path = tmp_path / target
+    if target == 'folder':
+        data_path.mkdir()
+    assert not data_exists(data_path)
+
+    create_sample_workbook(str(data_path))
+
+    assert data_exists(data_path)
+    nodes_df, edges_df = load_tables(str(data_path))
+    assert len(nodes_df) == 9 and len(edges_df) == 12
+    table_path = data_path if target != 'folder' else data_path / 'nodes.parquet'
+    assert not table_path.read_bytes().startswith(b'PK')
@@ -0,0 +1,106 @@
+import pytest
+
+pytest.importorskip('pandas')
+nx = pytest.importorskip('networkx')
+import numpy as np
+import pandas as pd
+
+from app.network_stats import component_labels, filled_mask, network_statistics
+
+
+def _random_frames(seed: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    node_ids = [f'n{position}' for position in range(30)]
+    edges_df = pd.DataFrame(
+        {
+            'source': rng.choice(node_ids[:25], size=40),
+            'target': rng.choice(node_ids[:25], size=40),
+            'relationship_type': rng.choice(['funds', 'knows'], size=40),
+            'description': '',
+        }
+    )
+    nodes_df = pd.DataFrame({'id': node_ids, 'label': '', 'type': rng.choice(['A', 'B'], size=30), 'description': ''})
+    return nodes_df, edges_df
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_statistics_agree_with_networkx(seed: int) -> None:
+    nodes_df, edges_df = _random_frames(seed)
+    graph = nx.MultiGraph()
+    graph.add_nodes_from(nodes_df['id'])
+    graph.add_edges_from(zip(edges_df['source'], edges_df['target']))
+    simple = nx.Graph(graph)
+    simple.remove_edges_from(list(nx.selfloop_edges(simple)))
+
+    stats = network_statistics(nodes_df, edges_df)
+
+    degrees = np.array([degree for _, degree in graph.degree()])
+    assert stats.degree_percentiles[0] == degrees.min() and stats.degree_percentiles[100] == degrees.max()
+    assert stats.degree_percentiles[50] == int(np.percentile(degrees, 50, method='inverted_cdf'))
+    assert stats.degree_mean == pytest.approx(degrees.mean())
+    assert stats.density == pytest.approx(nx.density(simple))
+    assert stats.isolates == len(list(nx.isolates(graph)))
+    sizes = sorted((len(component) for component in nx.connected_components(graph)), reverse=True)
+    assert stats.component_count == len(sizes)
+    assert stats.largest_components == sizes[:5]
+    for name, (reciprocated, pairs) in stats.reciprocity.items():
+        typed = nx.DiGraph(
+            (source, target)
+            for source, target, relationship in edges_df[['source', 'target', 'relationship_type']].itertuples(index=False)
+            if relationship == name and source != target
+        )
+        assert pairs == typed.number_of_edges()
+        assert reciprocated / pairs == pytest.approx(nx.overall_reciprocity(typed))
+
+
+def test_component_labels_join_long_chains() -> None:
+    order = np.random.default_rng(0).permutation(1000)
+    labels = component_labels(1000, order[:-1], order[1:])
+
+    assert set(labels) == {0}
+
+
+def test_coverage_self_loops_and_unknown_endpoints() -> None:
+    nodes_df = pd.DataFrame(
+        {
+            'id': ['a', 'b', 'c'],
+            'label': '',
+            'type': ['Person', 'Person', 'Group'],
+            'description': '',
+            'source_ref': ['Doc 1', '  ', 'Doc 2'],
+            'confidence': [0.5, '', np.nan],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            'source': ['a', 'b', 'a', 'a', 'zz'],
+            'target': ['b', 'a', 'a', 'b', 'a'],
+            'relationship_type': ['knows', 'knows', 'knows', 'funds', 'funds'],
+            'description': '',
+        }
+    )
+
+    stats = network_statistics(nodes_df, edges_df)
+
+    assert [(entry.name, entry.rows, entry.filled) for entry in stats.node_coverage] == [
+        ('Group', 1, {'source_ref': 1, 'confidence': 0}),
+        ('Person', 2, {'source_ref': 1, 'confidence': 1}),
+    ]
+    assert (stats.self_loops, stats.dangling_edges, stats.isolates) == (1, 1, 1)
+    assert (stats.node_confidence, stats.edge_confidence) == ((0.5, 0.5, 0.5), None)
+    assert stats.reciprocity == {'funds': (0, 1), 'knows': (2, 2)}
+    assert stats.connected_pairs == 1 and stats.density == pytest.approx(1 / 3)
+    assert filled_mask(pd.Series([' x ', None, 3, ''], dtype=object)).tolist() == [True, False, True, False]
+
+
+def test_reciprocity_keys_fall_back_to_pair_codes_for_huge_graphs() -> None:
+    from app.network_stats import _reciprocity
+
+    sources = np.array([0, 1, 1, 2, 2], dtype=np.int64)
+    targets = np.array([1, 0, 2, 1, 0], dtype=np.int64)
+    relationships = np.array([0, 0, 1, 1, 0], dtype=np.int64)
+
+    small = _reciprocity(sources, targets, relationships, ['funds', 'knows'], 3)
+    huge = _reciprocity(sources, targets, relationships, ['funds', 'knows'], 2**31)
+
+    assert small == huge == {'funds': (2, 3), 'knows': (2, 2)}
@@ -0,0 +1,117 @@
+import pytest
+
+pytest.importorskip("pandas")
+nx = pytest.importorskip("networkx")
+import numpy as np
+import pandas as pd
+
+from app.paths import PathFinder, path_highlight
+
+
+def _random_frames(seed: int) -> tuple["nx.Graph", pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(40, 70, seed=seed)
+    edges = list(graph.edges())
+    confidences = rng.choice([0.2, 0.5, 0.9, 1.0], size=len(edges))
+    for (u, v), confidence in zip(edges, confidences):
+        graph[u][v]["cost"] = 2.0 - confidence
+    nodes_df = pd.DataFrame({"id": [str(node) for node in graph], "label": "", "type": "Person", "description": ""})
+    edges_df = pd.DataFrame(
+        {
+            "source": [str(u) for u, _ in edges],
+            "target": [str(v) for _, v in edges],
+            "relationship_type": rng.choice(["KNOWS", "FUNDS"], size=len(edges)),
+            "description": "",
+            "confidence": confidences,
+        }
+    )
+    return graph, nodes_df, edges_df
+
+
+def _assert_valid(path, edges_df: pd.DataFrame) -> None:
+    for (u, v), position in zip(zip(path.node_ids, path.node_ids[1:]), path.edge_positions):
+        assert {edges_df.at[position, "source"], edges_df.at[position, "target"]} == {u, v}
+
+
+def _chain_frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame({"id": ["a", "b", "c", "d"], "label": "", "type": "Person", "description": ""})
+    edges_df = pd.DataFrame(
+        {
+            "source": ["a", "c", "a", "b"],
+            "target": ["c", "d", "b", "d"],
+            "relationship_type": ["FUNDS", "FUNDS", "KNOWS", "KNOWS"],
+            "description": "",
+            "confidence": [0.1, 0.1, 0.9, 0.9],
+        }
+    )
+    return nodes_df, edges_df
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_shortest_path_matches_networkx(seed: int) -> None:
+    graph, nodes_df, edges_df = _random_frames(seed)
+    finder = PathFinder.from_frames(nodes_df, edges_df)
+
+    for source, target in [(0, 39), (3, 17), (12, 5)]:
+        if not nx.has_path(graph, source, target):
+            assert finder.shortest_path(str(source), str(target)) is None
+            continue
+        hops = finder.shortest_path(str(source), str(target))
+        cheapest = finder.shortest_path(str(source), str(target), weighted=True)
+        assert hops.hops == nx.shortest_path_length(graph, source, target)
+        assert cheapest.cost == pytest.approx(nx.shortest_path_length(graph, source, target, weight="cost"))
+        _assert_valid(hops, edges_df)
+        _assert_valid(cheapest, edges_df)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_k_shortest_paths_match_networkx(seed: int) -> None:
+    graph, nodes_df, edges_df = _random_frames(seed)
+    finder = PathFinder.from_frames(nodes_df, edges_df)
+    source, target = 0, 39
+    if not nx.has_path(graph, source, target):
+        pytest.skip("endpoints disconnected for this seed")
+
+    for weighted, weight in [(False, None), (True, "cost")]:
+        paths = finder.k_shortest_paths(str(source), str(target), 5, weighted=weighted)
+        expected = []
+        for nodes in nx.shortest_simple_paths(graph, source, target, weight=weight):
+            expected.append(nx.path_weight(graph, nodes, "cost") if weighted else len(nodes) - 1)
+            if len(expected) == 5:
+                break
+        assert [path.cost for path in paths] == pytest.approx(expected)
+        assert len({path.node_ids for path in paths}) == len(paths)
+        for path in paths:
+            _assert_valid(path, edges_df)
+
+
+def test_weighted_path_prefers_confident_edges() -> None:
+    finder = PathFinder.from_frames(*_chain_frames())
+
+    assert finder.shortest_path("a", "d").hops == 2
+    assert finder.shortest_path("a", "d", weighted=True).node_ids == ("a", "b", "d")
+
+
+def test_restrictions_limit_traversed_edges() -> None:
+    finder = PathFinder.from_frames(*_chain_frames())
+
+    assert finder.shortest_path("a", "d", relationship_types=["FUNDS"]).node_ids == ("a", "c", "d")
+    assert finder.shortest_path("a", "d", min_confidence=0.5).edge_positions == (2, 3)
+    assert finder.shortest_path("a", "d", relationship_types=["FUNDS"], min_confidence=0.5) is None
+
+
+def test_unknown_node_id_raises() -> None:
+    finder = PathFinder.from_frames(*_chain_frames())
+
+    with pytest.raises(ValueError, match="Unknown node id"):
+        finder.shortest_path("a", "missing")
+
+
+def test_path_highlight_lists_nodes_and_edge_keys() -> None:
+    nodes_df, edges_df = _chain_frames()
+    finder = PathFinder.from_frames(nodes_df, edges_df)
+
+    highlight = path_highlight(finder.k_shortest_paths("a", "d", 2), edges_df)
+
+    assert set(highlight["nodes"]) == {"a", "b", "c", "d"}
+    assert sorted(highlight["edges"]) == [["a", "b", "KNOWS"], ["a", "c", "FUNDS"], ["b", "d", "KNOWS"], ["c", "d", "FUNDS"]]
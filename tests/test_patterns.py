@@ -0,0 +1,166 @@
+import itertools
+
+import pytest
+
+pytest.importorskip("pandas")
+import numpy as np
+import pandas as pd
+
+from app.patterns import BOTH, IN, OUT, PatternIndex, PatternStep, looks_like_pattern, parse_pattern
+
+
+def _frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {
+            "id": ["ann", "bob", "cat", "dan", "g1", "g2", "org"],
+            "label": "",
+            "type": ["Person", "Person", "Person", "Person", "Group", "Group", "Institution"],
+            "description": "",
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            "source": ["ann", "bob", "cat", "dan", "ann", "org", "cat"],
+            "target": ["g1", "g1", "g2", "g2", "bob", "g2", "g1"],
+            "relationship_type": ["funds", "member_of", "member_of", "funds", "knows", "funds", "funds"],
+            "description": "",
+        }
+    )
+    return nodes_df, edges_df
+
+
+def _match_pairs(matches, nodes_df: pd.DataFrame) -> set[tuple[str, ...]]:
+    ids = nodes_df["id"].to_numpy()
+    return {tuple(ids[row]) for row in matches.nodes}
+
+
+def test_parse_pattern_reads_slots_steps_and_directions() -> None:
+    pattern = parse_pattern("(Person)-[funds|pays]->(Group)<-[member_of]-( :Person ) -- ()")
+
+    assert pattern.node_types == (("Person",), ("Group",), ("Person",), ())
+    assert pattern.steps == (
+        PatternStep(("funds", "pays"), OUT),
+        PatternStep(("member_of",), IN),
+        PatternStep((), BOTH),
+    )
+    for bad in ("(Person)-[funds]", "(Person)<-[x]->(Group)", "Person", "(Person)-[x]->"):
+        with pytest.raises(ValueError):
+            parse_pattern(bad)
+
+
+def test_looks_like_pattern_leaves_filter_queries_alone() -> None:
+    assert looks_like_pattern("(Person)-[funds]->(Group)")
+    assert looks_like_pattern("(Person)")
+    assert not looks_like_pattern("(type:Person OR type:Group) AND rel:funds")
+    assert not looks_like_pattern("type:Person")
+
+
+def test_funder_and_member_of_the_same_group() -> None:
+    nodes_df, edges_df = _frames()
+    index = PatternIndex.from_frames(nodes_df, edges_df)
+
+    matches = index.match("(Person)-[FUNDS]->(Group)<-[member_of]-(Person)")
+
+    assert _match_pairs(matches, nodes_df) == {("ann", "g1", "bob"), ("cat", "g1", "bob"), ("dan", "g2", "cat")}
+    assert not matches.truncated
+    sub_nodes, sub_edges = matches.subgraph(nodes_df, edges_df)
+    assert set(sub_nodes["id"]) == {"ann", "bob", "cat", "dan", "g1", "g2"}
+    assert set(sub_edges["relationship_type"]) == {"funds", "member_of"}
+    assert "org" not in set(sub_edges["source"])
+
+
+def test_unknown_types_and_relationships_match_nothing() -> None:
+    nodes_df, edges_df = _frames()
+    index = PatternIndex.from_frames(nodes_df, edges_df)
+
+    assert index.match("(Robot)-[funds]->(Group)").match_count == 0
+    assert index.match("(Person)-[sponsors]->(Group)").match_count == 0
+
+
+def _brute_force(nodes_df: pd.DataFrame, edges_df: pd.DataFrame, pattern) -> set[tuple]:
+    types = dict(zip(nodes_df["id"], nodes_df["type"].str.lower()))
+    edges = list(edges_df[["source", "target", "relationship_type"]].itertuples(index=False))
+    found = set()
+    for combo in itertools.product(range(len(edges)), repeat=len(pattern.steps)):
+        if len(set(combo)) < len(combo):
+            continue
+        for flips in itertools.product((False, True), repeat=len(pattern.steps)):
+            slots: list[str] = []
+            valid = True
+            for position, (edge_position, flipped) in enumerate(zip(combo, flips)):
+                step = pattern.steps[position]
+                source, target, relationship = edges[edge_position]
+                wanted = {name.lower() for name in step.relationship_types}
+                if wanted and relationship.lower() not in wanted:
+                    valid = False
+                    break
+                if (step.direction == OUT and flipped) or (step.direction == IN and not flipped):
+                    valid = False
+                    break
+                if step.direction == BOTH and flipped and source == target:
+                    valid = False
+                    break
+                left, right = (target, source) if flipped else (source, target)
+                if slots and slots[-1] != left:
+                    valid = False
+                    break
+                slots = slots or [left]
+                slots.append(right)
+            if valid and all(
+                not wanted or types[node] in {name.lower() for name in wanted}
+                for node, wanted in zip(slots, pattern.node_types)
+            ):
+                found.add((tuple(slots), combo))
+    return found
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "text",
+    [
+        "(A)-[r]->(B)<-[s]-(A)",
+        "()-[r|s]-(B)-[]->(A)",
+        "(A|B)<-[s]-()-[r]-(A)",
+        "(B)",
+    ],
+)
+def test_matches_agree_with_brute_force(seed: int, text: str) -> None:
+    rng = np.random.default_rng(seed)
+    node_ids = [f"n{position}" for position in range(9)]
+    nodes_df = pd.DataFrame(
+        {"id": node_ids, "label": "", "type": rng.choice(["A", "B"], size=9), "description": ""}
+    )
+    edges_df = pd.DataFrame(
+        {
+            "source": rng.choice(node_ids, size=14),
+            "target": rng.choice(node_ids, size=14),
+            "relationship_type": rng.choice(["r", "s"], size=14),
+            "description": "",
+        }
+    )
+    pattern = parse_pattern(text)
+
+    matches = PatternIndex.from_frames(nodes_df, edges_df).match(pattern)
+
+    ids = nodes_df["id"].to_numpy()
+    found = {(tuple(ids[nodes]), tuple(edges)) for nodes, edges in zip(matches.nodes, matches.edges)}
+    if not pattern.steps:
+        assert {nodes for nodes, _ in found} == {(node,) for node in ids[nodes_df["type"] == "B"]}
+        return
+    assert found == _brute_force(nodes_df, edges_df, pattern)
+    assert len(found) == matches.match_count
+
+
+def test_limit_truncates_large_results() -> None:
+    node_ids = ["hub", *[f"p{position}" for position in range(40)]]
+    nodes_df = pd.DataFrame({"id": node_ids, "label": "", "type": ["Group", *["Person"] * 40], "description": ""})
+    edges_df = pd.DataFrame(
+        {"source": node_ids[1:], "target": "hub", "relationship_type": "member_of", "description": ""}
+    )
+    index = PatternIndex.from_frames(nodes_df, edges_df)
+
+    full = index.match("(Person)-[member_of]->(Group)<-[member_of]-(Person)")
+    capped = index.match("(Person)-[member_of]->(Group)<-[member_of]-(Person)", limit=100)
+
+    assert full.match_count == 40 * 39 and not full.truncated
+    assert capped.match_count == 100 and capped.truncated
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("pandas")
+import pandas as pd
+
+from app.range_index import SortedColumnIndex, build_range_indexes, confidence_key, date_key
+
+
+def test_key_functions_skip_missing_and_invalid_values() -> None:
+    assert date_key("2021-03-04") == "2021-03-04"
+    assert date_key(pd.Timestamp("2021-03-04")) == "2021-03-04"
+    assert date_key("") is None
+    assert date_key(float("nan")) is None
+    assert date_key("03/04/2021") is None
+    assert confidence_key("0.7") == 0.7
+    assert confidence_key("") is None
+    assert confidence_key(1.5) is None
+
+
+def test_range_positions_use_inclusive_bounds() -> None:
+    index = SortedColumnIndex([0.9, "", 0.5, 0.7, 0.5])
+
+    assert index.range_positions(0.5, 0.7).tolist() == [2, 4, 3]
+    assert index.range_positions(low=0.7).tolist() == [3, 0]
+    assert index.range_positions(high=0.4).tolist() == []
+    assert index.range_mask(0.6).tolist() == [True, False, False, True, False]
+    assert index.bounds() == (0.5, 0.9)
+
+
+def test_set_append_and_delete_keep_positions_aligned() -> None:
+    index = SortedColumnIndex.for_column(pd.DataFrame({"date": ["2020-01-01", "2022-06-01", ""]}), "date")
+
+    index.set(2, "2021-05-05")
+    index.set(0, "")
+    index.append(["2021-12-31", None])
+    assert index.range_positions("2021-01-01", "2021-12-31").tolist() == [2, 3]
+
+    index.delete([0, 2])
+    assert len(index) == 3
+    assert index.range_positions().tolist() == [1, 0]
+    assert index.range_mask("2021-01-01", "2021-12-31").tolist() == [False, True, False]
+
+
+def test_build_range_indexes_treats_missing_columns_as_unindexed() -> None:
+    indexes = build_range_indexes(pd.DataFrame({"id": ["A", "B"]}))
+
+    assert set(indexes) == {"date", "confidence"}
+    assert indexes["date"].indexed_count == 0
+    assert indexes["confidence"].range_mask(0.0, 1.0).tolist() == [False, False]
@@ -0,0 +1,114 @@
+import pytest
+
+pytest.importorskip("pandas")
+import pandas as pd
+
+from app.graph_build import build_cytoscape_elements
+from app.spatial_index import GridIndex, ViewportSource, compute_layout_positions
+
+
+def _frames() -> tuple[pd.DataFrame, pd.DataFrame]:
+    nodes_df = pd.DataFrame(
+        {
+            "id": ["A", "B", "C", "D"],
+            "label": ["A", "B", "C", "D"],
+            "type": ["Person", "Person", "Place", "Group"],
+            "description": ["", "", "", ""],
+            "x": [0.0, 10.0, 500.0, 20.0],
+            "y": [0.0, 5.0, 500.0, 20.0],
+        }
+    )
+    edges_df = pd.DataFrame(
+        {
+            "source": ["A", "A", "A", "B"],
+            "target": ["B", "C", "D", "D"],
+            "relationship_type": ["KNOWS", "VISITED", "KNOWS", "KNOWS"],
+            "description": ["", "", "", ""],
+        }
+    )
+    return nodes_df, edges_df
+
+
+def test_compute_layout_positions_prefers_xy_columns() -> None:
+    nodes_df, edges_df = _frames()
+
+    positions = compute_layout_positions(nodes_df, edges_df)
+
+    assert positions["C"] == (500.0, 500.0)
+
+
+def test_compute_layout_positions_is_deterministic_without_xy() -> None:
+    nodes_df, edges_df = _frames()
+    nodes_df = nodes_df.drop(columns=["x", "y"])
+
+    assert compute_layout_positions(nodes_df, edges_df) == compute_layout_positions(nodes_df, edges_df)
+
+
+def test_grid_index_query_returns_points_inside_rectangle() -> None:
+    index = GridIndex({"A": (0.0, 0.0), "B": (10.0, 5.0), "C": (500.0, 500.0)}, cell_size=8.0)
+
+    assert sorted(index.query(-1, -1, 12, 6)) == ["A", "B"]
+    assert index.query(600, 600, 700, 700) == []
+
+
+def test_viewport_source_returns_visible_nodes_and_internal_edges() -> None:
+    nodes_df, edges_df = _frames()
+    elements = build_cytoscape_elements(nodes_df, edges_df)
+    source = ViewportSource(elements, compute_layout_positions(nodes_df, edges_df))
+
+    result = source.query(-5, -5, 50, 50, zoom=1.0)
+
+    node_ids = {el["data"]["id"] for el in result if "source" not in el["data"]}
+    edge_pairs = {(el["data"]["source"], el["data"]["target"]) for el in result if "source" in el["data"]}
+    assert node_ids == {"A", "B", "D"}
+    assert edge_pairs == {("A", "B"), ("A", "D"), ("B", "D")}
+    assert all("position" in el for el in result if "source" not in el["data"])
+
+
+def test_viewport_source_applies_degree_lod_when_zoomed_out() -> None:
+    nodes_df, edges_df = _frames()
+    elements = build_cytoscape_elements(nodes_df, edges_df)
+    source = ViewportSource(elements, compute_layout_positions(nodes_df, edges_df), max_nodes=2, lod_zoom=0.5)
+
+    visible = source.visible_node_ids(-5, -5, 600, 600, zoom=0.25)
+
+    assert visible == ["A"]
+
+
+def test_viewport_lod_cut_keeps_highest_degree_nodes_with_id_ties() -> None:
+    node_ids = [f"n{position:02d}" for position in range(20)]
+    nodes_df = pd.DataFrame({"id": node_ids, "label": node_ids, "type": "Person", "description": ""})
+    edges_df = pd.DataFrame(
+        {"source": "n07", "target": node_ids[10:], "relationship_type": "KNOWS", "description": ""}
+    )
+    elements = build_cytoscape_elements(nodes_df, edges_df)
+    source = ViewportSource(elements, compute_layout_positions(nodes_df, edges_df), max_nodes=4, lod_zoom=0.5)
+
+    visible = source.visible_node_ids(-2000, -2000, 2000, 2000, zoom=1.0)
+
+    assert visible == ["n07", "n10", "n11", "n12"]
+
+
+def test_large_graph_without_xy_lays_out_without_scipy(monkeypatch: pytest.MonkeyPatch) -> None:
+    import sys
+
+    monkeypatch.setitem(sys.modules, "scipy", None)
+    node_ids = [f"n{position}" for position in range(1500)]
+    nodes_df = pd.DataFrame({"id": node_ids, "label": node_ids, "type": "Person", "description": ""})
+    edges_df = pd.DataFrame(
+        {
+            "source": node_ids,
+            "target": node_ids[1:] + node_ids[:1],
+            "relationship_type": "KNOWS",
+            "description": "",
+        }
+    )
+    elements = build_cytoscape_elements(nodes_df, edges_df)
+    assert len(elements) > 2000
+
+    positions = compute_layout_positions(nodes_df, edges_df)
+    source = ViewportSource(elements, positions, max_nodes=100_000)
+
+    assert set(positions) == set(node_ids)
+    assert max(abs(coordinate) for point in positions.values() for coordinate in point) == pytest.approx(1000.0)
+    assert len(source.query(*source.bounds, zoom=1.0)) == len(elements)
@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("pandas")
+import numpy as np
+import pandas as pd
+
+from app.temporal import TemporalIndex, day_label, day_number
+
+
+def _frames(seed: int = 0, edge_count: int = 300) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    node_ids = [f"n{position}" for position in range(60)]
+    days = rng.integers(day_number("2020-01-01"), day_number("2021-12-31"), size=edge_count)
+    dates = [day_label(day) for day in days]
+    dates[::17] = [""] * len(dates[::17])
+    nodes_df = pd.DataFrame({"id": node_ids, "label": node_ids, "type": "Person", "description": ""})
+    edges_df = pd.DataFrame(
+        {
+            "source": rng.choice(node_ids, size=edge_count),
+            "target": rng.choice(node_ids, size=edge_count),
+            "relationship_type": rng.choice(["KNOWS", "FUNDS", "MEETS"], size=edge_count),
+            "description": "",
+            "date": dates,
+        }
+    )
+    return nodes_df, edges_df
+
+
+def _expected(edges_df: pd.DataFrame, start: str, end: str) -> tuple[set[int], set[str], dict[str, int]]:
+    dated = edges_df[(edges_df["date"] != "") & (edges_df["date"] >= start) & (edges_df["date"] <= end)]
+    nodes = set(dated["source"]) | set(dated["target"])
+    return set(dated.index), nodes, dated["relationship_type"].value_counts().to_dict()
+
+
+def test_day_number_round_trips_and_ignores_missing_dates() -> None:
+    assert day_number("1970-01-02") == 1
+    assert day_label(day_number("2024-02-29")) == "2024-02-29"
+    assert day_number("") is None
+    assert day_number("not a date") is None
+
+
+def test_sliding_window_matches_brute_force_in_every_direction() -> None:
+    nodes_df, edges_df = _frames()
+    index = TemporalIndex.from_frames(nodes_df, edges_df)
+    first, last = index.bounds()
+    rng = np.random.default_rng(1)
+    # Forward steps, backward jumps, disjoint jumps, growing and shrinking windows.
+    windows = [(day, day + 45) for day in range(first - 10, last, 23)]
+    windows += [tuple(sorted(rng.integers(first - 30, last + 30, size=2))) for _ in range(40)]
+
+    for start, end in windows:
+        stats = index.move_to(start, end)
+        edges, nodes, relationship_counts = _expected(edges_df, day_label(start), day_label(end))
+
+        assert set(np.flatnonzero(index.edge_mask())) == edges
+        assert set(nodes_df["id"][index.node_mask()]) == nodes
+        assert (stats.edge_count, stats.node_count) == (len(edges), len(nodes))
+        assert stats.relationship_counts == relationship_counts
+        assert (stats.start, stats.end) == (day_label(start), day_label(end))
+
+
+def test_open_bounds_cover_every_dated_edge() -> None:
+    nodes_df, edges_df = _frames()
+    index = TemporalIndex.from_frames(nodes_df, edges_df)
+
+    stats = index.move_to(None, None)
+
+    assert stats.edge_count == index.dated_count == int((edges_df["date"] != "").sum())
+    assert index.move_to(None, day_number("2019-12-31")).edge_count == 0
+
+
+def test_snapshots_step_through_daily_windows() -> None:
+    nodes_df, edges_df = _frames()
+    index = TemporalIndex.from_frames(nodes_df, edges_df)
+    start = day_number("2021-03-01")
+
+    counts = [stats.edge_count for stats in index.snapshots(start, start + 9, window_days=7)]
+
+    assert len(counts) == 10
+    for offset, count in enumerate(counts):
+        expected, _, _ = _expected(edges_df, day_label(start + offset), day_label(start + offset + 6))
+        assert count == len(expected)
+
+
+def test_metrics_and_missing_date_column() -> None:
+    nodes_df, edges_df = _frames()
+    index = TemporalIndex.from_frames(nodes_df, edges_df.drop(columns=["date"]))
+
+    assert index.bounds() is None
+    stats = index.move_to(None, None)
+    assert (stats.edge_count, stats.node_count, stats.density, stats.average_degree) == (0, 0, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        next(index.snapshots(0, 10, window_days=0))
@@ -0,0 +1,131 @@
+import pytest
+
+pytest.importorskip("pandas")
+import pandas as pd
+
+from app import text_index
+from app.filtering import apply_filters
+from app.text_index import TrigramIndex, jaro_winkler, ngrams
+
+
+def _nodes() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": ["N1", "N2", "N3", "N4"],
+            "label": ["Kelly", "Ned Kelly", "Berlin", "Skelton"],
+            "type": ["Person", "Person", "Place", "Person"],
+            "description": ["", "bushranger", "", "kelp farmer"],
+        }
+    )
+
+
+def test_ngrams_returns_distinct_trigrams() -> None:
+    assert ngrams("abcab") == {"abc", "bca", "cab"}
+    assert ngrams("ab") == set()
+
+
+def test_search_ranks_exact_prefix_word_and_substring_matches() -> None:
+    index = TrigramIndex.from_nodes(_nodes())
+
+    assert index.search("kelly") == ["N1", "N2"]
+    assert index.search("kel") == ["N1", "N2", "N4"]
+    assert index.search("KEL", limit=1) == ["N1"]
+    assert index.search("zzz") == []
+
+
+def test_search_short_queries_fall_back_to_cached_texts() -> None:
+    index = TrigramIndex.from_nodes(_nodes())
+
+    assert index.search("er") == ["N3"]
+
+
+def test_search_can_include_description_column() -> None:
+    index = TrigramIndex.from_nodes(_nodes(), columns=("label", "description"))
+
+    assert index.search("bush") == ["N2"]
+    assert index.search("kel") == ["N1", "N2", "N4"]
+
+
+def test_add_update_and_remove_keep_postings_in_sync() -> None:
+    index = TrigramIndex.from_nodes(_nodes())
+
+    index.add("N5", {"label": "Kelso"})
+    assert "N5" in index.search("kels")
+
+    index.update("N5", "N6", {"label": "Hamburg"})
+    assert index.search("kels") == []
+    assert index.search("burg") == ["N6"]
+
+    index.remove("N6")
+    assert index.search("burg") == []
+    assert len(index) == 4
+
+
+def test_apply_filters_with_index_matches_scan_results() -> None:
+    nodes_df = _nodes()
+    edges_df = pd.DataFrame(
+        {
+            "source": ["N1", "N2"],
+            "target": ["N2", "N3"],
+            "relationship_type": ["KNOWS", "VISITED"],
+            "description": ["", ""],
+        }
+    )
+    index = TrigramIndex.from_nodes(nodes_df)
+
+    for query in ["kel", "ll", "berlin", "nothing"]:
+        scanned = apply_filters(nodes_df, edges_df, "All", "All", query)
+        indexed = apply_filters(nodes_df, edges_df, "All", "All", query, search_index=index)
+        pd.testing.assert_frame_equal(scanned[0], indexed[0])
+        pd.testing.assert_frame_equal(scanned[1], indexed[1])
+
+
+def test_jaro_winkler_matches_reference_values() -> None:
+    assert jaro_winkler("martha", "marhta") == pytest.approx(0.9611, abs=1e-4)
+    assert jaro_winkler("dwayne", "duane") == pytest.approx(0.84, abs=1e-4)
+    assert jaro_winkler("abc", "abc") == 1.0
+    assert jaro_winkler("abc", "") == 0.0
+
+
+def test_fuzzy_search_tolerates_typos_and_transliterations() -> None:
+    index = TrigramIndex()
+    for node_id, label in [
+        ("A", "Mohammed Al-Rashid"),
+        ("B", "Kelly Ortiz"),
+        ("C", "Muhammad Rashid"),
+        ("D", "Ana Kelley"),
+        ("E", "Tide Group"),
+    ]:
+        index.add(node_id, {"label": label})
+
+    assert index.fuzzy_search("muhamad") == ["C", "A"]
+    assert index.fuzzy_search("kelli") == ["B", "D"]
+    assert index.fuzzy_search("kelli", limit=1) == ["B"]
+    assert index.fuzzy_search("rashid muhammed") == ["C"]
+    assert index.fuzzy_search("zzzz") == []
+
+
+def test_fuzzy_search_only_scores_blocked_candidates(monkeypatch: pytest.MonkeyPatch) -> None:
+    index = TrigramIndex()
+    for position in range(200):
+        index.add(f"N{position}", {"label": f"unrelated {position}"})
+    index.add("K", {"label": "Kelly"})
+    scored = []
+    original = text_index._fuzzy_score
+    monkeypatch.setattr(text_index, "_fuzzy_score", lambda text, query: scored.append(text) or original(text, query))
+
+    assert index.fuzzy_search("kelyy") == ["K"]
+    assert scored == ["kelly"]
+
+
+def test_apply_filters_fuzzy_mode_uses_index() -> None:
+    nodes_df = _nodes()
+    edges_df = pd.DataFrame({"source": ["N1"], "target": ["N2"], "relationship_type": ["KNOWS"]})
+    index = TrigramIndex.from_nodes(nodes_df)
+
+    exact_nodes, _ = apply_filters(nodes_df, edges_df, "All", "All", "kely", search_index=index)
+    fuzzy_nodes, fuzzy_edges = apply_filters(nodes_df, edges_df, "All", "All", "kely", search_index=index, fuzzy=True)
+
+    assert exact_nodes.empty
+    assert fuzzy_nodes["id"].tolist() == ["N1", "N2"]
+    assert len(fuzzy_edges) == 1